@@ -0,0 +1,134 @@
+"""
+Alert Coalescer for Sentilytics
+Deduplicates and rate-limits alerts per (keyword, type)
+
+The first alert for a (keyword, type) opens a suppression window and is
+published. Further alerts in the window are only counted, unless their
+severity is higher than the last published one (an escalation, which is
+published and restarts the window). When a window closes with suppressed
+alerts, a single digest alert summarizes them.
+"""
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+SEVERITY_RANK = {'low': 0, 'medium': 1, 'high': 2, 'critical': 3}
+
+
+class _Window:
+    __slots__ = ('end', 'severity', 'suppressed', 'max_severity', 'first_suppressed', 'last_suppressed')
+    
+    def __init__(self, end: float, severity: str):
+        self.end = end
+        self.severity = severity
+        self.suppressed = 0
+        self.max_severity = None
+        self.first_suppressed = None
+        self.last_suppressed = None
+
+
+class AlertCoalescer:
+    def __init__(self, window: float = 300.0):
+        """
+        window: seconds during which repeats of a (keyword, type) alert are suppressed
+        """
+        self.window = window
+        # Windows all have the same length and restart at the back, so the
+        # front is always the next one to close
+        self._windows: "OrderedDict[Tuple, _Window]" = OrderedDict()
+        
+        # Metrics
+        self.published = 0
+        self.suppressed = 0
+        self.escalations = 0
+        self.digests = 0
+    
+    def offer(self, alert: Dict, now: float = None) -> List[Dict]:
+        """
+        Offer a new alert; returns the alerts to publish, in order
+        (digests of closed windows first, then this alert unless suppressed)
+        """
+        now = time.time() if now is None else now
+        published = self.flush(now)
+        if self.window <= 0:
+            self.published += 1
+            published.append(alert)
+            return published
+        
+        key = (alert.get('keyword'), alert['type'])
+        severity = alert.get('severity')
+        window = self._windows.get(key)
+        
+        if window is None:
+            self._windows[key] = _Window(now + self.window, severity)
+        elif SEVERITY_RANK.get(severity, 0) > SEVERITY_RANK.get(window.severity, 0):
+            alert['escalated_from'] = window.severity
+            alert['suppressed'] = window.suppressed
+            self.escalations += 1
+            self._windows[key] = _Window(now + self.window, severity)
+            self._windows.move_to_end(key)
+        else:
+            window.suppressed += 1
+            if window.max_severity is None or SEVERITY_RANK.get(severity, 0) > SEVERITY_RANK.get(window.max_severity, 0):
+                window.max_severity = severity
+            if window.first_suppressed is None:
+                window.first_suppressed = alert.get('timestamp')
+            window.last_suppressed = alert.get('timestamp')
+            self.suppressed += 1
+            return published
+        
+        self.published += 1
+        published.append(alert)
+        return published
+    
+    def flush(self, now: float = None) -> List[Dict]:
+        """
+        Close expired windows; returns a digest for each that suppressed alerts
+        """
+        now = time.time() if now is None else now
+        digests = []
+        while self._windows:
+            key, window = next(iter(self._windows.items()))
+            if window.end > now:
+                break
+            del self._windows[key]
+            if window.suppressed:
+                digests.append(self._digest(key, window))
+        self.digests += len(digests)
+        return digests
+    
+    def _digest(self, key: Tuple, window: _Window) -> Dict:
+        keyword, alert_type = key
+        subject = f' for {keyword}' if keyword else ''
+        return {
+            'type': 'alert_digest',
+            'severity': window.max_severity,
+            'keyword': keyword,
+            'message': f'{window.suppressed} repeated {alert_type} alert(s){subject} suppressed',
+            'timestamp': datetime.now().isoformat(),
+            'data': {
+                'alert_type': alert_type,
+                'suppressed': window.suppressed,
+                'first': window.first_suppressed,
+                'last': window.last_suppressed,
+                'window_seconds': self.window
+            }
+        }
+    
+    def pending(self, keyword: Optional[str], alert_type: str) -> int:
+        """
+        Alerts suppressed so far in the open window for (keyword, type)
+        """
+        window = self._windows.get((keyword, alert_type))
+        return window.suppressed if window else 0
+    
+    def get_stats(self) -> Dict:
+        return {
+            'window_seconds': self.window,
+            'open_windows': len(self._windows),
+            'published': self.published,
+            'suppressed': self.suppressed,
+            'escalations': self.escalations,
+            'digests': self.digests
+        }
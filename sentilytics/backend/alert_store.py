@@ -0,0 +1,151 @@
+"""
+Alert Store for Sentilytics
+Bounded alert history with indexes for filtered queries
+"""
+import time
+from bisect import bisect_left, bisect_right
+from itertools import product
+from typing import Dict, List, Optional
+
+# Every combination of (type, severity, keyword) filters has its own index,
+# so any filtered query is one bisect plus the slice it returns
+_FILTER_FIELDS = ('type', 'severity', 'keyword')
+_INDEX_MASKS = tuple(product((False, True), repeat=len(_FILTER_FIELDS)))
+
+
+class AlertStore:
+    def __init__(self, max_alerts: int = 1000, max_age: float = 86400):
+        """
+        Keeps at most `max_alerts` alerts, none older than `max_age` seconds
+        
+        Alerts get an increasing 'id' in arrival order. Storage and every
+        index are id-ordered lists; evicted alerts are trimmed from their
+        fronts lazily, so add and evict are amortized O(1) and a query is
+        O(log n + returned alerts).
+        """
+        self.max_alerts = max_alerts
+        self.max_age = max_age
+        
+        self._alerts: List[Optional[Dict]] = []
+        self._times: List[float] = []
+        self._head = 0  # first live slot in _alerts/_times
+        self._first_id = 0  # id of _alerts[0]
+        self._next_id = 0
+        self._indexes: Dict[tuple, List[int]] = {}
+        
+        # Metrics
+        self.evicted_by_count = 0
+        self.evicted_by_age = 0
+    
+    def __len__(self) -> int:
+        return len(self._alerts) - self._head
+    
+    def _min_live_id(self) -> int:
+        return self._first_id + self._head
+    
+    def add(self, alert: Dict, now: float = None) -> Dict:
+        """
+        Store an alert (assigning its 'id') and evict what no longer fits
+        """
+        now = time.time() if now is None else now
+        if self._times and now < self._times[-1]:
+            now = self._times[-1]  # keep timestamps sorted if the clock steps back
+        alert_id = self._next_id
+        self._next_id += 1
+        alert['id'] = alert_id
+        
+        self._alerts.append(alert)
+        self._times.append(now)
+        
+        values = tuple(alert.get(field) for field in _FILTER_FIELDS)
+        keys = {
+            tuple(value if use else None for value, use in zip(values, mask))
+            for mask in _INDEX_MASKS
+        }
+        for key in keys:
+            self._indexes.setdefault(key, []).append(alert_id)
+        
+        while len(self) > self.max_alerts:
+            self._evict_oldest()
+            self.evicted_by_count += 1
+        self.evict_expired(now)
+        return alert
+    
+    def evict_expired(self, now: float = None):
+        """
+        Drop alerts older than max_age
+        """
+        cutoff = (time.time() if now is None else now) - self.max_age
+        while len(self) and self._times[self._head] < cutoff:
+            self._evict_oldest()
+            self.evicted_by_age += 1
+    
+    def _evict_oldest(self):
+        self._alerts[self._head] = None
+        self._head += 1
+        if self._head > 64 and self._head * 2 > len(self._alerts):
+            self._compact()
+    
+    def _compact(self):
+        # Shift storage and trim evicted ids off every index
+        self._alerts = self._alerts[self._head:]
+        self._times = self._times[self._head:]
+        self._first_id += self._head
+        self._head = 0
+        
+        min_id = self._first_id
+        for key in list(self._indexes):
+            ids = self._indexes[key]
+            start = bisect_left(ids, min_id)
+            if start == len(ids):
+                del self._indexes[key]
+            elif start:
+                self._indexes[key] = ids[start:]
+    
+    def query(
+        self,
+        alert_type: str = None,
+        severity: str = None,
+        keyword: str = None,
+        since: float = None,
+        until: float = None,
+        limit: int = 10
+    ) -> List[Dict]:
+        """
+        Most recent `limit` alerts matching every given filter, oldest first
+        `since`/`until` are epoch seconds (inclusive)
+        """
+        self.evict_expired()
+        ids = self._indexes.get((alert_type, severity, keyword))
+        if not ids or limit <= 0:
+            return []
+        
+        # Translate the time range into an id range through the timestamps
+        low_id = self._min_live_id()
+        high_id = self._next_id
+        if since is not None:
+            low_id = max(low_id, self._first_id + bisect_left(self._times, since, self._head))
+        if until is not None:
+            high_id = min(high_id, self._first_id + bisect_right(self._times, until, self._head))
+        
+        start = bisect_left(ids, low_id)
+        end = bisect_left(ids, high_id)
+        start = max(start, end - limit)
+        return [self._alerts[alert_id - self._first_id] for alert_id in ids[start:end]]
+    
+    def clear(self):
+        self._alerts = []
+        self._times = []
+        self._first_id = self._next_id
+        self._head = 0
+        self._indexes = {}
+    
+    def get_stats(self) -> Dict:
+        return {
+            'size': len(self),
+            'max_alerts': self.max_alerts,
+            'max_age_seconds': self.max_age,
+            'evicted_by_count': self.evicted_by_count,
+            'evicted_by_age': self.evicted_by_age,
+            'indexes': len(self._indexes)
+        }
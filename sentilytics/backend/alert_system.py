@@ -2,20 +2,53 @@
 Alert System for Sentilytics
 Detects sentiment spikes and triggers notifications
 """
-from typing import Dict, List
+from collections import OrderedDict
+from typing import Dict, List, Optional
 from datetime import datetime
 from .config import config
+from .alert_coalescer import AlertCoalescer
+from .alert_store import AlertStore
+from .anomaly_detector import AnomalyDetector
+from .metrics import metrics, STAGE_SECONDS
+
+CHECK_SPIKE_SECONDS = STAGE_SECONDS.labels(component='alert_system', stage='check_spike')
+CHECK_CHANGE_SECONDS = STAGE_SECONDS.labels(component='alert_system', stage='check_change')
+CHECK_ANOMALY_SECONDS = STAGE_SECONDS.labels(component='alert_system', stage='check_anomaly')
+ALERTS_RAISED = metrics.counter('sentilytics_alerts_total', 'Alerts raised', ('type', 'severity'))
+ALERTS_SUPPRESSED = metrics.counter('sentilytics_alerts_suppressed_total', 'Repeated alerts suppressed by coalescing', ('type',))
+
+# Keywords with undelivered digests kept in the outbox; the oldest are dropped past this
+DIGEST_OUTBOX_KEYWORDS = 1000
 
 class AlertSystem:
     def __init__(self):
-        self.alert_history = []
+        self.alert_store = AlertStore(
+            max_alerts=config.ALERT_HISTORY_MAX_ALERTS,
+            max_age=config.ALERT_HISTORY_MAX_AGE
+        )
         self.negative_threshold = config.NEGATIVE_SENTIMENT_ALERT_THRESHOLD
+        self.anomaly_detector = AnomalyDetector(
+            alpha=config.ANOMALY_EWMA_ALPHA,
+            z_threshold=config.ANOMALY_Z_THRESHOLD,
+            cusum_slack=config.ANOMALY_CUSUM_SLACK,
+            cusum_threshold=config.ANOMALY_CUSUM_THRESHOLD,
+            warmup_batches=config.ANOMALY_WARMUP_BATCHES,
+            max_keywords=config.ANOMALY_MAX_KEYWORDS
+        )
+        self.coalescer = AlertCoalescer(window=config.ALERT_COALESCE_WINDOW)
+        # Digests wait here per keyword until that keyword's clients are sent an update,
+        # whichever call happened to close their window
+        self._digest_outbox: "OrderedDict[str, List[Dict]]" = OrderedDict()
     
-    def check_sentiment_spike(self, sentiment_data: Dict) -> Dict:
+    def check_sentiment_spike(self, sentiment_data: Dict, keyword: str = None) -> Dict:
         """
         Check if there's a significant sentiment spike
         Returns alert information if spike detected
         """
+        with CHECK_SPIKE_SECONDS.time():
+            return self._check_sentiment_spike(sentiment_data, keyword)
+    
+    def _check_sentiment_spike(self, sentiment_data: Dict, keyword: str) -> Dict:
         total = sentiment_data['total']
         if total == 0:
             return None
@@ -26,20 +59,36 @@ class AlertSystem:
             alert = {
                 'type': 'negative_spike',
                 'severity': 'high' if negative_percentage >= 0.6 else 'medium',
+                'keyword': keyword,
                 'message': f'High negative sentiment detected ({negative_percentage*100:.1f}%)',
                 'timestamp': datetime.now().isoformat(),
                 'data': sentiment_data
             }
             
-            self.alert_history.append(alert)
-            return alert
+            return self._record(alert)
+        
+        return None
+    
+    def check_anomaly(self, sentiment_data: Dict, keyword: str) -> Dict:
+        """
+        Feed an analyzed batch to the keyword's streaming anomaly detector
+        Returns alert information if the batch is anomalous for that keyword
+        """
+        with CHECK_ANOMALY_SECONDS.time():
+            alert = self.anomaly_detector.update(keyword, sentiment_data['negative'], sentiment_data['total'])
         
+        if alert is not None:
+            return self._record(alert)
         return None
     
-    def check_sudden_change(self, previous_data: Dict, current_data: Dict) -> Dict:
+    def check_sudden_change(self, previous_data: Dict, current_data: Dict, keyword: str = None) -> Dict:
         """
         Check for sudden changes in sentiment
         """
+        with CHECK_CHANGE_SECONDS.time():
+            return self._check_sudden_change(previous_data, current_data, keyword)
+    
+    def _check_sudden_change(self, previous_data: Dict, current_data: Dict, keyword: str) -> Dict:
         if not previous_data or not current_data:
             return None
         
@@ -59,25 +108,74 @@ class AlertSystem:
             alert = {
                 'type': 'sudden_change',
                 'severity': 'high',
+                'keyword': keyword,
                 'message': f'Sudden increase in negative sentiment (+{change*100:.1f}%)',
                 'timestamp': datetime.now().isoformat(),
                 'previous_data': previous_data,
                 'current_data': current_data
             }
             
-            self.alert_history.append(alert)
-            return alert
+            return self._record(alert)
         
         return None
     
-    def get_alert_history(self, limit: int = 10) -> List[Dict]:
+    def _record(self, alert: Dict) -> Optional[Dict]:
+        """
+        Pass an alert through the coalescer and store what it publishes
+        Returns the alert, or None if it was suppressed as a repeat
+        """
+        published = self.coalescer.offer(alert)
+        for item in published:
+            self._store(item)
+        if published and published[-1] is alert:
+            return alert
+        ALERTS_SUPPRESSED.labels(type=alert['type']).inc()
+        return None
+    
+    def _store(self, alert: Dict):
+        self.alert_store.add(alert)
+        ALERTS_RAISED.labels(type=alert['type'], severity=alert['severity']).inc()
+        if alert['type'] == 'alert_digest':
+            outbox = self._digest_outbox.setdefault(alert['keyword'], [])
+            outbox.append(alert)
+            if len(self._digest_outbox) > DIGEST_OUTBOX_KEYWORDS:
+                self._digest_outbox.popitem(last=False)
+    
+    def flush_digests(self) -> List[Dict]:
+        """
+        Store digests for coalescing windows that have closed and return them
+        They also stay in the outbox until taken with take_digests
+        """
+        digests = self.coalescer.flush()
+        for digest in digests:
+            self._store(digest)
+        return digests
+    
+    def take_digests(self, keyword: Optional[str]) -> List[Dict]:
+        """
+        Closed-window digests for a keyword not yet delivered, oldest first
+        """
+        self.flush_digests()
+        return self._digest_outbox.pop(keyword, [])
+    
+    def get_alert_history(
+        self,
+        limit: int = 10,
+        alert_type: str = None,
+        severity: str = None,
+        keyword: str = None,
+        since: float = None,
+        until: float = None
+    ) -> List[Dict]:
         """
-        Get recent alerts
+        Get recent alerts, optionally filtered by type, severity, keyword
+        and time range (epoch seconds), oldest first
         """
-        return self.alert_history[-limit:]
+        self.flush_digests()
+        return self.alert_store.query(alert_type, severity, keyword, since, until, limit)
     
     def clear_history(self):
         """
         Clear alert history
         """
-        self.alert_history = []
+        self.alert_store.clear()
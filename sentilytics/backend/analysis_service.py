@@ -0,0 +1,83 @@
+"""
+Analysis Service for Sentilytics
+Runs CPU-bound sentiment analysis off the asyncio event loop
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List
+
+from .sentiment_analyzer import SentimentAnalyzer, _init_worker
+from . import sentiment_analyzer as analyzer_module
+
+
+def _analyze_batch_in_worker(texts: List[str]) -> Dict:
+    """
+    Run analyze_batch on the worker process's own analyzer
+    """
+    return analyzer_module._worker_analyzer.analyze_batch(texts)
+
+
+class AnalysisService:
+    MODES = ('thread', 'process', 'inline')
+    
+    def __init__(self, analyzer: SentimentAnalyzer, mode: str = 'thread', workers: int = 2):
+        """
+        mode='thread' runs the shared analyzer in a thread pool,
+        mode='process' runs analyzers in worker processes (no GIL contention),
+        mode='inline' runs on the event loop (old behaviour, for comparison)
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown analysis executor mode: {mode}")
+        
+        self.analyzer = analyzer
+        self.mode = mode
+        self.workers = max(1, workers)
+        self._executor = None
+        self.pending = 0
+        self.completed = 0
+    
+    def _get_executor(self):
+        if self._executor is None:
+            if self.mode == 'process':
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=_init_worker, initargs=self.analyzer.worker_initargs()
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='analysis')
+        return self._executor
+    
+    async def analyze_batch(self, texts: List[str]) -> Dict:
+        """
+        Await analyze_batch without blocking the event loop
+        """
+        if self.mode == 'inline':
+            return self.analyzer.analyze_batch(texts)
+        
+        loop = asyncio.get_running_loop()
+        if self.mode == 'process':
+            func = _analyze_batch_in_worker
+        else:
+            func = self.analyzer.analyze_batch
+        
+        self.pending += 1
+        try:
+            return await loop.run_in_executor(self._get_executor(), func, list(texts))
+        finally:
+            self.pending -= 1
+            self.completed += 1
+    
+    def get_stats(self) -> Dict:
+        return {
+            'mode': self.mode,
+            'workers': self.workers,
+            'pending': self.pending,
+            'completed': self.completed
+        }
+    
+    def close(self):
+        """
+        Shut down the executor
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
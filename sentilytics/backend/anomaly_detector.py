@@ -0,0 +1,141 @@
+"""
+Anomaly Detector for Sentilytics
+Streaming per-keyword detection of negative-sentiment anomalies
+
+Each keyword keeps a handful of numbers: an EWMA baseline of its negative
+share, an EWMA of the squared deviation, a one-sided CUSUM and a batch
+count. Every analyzed batch updates them in O(1); no history is stored.
+"""
+import math
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+
+
+class _KeywordState:
+    __slots__ = ('mean', 'var', 'cusum', 'batches')
+    
+    def __init__(self, share: float):
+        self.mean = share
+        self.var = 0.0
+        self.cusum = 0.0
+        self.batches = 1
+
+
+class AnomalyDetector:
+    def __init__(
+        self,
+        alpha: float = 0.05,
+        z_threshold: float = 4.5,
+        cusum_slack: float = 0.5,
+        cusum_threshold: float = 8.0,
+        warmup_batches: int = 30,
+        max_keywords: int = 100000
+    ):
+        """
+        alpha: EWMA weight of each new batch in the baseline
+        z_threshold: flag a batch whose negative share is this many standard
+            deviations above the baseline (sudden spike)
+        cusum_slack/cusum_threshold: CUSUM of z-scores minus the slack; flag
+            when it reaches the threshold (smaller, sustained shift)
+        warmup_batches: batches a keyword must have seen before it can alert
+        max_keywords: least recently updated keywords are dropped past this
+        """
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.cusum_slack = cusum_slack
+        self.cusum_threshold = cusum_threshold
+        self.warmup_batches = warmup_batches
+        self.max_keywords = max_keywords
+        
+        self._states: "OrderedDict[str, _KeywordState]" = OrderedDict()
+        
+        # Metrics
+        self.updates = 0
+        self.anomalies = 0
+        self.evicted_keywords = 0
+    
+    def update(self, keyword: str, negative: int, total: int) -> Optional[Dict]:
+        """
+        Feed one analyzed batch for a keyword
+        Returns an alert dict if the batch is anomalous, otherwise None
+        """
+        if total <= 0:
+            return None
+        self.updates += 1
+        share = negative / total
+        
+        state = self._states.get(keyword)
+        if state is None:
+            self._states[keyword] = _KeywordState(share)
+            if len(self._states) > self.max_keywords:
+                self._states.popitem(last=False)
+                self.evicted_keywords += 1
+            return None
+        self._states.move_to_end(keyword)
+        
+        # Spread is the baseline's own, floored at the binomial noise of a
+        # batch this size so small batches need a bigger jump to count
+        mean = state.mean
+        noise = max(mean * (1 - mean), 0.01) / total
+        z = (share - mean) / math.sqrt(max(state.var, noise))
+        
+        alert = None
+        state.cusum = max(0.0, state.cusum + z - self.cusum_slack)
+        if state.batches >= self.warmup_batches:
+            if z >= self.z_threshold:
+                alert = self._alert('negative_anomaly', keyword, share, mean, z, state.cusum,
+                                    'high' if z >= 2 * self.z_threshold else 'medium')
+            elif state.cusum >= self.cusum_threshold:
+                alert = self._alert('negative_drift', keyword, share, mean, z, state.cusum, 'medium')
+        if alert is not None:
+            state.cusum = 0.0
+            self.anomalies += 1
+        
+        # Update the baseline after testing so a spike is judged against the past
+        deviation = share - mean
+        state.mean = mean + self.alpha * deviation
+        state.var = (1 - self.alpha) * (state.var + self.alpha * deviation * deviation)
+        state.batches += 1
+        return alert
+    
+    def _alert(self, alert_type: str, keyword: str, share: float, baseline: float,
+               z: float, cusum: float, severity: str) -> Dict:
+        if alert_type == 'negative_anomaly':
+            message = (f'Negative sentiment spike for {keyword}: {share*100:.1f}% '
+                       f'vs {baseline*100:.1f}% baseline (z={z:.1f})')
+        else:
+            message = (f'Sustained rise in negative sentiment for {keyword}: '
+                       f'{share*100:.1f}% vs {baseline*100:.1f}% baseline')
+        return {
+            'type': alert_type,
+            'severity': severity,
+            'keyword': keyword,
+            'message': message,
+            'timestamp': datetime.now().isoformat(),
+            'data': {
+                'negative_share': round(share, 4),
+                'baseline': round(baseline, 4),
+                'z_score': round(z, 2),
+                'cusum': round(cusum, 2)
+            }
+        }
+    
+    def get_baseline(self, keyword: str) -> Optional[Dict]:
+        state = self._states.get(keyword)
+        if state is None:
+            return None
+        return {
+            'negative_share': round(state.mean, 4),
+            'std': round(math.sqrt(state.var), 4),
+            'cusum': round(state.cusum, 2),
+            'batches': state.batches
+        }
+    
+    def get_stats(self) -> Dict:
+        return {
+            'keywords': len(self._states),
+            'updates': self.updates,
+            'anomalies': self.anomalies,
+            'evicted_keywords': self.evicted_keywords
+        }
@@ -0,0 +1,265 @@
+"""
+Collector Sources for Sentilytics
+Pluggable post sources for DataCollector, plus a local replay source
+
+A source yields batches of posts as an async iterator. Every batch carries a
+cursor; passing it back to `batches()` resumes right after that batch, so a
+consumer can pick up where it left off (per keyword, across reconnects, ...).
+"""
+import asyncio
+import csv
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .encoding import orjson
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is only needed to replay Parquet files
+    pq = None
+
+
+class PostBatch(NamedTuple):
+    posts: List[Dict]
+    cursor: int  # pass to batches(cursor=...) to resume after this batch
+
+
+class CollectorSource(ABC):
+    """
+    Base class for post sources
+    Subclasses implement `batches`; `collect` and async iteration come for free
+    """
+    
+    @abstractmethod
+    def batches(
+        self,
+        keyword: Optional[str] = None,
+        batch_size: int = 100,
+        cursor: Optional[int] = None
+    ) -> AsyncIterator[PostBatch]:
+        """
+        Yield PostBatch objects for `keyword` (all posts if None), starting at `cursor`
+        (implemented as an async generator)
+        """
+    
+    async def collect(self, keyword: Optional[str], count: int, cursor: Optional[int] = None) -> PostBatch:
+        """
+        Collect up to `count` posts in one batch
+        """
+        batches = self.batches(keyword, batch_size=count, cursor=cursor)
+        try:
+            return await batches.__anext__()
+        except StopAsyncIteration:
+            return PostBatch([], cursor or 0)
+        finally:
+            await batches.aclose()
+    
+    async def __aiter__(self) -> AsyncIterator[Dict]:
+        async for batch in self.batches():
+            for post in batch.posts:
+                yield post
+
+
+class ReplaySource(CollectorSource):
+    FORMATS = ('jsonl', 'csv', 'parquet')
+    
+    def __init__(
+        self,
+        path: str,
+        rate: float = 0,
+        loop: bool = False,
+        file_format: Optional[str] = None,
+        text_field: str = 'text',
+        match_keyword: bool = True
+    ):
+        """
+        Replay recorded posts from a JSONL, CSV or Parquet file
+        
+        rate: posts per second to replay at (0 replays as fast as possible)
+        loop: start again from the top when the file is exhausted
+        file_format: 'jsonl', 'csv' or 'parquet' (default: from the file extension)
+        text_field: column holding the post text, exposed as post['text']
+        match_keyword: only yield posts whose text contains the keyword
+        
+        The cursor is the byte offset after the last row consumed for JSONL
+        and CSV, so resuming seeks straight to it, and the number of rows
+        consumed for Parquet, where resuming skips whole row groups.
+        """
+        if file_format is None:
+            extension = os.path.splitext(path)[1].lower().lstrip('.')
+            file_format = {'json': 'jsonl', 'ndjson': 'jsonl', 'pq': 'parquet'}.get(extension, extension)
+        if file_format not in self.FORMATS:
+            raise ValueError(f"Unsupported replay format: {file_format}")
+        if file_format == 'parquet' and pq is None:
+            raise ImportError("Replaying Parquet files requires pyarrow")
+        
+        self.path = path
+        self.rate = rate
+        self.loop = loop
+        self.file_format = file_format
+        self.text_field = text_field
+        self.match_keyword = match_keyword
+        
+        # Metrics
+        self.rows_read = 0
+        self.posts_emitted = 0
+    
+    def _read_rows(self, start: int, chunk_size: int) -> Iterator[Tuple[List[Optional[Dict]], Sequence[int]]]:
+        """
+        Yield (rows, ends) chunks resuming at cursor `start`: raw rows and
+        the cursor just after each of them
+        """
+        if self.file_format == 'parquet':
+            yield from self._read_parquet_rows(start, chunk_size)
+            return
+        
+        with open(self.path, 'rb') as f:
+            if self.file_format == 'csv':
+                yield from self._read_csv_rows(f, start, chunk_size)
+                return
+            
+            f.seek(start)
+            offset = start
+            loads = orjson.loads if orjson is not None else json.loads
+            rows, ends = [], []
+            for line in f:
+                offset += len(line)
+                # Blank lines become None so every line still advances the cursor
+                rows.append(loads(line) if line.strip() else None)
+                ends.append(offset)
+                if len(rows) >= chunk_size:
+                    yield rows, ends
+                    rows, ends = [], []
+            if rows:
+                yield rows, ends
+    
+    @staticmethod
+    def _read_csv_rows(f, start: int, chunk_size: int) -> Iterator[Tuple[List[Dict], List[int]]]:
+        header = f.readline()
+        fieldnames = next(csv.reader([header.decode('utf-8')]), None)
+        if not fieldnames:
+            return
+        offset = max(start, len(header))
+        f.seek(offset)
+        
+        def lines():
+            # csv pulls one physical line at a time, so after each record
+            # `offset` is exactly where the next one starts
+            nonlocal offset
+            for line in f:
+                offset += len(line)
+                yield line.decode('utf-8')
+        
+        rows, ends = [], []
+        for row in csv.DictReader(lines(), fieldnames=fieldnames):
+            rows.append(row)
+            ends.append(offset)
+            if len(rows) >= chunk_size:
+                yield rows, ends
+                rows, ends = [], []
+        if rows:
+            yield rows, ends
+    
+    def _read_parquet_rows(self, start: int, chunk_size: int) -> Iterator[Tuple[List[Dict], range]]:
+        parquet_file = pq.ParquetFile(self.path)
+        metadata = parquet_file.metadata
+        
+        # Row groups wholly before the cursor are never read
+        first_group = 0
+        position = 0
+        while first_group < metadata.num_row_groups:
+            group_rows = metadata.row_group(first_group).num_rows
+            if position + group_rows > start:
+                break
+            position += group_rows
+            first_group += 1
+        if first_group == metadata.num_row_groups:
+            return
+        
+        row_groups = list(range(first_group, metadata.num_row_groups))
+        for record_batch in parquet_file.iter_batches(batch_size=chunk_size, row_groups=row_groups):
+            first = max(position, start)
+            position += record_batch.num_rows
+            if position <= start:
+                continue
+            rows = record_batch.to_pylist()
+            yield rows[len(rows) - (position - first):], range(first + 1, position + 1)
+    
+    def _to_post(self, row: Optional[Dict], keyword_lower: Optional[str]) -> Optional[Dict]:
+        if not row:
+            return None
+        text = row.get(self.text_field)
+        if not text:
+            return None
+        if keyword_lower is not None and keyword_lower not in text.lower():
+            return None
+        if self.text_field != 'text':
+            row = dict(row, text=text)
+        return row
+    
+    async def batches(
+        self,
+        keyword: Optional[str] = None,
+        batch_size: int = 100,
+        cursor: Optional[int] = None
+    ) -> AsyncIterator[PostBatch]:
+        keyword_lower = keyword.lower() if keyword and self.match_keyword else None
+        position = cursor or 0
+        started = time.perf_counter()
+        emitted = 0
+        
+        while True:
+            pass_start = position
+            matches_in_pass = 0
+            batch = []
+            for rows, ends in self._read_rows(position, batch_size):
+                for index, row in enumerate(rows):
+                    self.rows_read += 1
+                    post = self._to_post(row, keyword_lower)
+                    if post is None:
+                        continue
+                    matches_in_pass += 1
+                    batch.append(post)
+                    if len(batch) < batch_size:
+                        continue
+                    
+                    emitted += len(batch)
+                    self.posts_emitted += len(batch)
+                    yield PostBatch(batch, ends[index])
+                    batch = []
+                    await self._pace(started, emitted)
+                position = ends[-1]
+            
+            if batch:
+                emitted += len(batch)
+                self.posts_emitted += len(batch)
+                yield PostBatch(batch, position)
+                await self._pace(started, emitted)
+            
+            # A whole pass from the top without a match means looping would
+            # never yield anything (empty file, or no post has the keyword)
+            if not self.loop or (matches_in_pass == 0 and pass_start == 0):
+                return
+            position = 0
+            await asyncio.sleep(0)
+    
+    async def _pace(self, started: float, emitted: int):
+        """
+        Sleep until `emitted` posts are due at the configured rate
+        Always yields to the event loop, even when replaying as fast as possible
+        """
+        delay = emitted / self.rate - (time.perf_counter() - started) if self.rate > 0 else 0
+        await asyncio.sleep(max(0, delay))
+    
+    def get_stats(self) -> Dict:
+        return {
+            'path': self.path,
+            'format': self.file_format,
+            'rate': self.rate,
+            'loop': self.loop,
+            'rows_read': self.rows_read,
+            'posts_emitted': self.posts_emitted
+        }
@@ -31,11 +31,64 @@ class Config:
     SENTIMENT_THRESHOLD_POSITIVE = 0.05
     SENTIMENT_THRESHOLD_NEGATIVE = -0.05
     
+    # Batch scoring process pool (1 worker scores inline on the calling process)
+    ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "1"))
+    ANALYSIS_CHUNK_SIZE = int(os.getenv("ANALYSIS_CHUNK_SIZE", "2000"))
+    
+    # Executor that runs analysis off the event loop: "thread", "process" or "inline"
+    ANALYSIS_EXECUTOR = os.getenv("ANALYSIS_EXECUTOR", "thread")
+    ANALYSIS_EXECUTOR_WORKERS = int(os.getenv("ANALYSIS_EXECUTOR_WORKERS", "2"))
+    
+    # Per-text result cache (entries are ~200 bytes; 0 disables caching)
+    RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "50000"))
+    
+    # Ingestion micro-batching: flush at this many posts or after this many seconds
+    INGESTION_MAX_BATCH_SIZE = int(os.getenv("INGESTION_MAX_BATCH_SIZE", "500"))
+    INGESTION_MAX_LATENCY = float(os.getenv("INGESTION_MAX_LATENCY", "0.25"))
+    INGESTION_MAX_PENDING = int(os.getenv("INGESTION_MAX_PENDING", "10000"))  # backpressure above this
+    
+    # Per-client WebSocket send queues: drop the oldest update when full, close
+    # clients that stay full this many updates in a row or stall a send this long
+    WS_CLIENT_MAX_QUEUE = int(os.getenv("WS_CLIENT_MAX_QUEUE", "8"))
+    WS_CLIENT_MAX_LAG = int(os.getenv("WS_CLIENT_MAX_LAG", "32"))
+    WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "10"))  # seconds
+    
+    # Per-stage counters and histograms served on /metrics
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    
     # Alert settings
     NEGATIVE_SENTIMENT_ALERT_THRESHOLD = 0.4  # 40%
+    ALERT_HISTORY_MAX_ALERTS = int(os.getenv("ALERT_HISTORY_MAX_ALERTS", "10000"))
+    ALERT_HISTORY_MAX_AGE = float(os.getenv("ALERT_HISTORY_MAX_AGE", "86400"))  # seconds
+    # Repeats of a (keyword, type) alert within this many seconds are folded
+    # into one digest unless their severity escalates; 0 publishes every alert
+    ALERT_COALESCE_WINDOW = float(os.getenv("ALERT_COALESCE_WINDOW", "300"))
+    
+    # Streaming per-keyword anomaly detection on the negative share of each batch.
+    # Tuned with benchmarks/bench_anomaly.py: no more false alerts than the fixed
+    # 40% threshold on a calm 20% baseline (far fewer on a noisy one), at the cost
+    # of ~2 more batches to flag a small 20% -> 32% shift and 30 batches of warmup
+    ANOMALY_EWMA_ALPHA = float(os.getenv("ANOMALY_EWMA_ALPHA", "0.05"))
+    ANOMALY_Z_THRESHOLD = float(os.getenv("ANOMALY_Z_THRESHOLD", "4.5"))
+    ANOMALY_CUSUM_SLACK = float(os.getenv("ANOMALY_CUSUM_SLACK", "0.5"))
+    ANOMALY_CUSUM_THRESHOLD = float(os.getenv("ANOMALY_CUSUM_THRESHOLD", "8.0"))
+    ANOMALY_WARMUP_BATCHES = int(os.getenv("ANOMALY_WARMUP_BATCHES", "30"))
+    ANOMALY_MAX_KEYWORDS = int(os.getenv("ANOMALY_MAX_KEYWORDS", "100000"))
     
     # Data collection settings
     MAX_POSTS_PER_REQUEST = 100
     SIMULATED_DATA_MODE = True  # Set to False when API keys are available
+    
+    # Replay recorded posts (.jsonl, .csv or .parquet) instead of simulating them
+    REPLAY_PATH = os.getenv("REPLAY_PATH", "")
+    REPLAY_RATE = float(os.getenv("REPLAY_RATE", "0"))  # posts/s, 0 = as fast as possible
+    REPLAY_LOOP = os.getenv("REPLAY_LOOP", "false").lower() == "true"
+    
+    # Analysis history persisted in SQLite (WAL), with minute/hour/day rollups
+    HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", "sentilytics_history.db")
+    HISTORY_BATCH_SIZE = int(os.getenv("HISTORY_BATCH_SIZE", "500"))
+    HISTORY_FLUSH_INTERVAL = float(os.getenv("HISTORY_FLUSH_INTERVAL", "1.0"))  # seconds
+    HISTORY_RAW_RETENTION = float(os.getenv("HISTORY_RAW_RETENTION", str(7 * 86400)))  # seconds
+    HISTORY_MINUTE_RETENTION = float(os.getenv("HISTORY_MINUTE_RETENTION", str(30 * 86400)))  # seconds
 
 config = Config()
@@ -4,12 +4,29 @@ Handles social media data collection and simulation
 """
 import random
 import asyncio
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
 
+from .collectors import CollectorSource
+from .metrics import metrics, STAGE_SECONDS
+
+COLLECT_SECONDS = STAGE_SECONDS.labels(component='data_collector', stage='collect')
+FILTER_SPAM_SECONDS = STAGE_SECONDS.labels(component='data_collector', stage='filter_spam')
+POSTS_COLLECTED = metrics.counter('sentilytics_posts_collected_total', 'Posts returned by collect_posts').labels()
+POSTS_STREAMED = metrics.counter('sentilytics_posts_streamed_total', 'Posts delivered by stream_posts').labels()
+SPAM_FILTERED = metrics.counter('sentilytics_spam_filtered_total', 'Posts dropped by filter_spam').labels()
+
 class DataCollector:
-    def __init__(self):
-        self.simulated_mode = True
+    def __init__(self, source: Optional[CollectorSource] = None):
+        """
+        Posts come from `source` (e.g. a ReplaySource) when one is given,
+        otherwise they are simulated
+        """
+        self.source = source
+        self.simulated_mode = source is None
+        
+        # Where each keyword's next collect_posts call resumes in the source
+        self._cursors: Dict[str, int] = {}
         
         # Sample posts for simulation
         self.sample_posts = {
@@ -54,14 +71,16 @@ class DataCollector:
     async def collect_posts(self, keyword: str, count: int = 50) -> List[Dict]:
         """
         Collect posts related to a keyword
-        In production, this would call actual social media APIs
-        For now, returns simulated data
+        Returns simulated data unless a collector source is configured
         """
-        if self.simulated_mode:
-            return await self._generate_simulated_posts(keyword, count)
-        else:
-            # TODO: Implement actual API calls
-            return await self._collect_from_apis(keyword, count)
+        with COLLECT_SECONDS.time():
+            if self.simulated_mode:
+                posts = await self._generate_simulated_posts(keyword, count)
+            else:
+                posts = await self._collect_from_source(keyword, count)
+        
+        POSTS_COLLECTED.inc(len(posts))
+        return posts
     
     async def _generate_simulated_posts(self, keyword: str, count: int) -> List[Dict]:
         """
@@ -100,28 +119,31 @@ class DataCollector:
         
         return posts
     
-    async def _collect_from_apis(self, keyword: str, count: int) -> List[Dict]:
+    async def _collect_from_source(self, keyword: str, count: int) -> List[Dict]:
         """
-        Collect posts from actual social media APIs
-        TODO: Implement Twitter, Reddit, etc. API calls
+        Collect the next `count` posts for a keyword from the configured source
+        Social media APIs plug in as further CollectorSource implementations
         """
-        # Placeholder for future implementation
-        posts = []
-        
-        # Twitter API call would go here
-        # Reddit API call would go here
-        # etc.
-        
-        return posts
+        batch = await self.source.collect(keyword, count, cursor=self._cursors.get(keyword))
+        self._cursors[keyword] = batch.cursor
+        return batch.posts
     
     async def stream_posts(self, keyword: str, callback):
         """
         Stream posts in real-time
         Calls the callback function with new posts as they arrive
         """
+        if not self.simulated_mode:
+            async for batch in self.source.batches(keyword, batch_size=50, cursor=self._cursors.get(keyword)):
+                self._cursors[keyword] = batch.cursor
+                POSTS_STREAMED.inc(len(batch.posts))
+                await callback(batch.posts)
+            return
+        
         while True:
             # Generate a batch of new posts
             new_posts = await self._generate_simulated_posts(keyword, random.randint(5, 15))
+            POSTS_STREAMED.inc(len(new_posts))
             
             # Call the callback with new posts
             await callback(new_posts)
@@ -137,11 +159,13 @@ class DataCollector:
         
         spam_keywords = ['buy now', 'click here', 'limited offer', 'act now', 'free money']
         
-        for post in posts:
-            text_lower = post['text'].lower()
-            is_spam = any(spam_word in text_lower for spam_word in spam_keywords)
-            
-            if not is_spam:
-                filtered_posts.append(post)
+        with FILTER_SPAM_SECONDS.time():
+            for post in posts:
+                text_lower = post['text'].lower()
+                is_spam = any(spam_word in text_lower for spam_word in spam_keywords)
+                
+                if not is_spam:
+                    filtered_posts.append(post)
         
+        SPAM_FILTERED.inc(len(posts) - len(filtered_posts))
         return filtered_posts
@@ -0,0 +1,67 @@
+"""
+Emotion Matcher for Sentilytics
+Finds emotion lexicon hits in a single tokenized scan with word boundaries
+"""
+import re
+from typing import Dict, Iterable, List
+
+# Words, allowing inner apostrophes ("don't", "can't")
+TOKEN_PATTERN = re.compile(r"\w+(?:'\w+)*")
+
+class EmotionMatcher:
+    def __init__(self, lexicon: Dict[str, Iterable[str]]):
+        """
+        Build the lookup tables for a lexicon of {emotion: [keywords or phrases]}
+        Phrases are matched on whole tokens, so 'sad' does not hit 'crusade'
+        """
+        self.emotions = tuple(lexicon)
+        
+        # phrase -> indexes of the emotions it belongs to
+        self._index = {}
+        for position, emotion in enumerate(self.emotions):
+            for phrase in lexicon[emotion]:
+                key = ' '.join(TOKEN_PATTERN.findall(phrase.lower()))
+                if key:
+                    self._index.setdefault(key, set()).add(position)
+        self._index = {key: tuple(sorted(positions)) for key, positions in self._index.items()}
+        
+        self._max_phrase_len = max((key.count(' ') + 1 for key in self._index), default=1)
+        self._single_words = frozenset(key for key in self._index if ' ' not in key)
+    
+    def find(self, text: str) -> set:
+        """
+        Return the set of distinct lexicon phrases present in text
+        """
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        
+        # Single-word entries are a set intersection done in C
+        hits = set(tokens).intersection(self._single_words)
+        
+        if self._max_phrase_len > 1:
+            for size in range(2, self._max_phrase_len + 1):
+                for start in range(len(tokens) - size + 1):
+                    phrase = ' '.join(tokens[start:start + size])
+                    if phrase in self._index:
+                        hits.add(phrase)
+        
+        return hits
+    
+    def count(self, text: str) -> List[int]:
+        """
+        Count distinct lexicon hits per emotion, ordered like self.emotions
+        """
+        counts = [0] * len(self.emotions)
+        for phrase in self.find(text):
+            for position in self._index[phrase]:
+                counts[position] += 1
+        return counts
+    
+    def first_match(self, text: str) -> str:
+        """
+        Return the first emotion (in lexicon order) with any hit, or None
+        """
+        counts = self.count(text)
+        for emotion, count in zip(self.emotions, counts):
+            if count:
+                return emotion
+        return None
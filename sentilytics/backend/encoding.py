@@ -0,0 +1,20 @@
+"""
+Packet Encoding for Sentilytics
+Serializes WebSocket packets once to bytes so the same buffer can be sent to every client
+"""
+import json
+from typing import Dict
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+
+def encode_packet(packet: Dict) -> bytes:
+    """
+    Encode a packet to UTF-8 JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(packet)
+    return json.dumps(packet, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
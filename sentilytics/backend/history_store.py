@@ -0,0 +1,348 @@
+"""
+History Store for Sentilytics
+Persistent per-keyword analysis history in SQLite (WAL mode)
+
+Every analyzed batch is kept as a raw entry for `raw_retention` seconds and
+folded into minute, hour and day rollups (counts and sums, so buckets from
+several batches, flushes or worker processes simply add up). Entries are
+buffered in memory and written in one transaction per batch, off the event
+loop.
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .metrics import STAGE_SECONDS
+
+FLUSH_SECONDS = STAGE_SECONDS.labels(component='history_store', stage='flush')
+
+RESOLUTIONS = {'minute': 60, 'hour': 3600, 'day': 86400}
+EMOTIONS = ('joy', 'anger', 'fear', 'sadness')
+
+# Summed per bucket; averages are derived at read time
+ROLLUP_FIELDS = ('batches', 'total', 'positive', 'negative', 'neutral') + EMOTIONS
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS entries (
+    keyword TEXT NOT NULL,
+    ts REAL NOT NULL,
+    result TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_keyword_ts ON entries (keyword, ts);
+CREATE INDEX IF NOT EXISTS entries_ts ON entries (ts);
+CREATE TABLE IF NOT EXISTS rollups (
+    resolution INTEGER NOT NULL,
+    keyword TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    {', '.join(f'{field} INTEGER NOT NULL' for field in ROLLUP_FIELDS)},
+    PRIMARY KEY (resolution, keyword, bucket)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_ROLLUP = (
+    f"INSERT INTO rollups (resolution, keyword, bucket, {', '.join(ROLLUP_FIELDS)}) "
+    f"VALUES ({', '.join('?' * (len(ROLLUP_FIELDS) + 3))}) "
+    f"ON CONFLICT (resolution, keyword, bucket) DO UPDATE SET "
+    + ', '.join(f'{field} = {field} + excluded.{field}' for field in ROLLUP_FIELDS)
+)
+
+
+class HistoryStore:
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        raw_retention: float = 7 * 86400,
+        minute_retention: float = 30 * 86400
+    ):
+        """
+        path: SQLite database file (':memory:' keeps it in this process only)
+        batch_size/flush_interval: pending entries are written once this many
+            are buffered or this many seconds have passed, whichever is first
+        raw_retention/minute_retention: seconds raw entries and minute rollups
+            are kept; hour and day rollups are kept indefinitely
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.raw_retention = raw_retention
+        self.minute_retention = minute_retention
+        
+        self._writer = self._connect()
+        self._writer.executescript(_SCHEMA)
+        # WAL lets readers run alongside the writer (and other processes);
+        # an in-memory database has a single connection for both
+        self._reader = self._writer if path == ':memory:' else self._connect()
+        self._write_lock = threading.Lock()
+        self._read_lock = self._write_lock if self._reader is self._writer else threading.Lock()
+        
+        # Entries a flush has taken but not committed yet stay readable
+        # through _inflight; both lists change under _pending_lock
+        self._pending: List[Tuple[str, float, Dict]] = []
+        self._inflight: List[Tuple[str, float, Dict]] = []
+        self._pending_lock = threading.Lock()
+        self._closed = False
+        self._wakeup = None
+        self._task = None
+        self._last_prune = 0.0
+        
+        # Metrics
+        self.recorded = 0
+        self.flushed = 0
+        self.flushes = 0
+        self.last_flush_seconds = 0.0
+    
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute('PRAGMA busy_timeout=5000')
+        return connection
+    
+    def start(self):
+        """
+        Start the background flush loop on the running event loop
+        """
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """
+        Stop the flush loop and write whatever is still pending
+        A flush already running in its thread finishes first (flushes are
+        serialized on the write lock)
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.flush)
+    
+    def close(self):
+        """
+        Write what is pending and close the database; waits for a flush in
+        progress, and later flushes become no-ops
+        """
+        with self._write_lock:
+            if self._closed:
+                return
+            self._flush_locked()
+            self._closed = True
+            self._writer.close()
+        if self._reader is not self._writer:
+            with self._read_lock:
+                self._reader.close()
+    
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                print(f"History flush error: {e}")
+    
+    def record(self, keyword: str, result: Dict, timestamp: float = None):
+        """
+        Buffer one analyzed batch; it is written by the next flush
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._pending_lock:
+            self._pending.append((keyword, timestamp, result))
+            pending = len(self._pending)
+        self.recorded += 1
+        if pending >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+    
+    def flush(self) -> int:
+        """
+        Write pending entries and their rollups in one transaction
+        Returns the number of entries written
+        """
+        with self._write_lock:
+            if self._closed:
+                return 0
+            return self._flush_locked()
+    
+    def _flush_locked(self) -> int:
+        with self._pending_lock:
+            batch, self._pending = self._pending, []
+            self._inflight = batch
+        if not batch:
+            return 0
+        
+        start = time.perf_counter()
+        with FLUSH_SECONDS.time():
+            entries = []
+            rollups: Dict[Tuple[int, str, int], List[int]] = {}
+            for keyword, timestamp, result in batch:
+                entries.append((keyword, timestamp, json.dumps(result)))
+                sentiment = result['sentiment']
+                emotions = result.get('emotions', {})
+                values = (1, sentiment['total'], sentiment['positive'], sentiment['negative'],
+                          sentiment['neutral'], *(emotions.get(emotion, 0) for emotion in EMOTIONS))
+                for seconds in RESOLUTIONS.values():
+                    key = (seconds, keyword, int(timestamp // seconds * seconds))
+                    sums = rollups.get(key)
+                    if sums is None:
+                        rollups[key] = list(values)
+                    else:
+                        for i, value in enumerate(values):
+                            sums[i] += value
+            
+            self._writer.execute('BEGIN')
+            try:
+                self._writer.executemany('INSERT INTO entries VALUES (?, ?, ?)', entries)
+                self._writer.executemany(
+                    _UPSERT_ROLLUP, [(*key, *sums) for key, sums in rollups.items()]
+                )
+                self._prune()
+                # Committing and clearing _inflight together means recent()
+                # sees each entry exactly once, in the database or in memory
+                with self._pending_lock:
+                    self._writer.execute('COMMIT')
+                    self._inflight = []
+            except Exception:
+                if self._writer.in_transaction:
+                    self._writer.execute('ROLLBACK')
+                with self._pending_lock:
+                    self._pending[:0] = batch  # retry with the next flush
+                    self._inflight = []
+                raise
+        
+        self.flushed += len(batch)
+        self.flushes += 1
+        self.last_flush_seconds = time.perf_counter() - start
+        return len(batch)
+    
+    def _prune(self):
+        # At most once a minute, inside the flush transaction
+        now = time.time()
+        if now - self._last_prune < 60:
+            return
+        self._last_prune = now
+        self._writer.execute('DELETE FROM entries WHERE ts < ?', (now - self.raw_retention,))
+        self._writer.execute(
+            'DELETE FROM rollups WHERE resolution = ? AND bucket < ?',
+            (RESOLUTIONS['minute'], now - self.minute_retention)
+        )
+    
+    def recent(self, keyword: str, limit: int = 50) -> List[Dict]:
+        """
+        Last `limit` raw entries for a keyword (including unflushed ones), oldest first
+        """
+        # Same lock order as a flush (database lock, then _pending_lock), and
+        # no commit can land while the unflushed entries and rows are read
+        rows = []
+        with self._read_lock, self._pending_lock:
+            pending = [
+                (ts, result) for kw, ts, result in self._inflight + self._pending if kw == keyword
+            ][-limit:]
+            if len(pending) < limit:
+                rows = self._reader.execute(
+                    'SELECT ts, result FROM entries WHERE keyword = ? ORDER BY ts DESC LIMIT ?',
+                    (keyword, limit - len(pending))
+                ).fetchall()
+        entries = [(ts, json.loads(result)) for ts, result in reversed(rows)] + pending
+        return [
+            {'timestamp': datetime.fromtimestamp(ts).isoformat(), 'result': result}
+            for ts, result in entries
+        ]
+    
+    def pick_resolution(self, start: float, end: float, limit: int) -> str:
+        """
+        Finest rollup resolution that covers start..end in at most `limit` buckets
+        """
+        for name, seconds in RESOLUTIONS.items():
+            if (end - start) / seconds <= limit:
+                return name
+        return 'day'
+    
+    def query(
+        self,
+        keyword: str,
+        resolution: str,
+        start: float,
+        end: float,
+        limit: int = 500,
+        start_id: Optional[int] = None
+    ) -> Tuple[List[Dict], Optional[float], Optional[int]]:
+        """
+        One page of history for a keyword between `start` and `end` (epoch
+        seconds, end exclusive), oldest first
+        
+        resolution: 'minute', 'hour' or 'day' read precomputed rollup buckets
+            (aligned to the bucket containing `start`); 'raw' reads entries
+        start_id: raw only; skip entries at exactly `start` whose row id is
+            lower (entries can share a timestamp, so pages are keyed on both)
+        Returns the page plus the `start` and `start_id` of the next page
+        (None if this was the last one; start_id is always None for
+        rollups). Entries not yet flushed are not included.
+        """
+        if resolution == 'raw':
+            with self._read_lock:
+                rows = self._reader.execute(
+                    "SELECT ts, rowid, json_extract(result, '$.sentiment'), json_extract(result, '$.emotions') "
+                    'FROM entries WHERE keyword = ? AND (ts, rowid) >= (?, ?) AND ts < ? '
+                    'ORDER BY ts, rowid LIMIT ?',
+                    (keyword, start, start_id or 0, end, limit + 1)
+                ).fetchall()
+            next_start = next_id = None
+            if len(rows) > limit:
+                next_start, next_id = rows.pop()[:2]
+            return [
+                {
+                    'timestamp': datetime.fromtimestamp(ts).isoformat(),
+                    'sentiment': json.loads(sentiment),
+                    'emotions': json.loads(emotions) if emotions else {}
+                }
+                for ts, _, sentiment, emotions in rows
+            ], next_start, next_id
+        
+        seconds = RESOLUTIONS[resolution]
+        with self._read_lock:
+            rows = self._reader.execute(
+                f"SELECT bucket, {', '.join(ROLLUP_FIELDS)} FROM rollups "
+                'WHERE resolution = ? AND keyword = ? AND bucket >= ? AND bucket < ? '
+                'ORDER BY bucket LIMIT ?',
+                (seconds, keyword, int(start // seconds * seconds), end, limit + 1)
+            ).fetchall()
+        next_start = rows.pop()[0] if len(rows) > limit else None
+        return [self._bucket(row) for row in rows], next_start, None
+    
+    def _bucket(self, row: Tuple) -> Dict:
+        bucket, batches, total, positive, negative, neutral, *emotions = row
+        return {
+            'timestamp': datetime.fromtimestamp(bucket).isoformat(),
+            'batches': batches,
+            'sentiment': {'positive': positive, 'negative': negative, 'neutral': neutral, 'total': total},
+            'negative_share': round(negative / total, 4) if total else 0.0,
+            # Per-batch averages, like the 'emotions' of a single analysis
+            'emotions': {
+                emotion: round(value / batches, 2) for emotion, value in zip(EMOTIONS, emotions)
+            }
+        }
+    
+    def get_stats(self) -> Dict:
+        with self._pending_lock:
+            pending = len(self._pending)
+        return {
+            'path': self.path,
+            'pending': pending,
+            'recorded': self.recorded,
+            'flushed': self.flushed,
+            'flushes': self.flushes,
+            'last_flush_ms': round(self.last_flush_seconds * 1000, 3)
+        }
@@ -0,0 +1,143 @@
+"""
+Ingestion Queue for Sentilytics
+Micro-batches incoming posts between the collector and the analyzer
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List
+
+class IngestionQueue:
+    def __init__(
+        self,
+        process_batch: Callable[[str, List[Dict]], Awaitable[None]],
+        max_batch_size: int = 500,
+        max_latency: float = 0.25,
+        max_pending: int = 10000
+    ):
+        """
+        Posts are queued per route (e.g. keyword) and flushed to
+        `process_batch(route, posts)` when `max_batch_size` posts are waiting
+        or the oldest has waited `max_latency` seconds, whichever comes first.
+        `put` blocks once `max_pending` posts are queued (backpressure).
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.max_pending = max_pending
+        
+        self._queue = None
+        self._task = None
+        
+        # Metrics
+        self.enqueued_posts = 0
+        self.flushed_posts = 0
+        self.flushes = 0
+        self.size_flushes = 0
+        self.latency_flushes = 0
+        self.backpressure_waits = 0
+        self.last_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+        self._total_flush_latency = 0.0
+    
+    def start(self):
+        """
+        Start the flush loop on the running event loop
+        """
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """
+        Flush what is queued and stop the flush loop
+        """
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    async def put(self, route: str, posts: List[Dict]):
+        """
+        Queue posts for a route, waiting while the queue is full
+        """
+        self.start()
+        for post in posts:
+            if self._queue.full():
+                self.backpressure_waits += 1
+            item = [route, post, 0.0]
+            await self._queue.put(item)
+            # Stamp once queued, so time spent under backpressure does not
+            # count towards the flush deadline or flush latency. Nothing runs
+            # between put() returning and this line, so _run never sees 0.0
+            item[2] = time.perf_counter()
+        self.enqueued_posts += len(posts)
+    
+    async def _run(self):
+        while True:
+            # Block until something arrives, then fill the batch until size or deadline
+            batch = [await self._queue.get()]
+            deadline = batch[0][2] + self.max_latency
+            
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    # Past the deadline, still take whatever is already waiting
+                    while len(batch) < self.max_batch_size and not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            if len(batch) >= self.max_batch_size:
+                self.size_flushes += 1
+            else:
+                self.latency_flushes += 1
+            
+            await self._flush(batch)
+            for _ in batch:
+                self._queue.task_done()
+    
+    async def _flush(self, batch: List):
+        # One process_batch call per route, in arrival order
+        routes = {}
+        for route, post, _ in batch:
+            routes.setdefault(route, []).append(post)
+        
+        for route, posts in routes.items():
+            try:
+                await self.process_batch(route, posts)
+            except Exception as e:
+                print(f"Ingestion flush error for '{route}': {e}")
+        
+        latency = time.perf_counter() - batch[0][2]
+        self.flushes += 1
+        self.flushed_posts += len(batch)
+        self.last_flush_latency = latency
+        self.max_flush_latency = max(self.max_flush_latency, latency)
+        self._total_flush_latency += latency
+    
+    def get_metrics(self) -> Dict:
+        """
+        Get queue depth, flush counts and flush latency (oldest post's enqueue to flush done)
+        """
+        return {
+            'queue_depth': self._queue.qsize() if self._queue else 0,
+            'max_pending': self.max_pending,
+            'enqueued_posts': self.enqueued_posts,
+            'flushed_posts': self.flushed_posts,
+            'flushes': self.flushes,
+            'size_flushes': self.size_flushes,
+            'latency_flushes': self.latency_flushes,
+            'backpressure_waits': self.backpressure_waits,
+            'avg_batch_size': round(self.flushed_posts / self.flushes, 1) if self.flushes else 0,
+            'last_flush_latency_ms': round(self.last_flush_latency * 1000, 2),
+            'avg_flush_latency_ms': round(self._total_flush_latency / self.flushes * 1000, 2) if self.flushes else 0,
+            'max_flush_latency_ms': round(self.max_flush_latency * 1000, 2)
+        }
@@ -0,0 +1,119 @@
+"""
+Keyword Sketch for Sentilytics
+Streaming top-K keyword counting in fixed memory (Space-Saving algorithm)
+"""
+import heapq
+import string
+from typing import Dict, Iterable, List
+
+STOPWORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'be',
+    'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
+    'would', 'should', 'could', 'may', 'might', 'must', 'can', 'this',
+    'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'
+})
+
+class KeywordSketch:
+    def __init__(self, capacity: int = 1000):
+        """
+        Track at most `capacity` words. Counts are exact until more than
+        `capacity` distinct words are seen; after that each reported count
+        overestimates the true count by at most its 'error'
+        """
+        self.capacity = max(1, capacity)
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        
+        # Lazy min-heap of (count, word); stale entries are skipped on eviction
+        self._heap = []
+    
+    def add_text(self, cleaned_text: str):
+        """
+        Count the keywords of one preprocessed text
+        """
+        for word in cleaned_text.lower().split():
+            word = word.strip(string.punctuation)
+            if word and word not in STOPWORDS and len(word) > 2:
+                self.update(word)
+    
+    def add_texts(self, cleaned_texts: Iterable[str]):
+        """
+        Count the keywords of many preprocessed texts
+        """
+        for cleaned_text in cleaned_texts:
+            self.add_text(cleaned_text)
+    
+    def update(self, word: str, count: int = 1):
+        """
+        Add `count` occurrences of a word
+        """
+        self.total += count
+        
+        if word in self.counts:
+            self.counts[word] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[word] = count
+            self.errors[word] = 0
+        else:
+            # Replace the smallest counter and inherit its count as error
+            min_count, min_word = self._pop_min()
+            del self.counts[min_word]
+            del self.errors[min_word]
+            self.counts[word] = min_count + count
+            self.errors[word] = min_count
+        
+        heapq.heappush(self._heap, (self.counts[word], word))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, w) for w, c in self.counts.items()]
+            heapq.heapify(self._heap)
+    
+    def _pop_min(self):
+        while True:
+            count, word = heapq.heappop(self._heap)
+            if self.counts.get(word) == count:
+                return count, word
+    
+    def top(self, k: int = 5) -> List[Dict]:
+        """
+        Get the k most frequent words (ties keep first-seen order)
+        Scans every tracked counter, so this is O(capacity log k); the cost
+        is bounded by the sketch size, not by the number of posts seen
+        """
+        best = heapq.nlargest(k, self.counts.items(), key=lambda item: item[1])
+        return [{'word': word, 'count': count} for word, count in best]
+    
+    def _floor(self) -> int:
+        # Upper bound on the count of any word this sketch does not track
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+    
+    def merge(self, other: 'KeywordSketch') -> 'KeywordSketch':
+        """
+        Combine another sketch into this one, e.g. from a sharded worker
+        Counts and errors are summed and the top `capacity` words are kept.
+        A word missing from a full sketch may still have occurred up to that
+        sketch's smallest count, so it is credited with that count as error
+        """
+        own_floor, other_floor = self._floor(), other._floor()
+        for word in self.counts:
+            if word not in other.counts:
+                self.counts[word] += other_floor
+                self.errors[word] += other_floor
+        for word, count in other.counts.items():
+            if word in self.counts:
+                self.counts[word] += count
+                self.errors[word] += other.errors[word]
+            else:
+                self.counts[word] = count + own_floor
+                self.errors[word] = other.errors[word] + own_floor
+        self.total += other.total
+        
+        if len(self.counts) > self.capacity:
+            keep = heapq.nlargest(self.capacity, self.counts.items(), key=lambda item: item[1])
+            self.counts = dict(keep)
+            self.errors = {word: self.errors[word] for word in self.counts}
+        
+        self._heap = [(c, w) for w, c in self.counts.items()]
+        heapq.heapify(self._heap)
+        return self
@@ -0,0 +1,177 @@
+"""
+Keyword Streams for Sentilytics
+One shared, reference-counted collector stream per subscribed keyword
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Set
+
+class ClientQueue:
+    def __init__(self, max_queue: int = 8, max_lag: int = 32):
+        """
+        One WebSocket client's bounded outgoing queue, so a slow client never
+        blocks the flush that produced an update. A full queue drops its oldest
+        update (the newest supersedes it); a client that stays full for
+        `max_lag` updates in a row is closed.
+        """
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.max_lag = max_lag
+        self.keyword = None
+        self.closed = False
+        self.dropped = 0
+        self.lagging = 0
+    
+    def offer(self, message: bytes) -> bool:
+        """
+        Queue an update without waiting; False once the client has been closed
+        """
+        if self.closed:
+            return False
+        
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            self.lagging += 1
+            if self.lagging >= self.max_lag:
+                self.close()
+                return False
+        else:
+            self.lagging = 0
+        self.queue.put_nowait(message)
+        return True
+    
+    def close(self):
+        """
+        Drop pending updates and wake the sender with None
+        """
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+    
+    async def next_message(self):
+        """
+        Wait for the next update; None means the client was closed for lagging
+        """
+        return await self.queue.get()
+
+
+class KeywordStreams:
+    def __init__(
+        self,
+        stream_posts: Callable[[str, Callable[[List[Dict]], Awaitable[None]]], Awaitable[None]],
+        on_posts: Callable[[str, List[Dict]], Awaitable[None]]
+    ):
+        """
+        `stream_posts(keyword, callback)` is the collector's streaming coroutine
+        (e.g. DataCollector.stream_posts). The first subscriber to a keyword
+        starts it; every batch it yields is passed to `on_posts(keyword, posts)`;
+        the last subscriber to leave cancels it.
+        """
+        self.stream_posts = stream_posts
+        self.on_posts = on_posts
+        
+        self._subscribers: Dict[str, Set] = {}
+        self._producers: Dict[str, asyncio.Task] = {}
+        self._last_message: Dict[str, bytes] = {}
+        
+        # Metrics
+        self.producers_started = 0
+        self.producers_stopped = 0
+        self.batches_received = 0
+        self.posts_received = 0
+        self.updates_dropped = 0
+        self.clients_closed = 0
+    
+    def subscribe(self, keyword: str, subscriber):
+        """
+        Add a subscriber, starting the keyword's producer if it is the first one
+        """
+        subscribers = self._subscribers.setdefault(keyword, set())
+        subscribers.add(subscriber)
+        
+        if keyword not in self._producers:
+            self._producers[keyword] = asyncio.create_task(self._run(keyword))
+            self.producers_started += 1
+    
+    def unsubscribe(self, keyword: str, subscriber):
+        """
+        Remove a subscriber, stopping the keyword's producer if it was the last one
+        """
+        subscribers = self._subscribers.get(keyword)
+        if subscribers is None:
+            return
+        
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self._subscribers[keyword]
+            self._last_message.pop(keyword, None)
+            producer = self._producers.pop(keyword, None)
+            if producer is not None:
+                producer.cancel()
+                self.producers_stopped += 1
+    
+    def subscribers(self, keyword: str) -> List:
+        return list(self._subscribers.get(keyword, ()))
+    
+    def set_last_message(self, keyword: str, message: bytes):
+        """
+        Remember the keyword's latest encoded update for clients that join later
+        """
+        if keyword in self._subscribers:
+            self._last_message[keyword] = message
+    
+    def last_message(self, keyword: str):
+        return self._last_message.get(keyword)
+    
+    def publish(self, keyword: str, message: bytes):
+        """
+        Queue an encoded update for every ClientQueue subscribed to the keyword,
+        unsubscribing clients closed for lagging. Never waits on a client
+        """
+        self.set_last_message(keyword, message)
+        for client in self.subscribers(keyword):
+            dropped = client.dropped
+            delivered = client.offer(message)
+            self.updates_dropped += client.dropped - dropped
+            if not delivered:
+                self.clients_closed += 1
+                self.unsubscribe(keyword, client)
+    
+    async def _run(self, keyword: str):
+        async def callback(posts: List[Dict]):
+            self.batches_received += 1
+            self.posts_received += len(posts)
+            await self.on_posts(keyword, posts)
+        
+        try:
+            await self.stream_posts(keyword, callback)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Stream error for '{keyword}': {e}")
+            # Let the next subscriber restart it
+            if self._producers.get(keyword) is asyncio.current_task():
+                del self._producers[keyword]
+    
+    async def stop(self):
+        """
+        Cancel every producer
+        """
+        producers = list(self._producers.values())
+        self._producers.clear()
+        for producer in producers:
+            producer.cancel()
+        await asyncio.gather(*producers, return_exceptions=True)
+        self.producers_stopped += len(producers)
+    
+    def get_stats(self) -> Dict:
+        return {
+            'active_keywords': len(self._producers),
+            'subscribers': sum(len(subscribers) for subscribers in self._subscribers.values()),
+            'producers_started': self.producers_started,
+            'producers_stopped': self.producers_stopped,
+            'batches_received': self.batches_received,
+            'posts_received': self.posts_received,
+            'updates_dropped': self.updates_dropped,
+            'clients_closed': self.clients_closed
+        }
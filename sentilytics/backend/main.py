@@ -2,19 +2,27 @@
 Sentilytics - Main FastAPI Application
 Real-Time Social Media Sentiment Analysis Dashboard
 """
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from typing import List, Dict
 import asyncio
 import os
+import time
 from datetime import datetime
 
 from .config import config
 from .sentiment_analyzer import SentimentAnalyzer
 from .data_collector import DataCollector
+from .collectors import ReplaySource
 from .alert_system import AlertSystem
+from .encoding import encode_packet
+from .ingestion import IngestionQueue
+from .analysis_service import AnalysisService
+from .keyword_streams import ClientQueue, KeywordStreams
+from .history_store import HistoryStore, RESOLUTIONS
+from .metrics import metrics, STAGE_SECONDS
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -33,8 +41,21 @@ app.add_middleware(
 )
 
 # Initialize components
-sentiment_analyzer = SentimentAnalyzer()
-data_collector = DataCollector()
+sentiment_analyzer = SentimentAnalyzer(
+    workers=config.ANALYSIS_WORKERS,
+    chunk_size=config.ANALYSIS_CHUNK_SIZE,
+    cache_size=config.RESULT_CACHE_SIZE
+)
+# Every async endpoint awaits analysis through this service so the event loop stays free
+analysis_service = AnalysisService(
+    sentiment_analyzer,
+    mode=config.ANALYSIS_EXECUTOR,
+    workers=config.ANALYSIS_EXECUTOR_WORKERS
+)
+replay_source = None
+if config.REPLAY_PATH:
+    replay_source = ReplaySource(config.REPLAY_PATH, rate=config.REPLAY_RATE, loop=config.REPLAY_LOOP)
+data_collector = DataCollector(source=replay_source)
 alert_system = AlertSystem()
 
 # Mount static files
@@ -50,8 +71,24 @@ async def serve_index():
 # Store active WebSocket connections
 active_connections: List[WebSocket] = []
 
-# Store analysis history
-analysis_history = {}
+# Analysis history, persisted and rolled up by minute/hour/day
+history_store = HistoryStore(
+    config.HISTORY_DB_PATH,
+    batch_size=config.HISTORY_BATCH_SIZE,
+    flush_interval=config.HISTORY_FLUSH_INTERVAL,
+    raw_retention=config.HISTORY_RAW_RETENTION,
+    minute_retention=config.HISTORY_MINUTE_RETENTION
+)
+
+# Request-level stages; the analyzer, collector and alert system time their own
+REQUEST_SECONDS = STAGE_SECONDS.labels(component='api', stage='analyze_request')
+ANALYZE_SECONDS = STAGE_SECONDS.labels(component='api', stage='analyze_batch')
+INGEST_SECONDS = STAGE_SECONDS.labels(component='ingestion', stage='process_batch')
+SEND_SECONDS = STAGE_SECONDS.labels(component='ingestion', stage='send')
+REQUESTS = metrics.counter('sentilytics_requests_total', 'API requests by endpoint and outcome', ('endpoint', 'status'))
+ANALYZE_OK = REQUESTS.labels(endpoint='/api/analyze', status='ok')
+ANALYZE_ERROR = REQUESTS.labels(endpoint='/api/analyze', status='error')
+MESSAGES_SENT = metrics.counter('sentilytics_ws_messages_sent_total', 'WebSocket updates sent to clients').labels()
 
 
 @app.get("/")
@@ -70,6 +107,11 @@ async def analyze_sentiment(keyword: str = Query(..., description="Keyword to an
     """
     Analyze sentiment for a given keyword
     """
+    with REQUEST_SECONDS.time():
+        return await _analyze_keyword(keyword)
+
+
+async def _analyze_keyword(keyword: str):
     try:
         # Collect posts related to the keyword
         posts = await data_collector.collect_posts(keyword, count=100)
@@ -80,24 +122,16 @@ async def analyze_sentiment(keyword: str = Query(..., description="Keyword to an
         # Extract text from posts
         texts = [post['text'] for post in filtered_posts]
         
-        # Analyze sentiment
-        analysis_result = sentiment_analyzer.analyze_batch(texts)
+        # Analyze sentiment (includes any wait for an executor slot)
+        with ANALYZE_SECONDS.time():
+            analysis_result = await analysis_service.analyze_batch(texts)
         
         # Check for alerts
-        alert = alert_system.check_sentiment_spike(analysis_result['sentiment'])
-        
-        # Store in history
-        if keyword not in analysis_history:
-            analysis_history[keyword] = []
+        alert = alert_system.check_sentiment_spike(analysis_result['sentiment'], keyword)
+        anomaly = alert_system.check_anomaly(analysis_result['sentiment'], keyword)
         
-        analysis_history[keyword].append({
-            'timestamp': datetime.now().isoformat(),
-            'result': analysis_result
-        })
-        
-        # Keep only last 50 entries
-        if len(analysis_history[keyword]) > 50:
-            analysis_history[keyword] = analysis_history[keyword][-50:]
+        # Store in history (written in batches by the history store)
+        history_store.record(keyword, analysis_result)
         
         # Prepare response
         response = {
@@ -106,12 +140,15 @@ async def analyze_sentiment(keyword: str = Query(..., description="Keyword to an
             'emotions': analysis_result['emotions'],
             'keywords': analysis_result['keywords'],
             'timestamp': datetime.now().isoformat(),
-            'alert': alert
+            'alert': alert,
+            'anomaly': anomaly
         }
         
+        ANALYZE_OK.inc()
         return JSONResponse(content=response)
     
     except Exception as e:
+        ANALYZE_ERROR.inc()
         return JSONResponse(
             status_code=500,
             content={
@@ -122,59 +159,205 @@ async def analyze_sentiment(keyword: str = Query(..., description="Keyword to an
 
 
 @app.get("/api/history")
-async def get_history(keyword: str = Query(..., description="Keyword to get history for")):
+async def get_history(
+    keyword: str = Query(..., description="Keyword to get history for"),
+    start: str = Query(None, alias="from", description="Range start (ISO 8601 or epoch seconds), default 24h before 'to'"),
+    end: str = Query(None, alias="to", description="Range end, exclusive (ISO 8601 or epoch seconds), default now"),
+    resolution: str = Query(None, description="raw, minute, hour, day or auto (finest that fits in 'limit')"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum entries or buckets per page"),
+    start_id: int = Query(None, alias="from_id", description="Raw paging cursor; pass next_from_id back")
+):
     """
     Get sentiment analysis history for a keyword
+    
+    Without from/to/resolution, returns the last 50 analyses in full. With
+    any of them, returns one page of rollup buckets (or raw sentiment
+    entries) in the range; request the next page with from=next_from
+    (and from_id=next_from_id for raw entries).
     """
-    if keyword not in analysis_history:
-        return JSONResponse(content={'history': []})
+    if start is None and end is None and resolution is None:
+        history = await asyncio.to_thread(history_store.recent, keyword, 50)
+        return JSONResponse(content={'history': history})
     
-    return JSONResponse(content={'history': analysis_history[keyword]})
+    end_time = _parse_time(end, 'to') if end else time.time()
+    start_time = _parse_time(start, 'from') if start else end_time - 86400
+    if start_time >= end_time:
+        raise HTTPException(status_code=400, detail="'from' must be before 'to'")
+    if resolution is None or resolution == 'auto':
+        resolution = history_store.pick_resolution(start_time, end_time, limit)
+    elif resolution != 'raw' and resolution not in RESOLUTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid resolution: {resolution} (choose raw, {', '.join(RESOLUTIONS)} or auto)"
+        )
+    
+    history, next_start, next_id = await asyncio.to_thread(
+        history_store.query, keyword, resolution, start_time, end_time, limit, start_id
+    )
+    return JSONResponse(content={
+        'keyword': keyword,
+        'resolution': resolution,
+        'from': datetime.fromtimestamp(start_time).isoformat(),
+        'to': datetime.fromtimestamp(end_time).isoformat(),
+        'history': history,
+        'next_from': next_start,
+        'next_from_id': next_id
+    })
+
+
+def _parse_time(value: str, name: str) -> float:
+    """
+    Epoch seconds from an ISO 8601 timestamp (as in alert 'timestamp') or a number
+    """
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid '{name}' time: {value}")
 
 
 @app.get("/api/alerts")
-async def get_alerts(limit: int = Query(10, description="Number of recent alerts to retrieve")):
+async def get_alerts(
+    limit: int = Query(10, description="Number of recent alerts to retrieve"),
+    alert_type: str = Query(None, alias="type", description="Alert type, e.g. negative_spike"),
+    severity: str = Query(None, description="Alert severity, e.g. high"),
+    keyword: str = Query(None, description="Keyword the alert was raised for"),
+    since: str = Query(None, description="Only alerts at or after this time (ISO 8601 or epoch seconds)"),
+    until: str = Query(None, description="Only alerts at or before this time (ISO 8601 or epoch seconds)")
+):
     """
-    Get recent alerts
+    Get recent alerts, optionally filtered
     """
-    alerts = alert_system.get_alert_history(limit)
+    alerts = alert_system.get_alert_history(
+        limit,
+        alert_type=alert_type,
+        severity=severity,
+        keyword=keyword,
+        since=_parse_time(since, 'since') if since else None,
+        until=_parse_time(until, 'until') if until else None
+    )
     return JSONResponse(content={'alerts': alerts})
 
 
+async def process_ingested(keyword: str, posts: List[Dict]):
+    """
+    Analyze one micro-batch for a keyword and send it to that keyword's clients
+    """
+    texts = [post['text'] for post in posts]
+    with INGEST_SECONDS.time():
+        result = await analysis_service.analyze_batch(texts)
+    anomaly = alert_system.check_anomaly(result['sentiment'], keyword)
+    digests = alert_system.take_digests(keyword)
+    
+    message = encode_packet({
+        'type': 'update',
+        'keyword': keyword,
+        'data': result,
+        'anomaly': anomaly,
+        'digests': digests,
+        'timestamp': datetime.now().isoformat()
+    })
+    
+    # Only queues the update per client; each connection's relay does the sending
+    with SEND_SECONDS.time():
+        keyword_streams.publish(keyword, message)
+
+
+# Posts flow collector -> ingestion queue -> analyze_batch in size/latency-bounded batches
+ingestion_queue = IngestionQueue(
+    process_ingested,
+    max_batch_size=config.INGESTION_MAX_BATCH_SIZE,
+    max_latency=config.INGESTION_MAX_LATENCY,
+    max_pending=config.INGESTION_MAX_PENDING
+)
+
+# One shared stream_posts producer per subscribed keyword, feeding the ingestion queue
+keyword_streams = KeywordStreams(data_collector.stream_posts, ingestion_queue.put)
+
+
+async def relay_updates(websocket: WebSocket, client: ClientQueue):
+    """
+    Send a client's queued updates; a send that stalls past WS_SEND_TIMEOUT
+    raises and ends the connection
+    """
+    while True:
+        message = await client.next_message()
+        if message is None:
+            # Too slow to keep up with the stream
+            await websocket.close(code=1013)
+            return
+        await asyncio.wait_for(websocket.send_bytes(message), config.WS_SEND_TIMEOUT)
+        MESSAGES_SENT.inc()
+
+
+async def receive_subscriptions(websocket: WebSocket, client: ClientQueue):
+    """
+    Move the client to each keyword it asks for
+    """
+    while True:
+        data = await websocket.receive_json()
+        keyword = data.get('keyword')
+        
+        if keyword and keyword != client.keyword:
+            if client.keyword:
+                keyword_streams.unsubscribe(client.keyword, client)
+            client.keyword = keyword
+            keyword_streams.subscribe(keyword, client)
+            
+            # Late joiners get the keyword's latest update straight away
+            last_message = keyword_streams.last_message(keyword)
+            if last_message is not None:
+                client.offer(last_message)
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """
     WebSocket endpoint for real-time updates
+    Send {"keyword": ...} to subscribe (replacing any previous keyword);
+    updates then arrive as the keyword's stream produces posts
     """
     await websocket.accept()
     active_connections.append(websocket)
+    client = ClientQueue(max_queue=config.WS_CLIENT_MAX_QUEUE, max_lag=config.WS_CLIENT_MAX_LAG)
     
     try:
-        while True:
-            # Receive message from client
-            data = await websocket.receive_json()
-            
-            keyword = data.get('keyword')
-            
-            if keyword:
-                # Start streaming analysis
-                async def send_update(posts):
-                    texts = [post['text'] for post in posts]
-                    result = sentiment_analyzer.analyze_batch(texts)
-                    
-                    await websocket.send_json({
-                        'type': 'update',
-                        'keyword': keyword,
-                        'data': result,
-                        'timestamp': datetime.now().isoformat()
-                    })
-                
-                # This would stream in production
-                # For now, send periodic updates
-                await send_update(await data_collector.collect_posts(keyword, 20))
+        # Run until the client disconnects, falls too far behind or stalls a send
+        tasks = {
+            asyncio.create_task(relay_updates(websocket, client)),
+            asyncio.create_task(receive_subscriptions(websocket, client))
+        }
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            if not task.cancelled() and task.exception():
+                raise task.exception()
     
     except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        print(f"WebSocket error: {e}")
+    finally:
         active_connections.remove(websocket)
+        if client.keyword:
+            keyword_streams.unsubscribe(client.keyword, client)
+
+
+def _cache_stats():
+    """
+    Result cache counters of this (API) process only; caches inside
+    analysis worker processes are not collected, so say when they exist
+    """
+    stats = sentiment_analyzer.cache.get_stats()
+    stats['scope'] = 'api_process'
+    stats['excludes_worker_processes'] = (
+        sentiment_analyzer.workers > 1 or analysis_service.mode == 'process'
+    )
+    return stats
 
 
 @app.get("/api/health")
@@ -189,10 +372,44 @@ async def health_check():
             'sentiment_analyzer': 'operational',
             'data_collector': 'operational',
             'alert_system': 'operational'
-        }
+        },
+        'cache': _cache_stats(),
+        'ingestion': ingestion_queue.get_metrics(),
+        'analysis': analysis_service.get_stats(),
+        'alerts': alert_system.alert_store.get_stats(),
+        'alert_coalescer': alert_system.coalescer.get_stats(),
+        'anomaly_detector': alert_system.anomaly_detector.get_stats(),
+        'streams': keyword_streams.get_stats(),
+        'history': history_store.get_stats(),
+        'collector': replay_source.get_stats() if replay_source else {'source': 'simulated'}
     }
 
 
+# Gauges are read from the components at scrape time
+metrics.gauge('sentilytics_ingestion_queue_depth', 'Posts waiting in the ingestion queue',
+              lambda: ingestion_queue.get_metrics()['queue_depth'])
+metrics.gauge('sentilytics_analysis_pending', 'Analysis calls waiting on or running in the executor',
+              lambda: analysis_service.pending)
+metrics.gauge('sentilytics_result_cache_entries', 'Entries in the API process result cache (worker processes not included)',
+              lambda: sentiment_analyzer.cache.get_stats()['size'])
+metrics.gauge('sentilytics_result_cache_hit_ratio', 'API process result cache hit ratio since start (worker processes not included)',
+              lambda: sentiment_analyzer.cache.get_stats()['hit_rate'])
+metrics.gauge('sentilytics_stream_keywords', 'Keywords with an active stream producer',
+              lambda: keyword_streams.get_stats()['active_keywords'])
+metrics.gauge('sentilytics_stream_subscribers', 'WebSocket clients subscribed to a keyword',
+              lambda: keyword_streams.get_stats()['subscribers'])
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Prometheus text-format metrics (disabled with METRICS_ENABLED=false)
+    """
+    if not metrics.enabled:
+        return JSONResponse(status_code=404, content={'error': 'Metrics are disabled'})
+    return PlainTextResponse(metrics.render(), media_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 @app.on_event("startup")
 async def startup_event():
     """
@@ -206,6 +423,7 @@ async def startup_event():
     print(f"Alert System: Ready")
     print(f"Server: http://{config.HOST}:{config.PORT}")
     print("=" * 60)
+    history_store.start()
 
 
 @app.on_event("shutdown")
@@ -216,6 +434,12 @@ async def shutdown_event():
     print("\n" + "=" * 60)
     print("Sentilytics API Shutting Down...")
     print("=" * 60)
+    await keyword_streams.stop()
+    await ingestion_queue.stop()
+    await history_store.stop()
+    analysis_service.close()
+    sentiment_analyzer.close()
+    history_store.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,251 @@
+"""
+Metrics for Sentilytics
+Lightweight in-process counters, histograms and gauges rendered in the
+Prometheus text exposition format
+
+Only this process is measured: analysis done inside worker processes
+(ANALYSIS_WORKERS > 1 or ANALYSIS_EXECUTOR=process) is not counted.
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from .config import config
+
+# Seconds; spans a cached text (~10us) up to a simulated collection (0.5s+)
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _NullTimer:
+    """Stand-in timer used while metrics are disabled"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ('child', 'start')
+    
+    def __init__(self, child):
+        self.child = child
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.child.observe(time.perf_counter() - self.start)
+        return False
+
+
+class _CounterChild:
+    __slots__ = ('registry', 'value', '_lock')
+    
+    def __init__(self, registry):
+        self.registry = registry
+        self.value = 0
+        self._lock = threading.Lock()
+    
+    def inc(self, amount: float = 1):
+        if self.registry.enabled:
+            with self._lock:
+                self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ('registry', 'buckets', 'counts', 'sum', 'count', '_lock')
+    
+    def __init__(self, registry, buckets: Tuple[float, ...]):
+        self.registry = registry
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float):
+        if not self.registry.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+    
+    def time(self):
+        """
+        Context manager that observes the duration of its block in seconds
+        """
+        return _Timer(self) if self.registry.enabled else _NULL_TIMER
+
+
+class _Metric:
+    type_name = ''
+    
+    def __init__(self, registry, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+    
+    def _new_child(self):
+        raise NotImplementedError
+    
+    def labels(self, **labels):
+        """
+        Child metric for one set of label values; bind it once outside hot loops
+        """
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+    
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+    
+    def render(self) -> List[str]:
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.type_name}',
+            *self._samples()
+        ]
+
+
+class Counter(_Metric):
+    type_name = 'counter'
+    
+    def _new_child(self):
+        return _CounterChild(self.registry)
+    
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+    
+    def _samples(self) -> List[str]:
+        return [
+            f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}'
+            for key, child in list(self._children.items())
+        ]
+
+
+class Histogram(_Metric):
+    type_name = 'histogram'
+    
+    def __init__(self, registry, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def _new_child(self):
+        return _HistogramChild(self.registry, self.buckets)
+    
+    def observe(self, value: float):
+        self.labels().observe(value)
+    
+    def time(self):
+        return self.labels().time()
+    
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts = list(child.counts)
+                total, count = child.sum, child.count
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class Gauge(_Metric):
+    """
+    Gauge read from a callback at scrape time, so the hot path pays nothing
+    """
+    type_name = 'gauge'
+    
+    def __init__(self, registry, name: str, documentation: str, callback: Callable[[], float]):
+        super().__init__(registry, name, documentation)
+        self.callback = callback
+    
+    def _samples(self) -> List[str]:
+        return [f'{self.name} {_format_value(self.callback())}']
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = True):
+        """
+        While `enabled` is False counters and histograms record nothing and
+        timers skip the clock; flip it at runtime to pause collection
+        """
+        self.enabled = enabled
+        self._metrics: Dict[str, _Metric] = {}
+    
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+    
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(self, name, documentation, labelnames))
+    
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+    
+    def gauge(self, name: str, documentation: str, callback: Callable[[], float]) -> Gauge:
+        return self._register(Gauge(self, name, documentation, callback))
+    
+    def render(self) -> str:
+        """
+        All metrics in the Prometheus text format (version 0.0.4)
+        """
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide registry
+metrics = MetricsRegistry(enabled=config.METRICS_ENABLED)
+
+# Shared per-stage latency histogram; label values are bound once per call site
+STAGE_SECONDS = metrics.histogram(
+    'sentilytics_stage_duration_seconds',
+    'Time spent in each pipeline stage',
+    ('component', 'stage')
+)
@@ -0,0 +1,80 @@
+"""
+Result Cache for Sentilytics
+Bounded LRU cache of per-text scores keyed by a hash of the normalized text
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+class ResultCache:
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max(0, max_entries)
+        self._entries = OrderedDict()
+        # Analysis may run on executor threads
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(normalized_text: str) -> bytes:
+        """
+        Hash normalized text into a fixed-size key so long posts
+        do not stay alive in memory as dict keys
+        """
+        return hashlib.blake2b(normalized_text.encode('utf-8'), digest_size=16).digest()
+    
+    def get(self, key: Hashable) -> Optional[Tuple]:
+        """
+        Return the cached value and mark it most recently used
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: Hashable, value: Tuple):
+        """
+        Store a value, evicting the least recently used entry when full
+        """
+        if self.max_entries == 0:
+            return
+        
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """
+        Drop all entries and reset counters
+        """
+        with self._lock:
+            self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get_stats(self) -> Dict:
+        """
+        Get hit, miss and eviction counters
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
@@ -1,24 +1,97 @@
 """
 Sentiment Analysis Engine for Sentilytics
-Uses VADER and TextBlob for sentiment analysis
+Uses VADER for sentiment analysis
 """
 import re
-import string
-from typing import Dict, List, Tuple
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from textblob import TextBlob
 import nltk
 
+from .emotion_matcher import EmotionMatcher
+from .keyword_sketch import KeywordSketch
+from .result_cache import ResultCache
+from .metrics import metrics, STAGE_SECONDS
+
 # Download required NLTK data
 try:
     nltk.data.find('tokenizers/punkt')
 except LookupError:
     nltk.download('punkt', quiet=True)
 
+# Column order used by the batch scoring engine
+SENTIMENT_LABELS = ('negative', 'neutral', 'positive')
+EMOTIONS = ('joy', 'anger', 'fear', 'sadness')
+
+# Emotion mix used when a text contains no emotion keywords
+FALLBACK_EMOTIONS = {
+    'positive': {'joy': 70, 'anger': 10, 'fear': 10, 'sadness': 10},
+    'negative': {'joy': 10, 'anger': 40, 'fear': 25, 'sadness': 25},
+    'neutral': {'joy': 25, 'anger': 25, 'fear': 25, 'sadness': 25}
+}
+_FALLBACK_MATRIX = np.array(
+    [[FALLBACK_EMOTIONS[label][emotion] for emotion in EMOTIONS] for label in SENTIMENT_LABELS],
+    dtype=np.int32
+)
+
+PREPROCESS_SECONDS = STAGE_SECONDS.labels(component='sentiment_analyzer', stage='preprocess')
+SCORE_SECONDS = STAGE_SECONDS.labels(component='sentiment_analyzer', stage='score')
+KEYWORDS_SECONDS = STAGE_SECONDS.labels(component='sentiment_analyzer', stage='keywords')
+AGGREGATE_SECONDS = STAGE_SECONDS.labels(component='sentiment_analyzer', stage='aggregate')
+
+# Per-text scorer time is summed into counters; a histogram observation per text would cost more than the clock reads
+SCORER_SECONDS = metrics.counter(
+    'sentilytics_scorer_seconds_total',
+    'Time spent in each scorer for texts not served from the result cache',
+    ('scorer',)
+)
+VADER_SECONDS = SCORER_SECONDS.labels(scorer='vader')
+EMOTION_SECONDS = SCORER_SECONDS.labels(scorer='emotion')
+TEXTS_SCORED = metrics.counter(
+    'sentilytics_texts_scored_total',
+    'Texts scored by VADER and the emotion matcher (result cache misses)'
+).labels()
+
+# Per-process analyzer used by pool workers, built once by _init_worker
+_worker_analyzer = None
+
+
+def _init_worker(cache_size: int = 50000, keyword_capacity: int = 1000):
+    """
+    Load the VADER lexicon once per worker process, with the parent's
+    cache size and keyword capacity
+    """
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer(cache_size=cache_size)
+    _worker_analyzer.keyword_capacity = keyword_capacity
+
+
+def _score_chunk(texts: List[str]) -> Dict:
+    """
+    Score one shard of a batch inside a worker process
+    """
+    return _worker_analyzer.score_batch(texts)
+
+
 class SentimentAnalyzer:
-    def __init__(self):
+    def __init__(self, workers: int = 1, chunk_size: int = 2000, cache_size: int = 50000):
         self.vader = SentimentIntensityAnalyzer()
         
+        # Per-text scores keyed by normalized text, so reposts skip VADER and the keyword scan
+        self.cache = ResultCache(max_entries=cache_size)
+        
+        # Process pool settings for large batches (workers=1 scores inline)
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        
+        # Distinct words tracked per keyword sketch (counts are exact below this)
+        self.keyword_capacity = 1000
+        
         # Emoji to text mapping
         self.emoji_map = {
             '😊': 'happy', '😃': 'happy', '😄': 'happy', '😁': 'happy',
@@ -29,6 +102,43 @@ class SentimentAnalyzer:
             '👍': 'good', '👎': 'bad',
             '🔥': 'fire', '💯': 'perfect'
         }
+        self._normalizer = self._build_normalizer()
+        
+        # Emotion keywords
+        self.emotion_keywords = {
+            'joy': ['happy', 'joy', 'excited', 'love', 'great', 'awesome', 'amazing', 'wonderful', 'excellent'],
+            'anger': ['angry', 'mad', 'furious', 'hate', 'terrible', 'awful', 'worst', 'disgusting'],
+            'fear': ['scared', 'afraid', 'fearful', 'worried', 'anxious', 'nervous', 'terrified'],
+            'sadness': ['sad', 'depressed', 'unhappy', 'disappointed', 'heartbroken', 'crying']
+        }
+        self.emotion_matcher = EmotionMatcher({emotion: self.emotion_keywords[emotion] for emotion in EMOTIONS})
+    
+    def _build_normalizer(self):
+        """
+        Compile one regex covering emojis, URLs, mentions and hashtags
+        so preprocessing is a single scan over the text
+        """
+        emojis = sorted(self.emoji_map, key=len, reverse=True)
+        emoji_pattern = '|'.join(re.escape(emoji) for emoji in emojis)
+        # The old cleaner replaced emojis, then stripped URLs, then mentions, then
+        # hashtags. To keep that order in one scan, a URL stops where an emoji
+        # starts, and mentions and hashtags stop where a URL would start
+        url_char = f'(?:(?!{emoji_pattern})\\S)'
+        word_char = f'(?:(?!(?:http|www){url_char})\\w)'
+        return re.compile(
+            f'(?P<emoji>{emoji_pattern})'
+            f'|(?P<url>(?:http|www){url_char}+)'
+            f'|(?P<mention>@{word_char}+)'
+            f'|#(?P<hashtag>{word_char}+)'
+        )
+    
+    def _normalize_match(self, match) -> str:
+        kind = match.lastgroup
+        if kind == 'emoji':
+            return f' {self.emoji_map[match.group()]} '
+        if kind == 'hashtag':
+            return match.group('hashtag')
+        return ''
     
     def preprocess_text(self, text: str) -> str:
         """
@@ -37,29 +147,23 @@ class SentimentAnalyzer:
         if not text:
             return ""
         
-        # Convert emojis to text
-        for emoji, meaning in self.emoji_map.items():
-            text = text.replace(emoji, f' {meaning} ')
-        
-        # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-        
-        # Remove mentions and hashtags (but keep the text)
-        text = re.sub(r'@\w+', '', text)
-        text = re.sub(r'#(\w+)', r'\1', text)
+        # Convert emojis, drop URLs and mentions, unwrap hashtags in one pass
+        text = self._normalizer.sub(self._normalize_match, text)
         
         # Remove extra whitespace
-        text = ' '.join(text.split())
-        
-        return text.strip()
+        return ' '.join(text.split())
     
     def analyze_sentiment(self, text: str) -> Dict:
         """
         Analyze sentiment of a single text using VADER
         Returns sentiment scores and classification
         """
-        cleaned_text = self.preprocess_text(text)
-        
+        return self._sentiment_from_clean(self.preprocess_text(text))
+    
+    def _sentiment_from_clean(self, cleaned_text: str) -> Dict:
+        """
+        Score text that has already been through preprocess_text
+        """
         if not cleaned_text:
             return {
                 'positive': 0,
@@ -69,32 +173,73 @@ class SentimentAnalyzer:
                 'classification': 'neutral'
             }
         
-        # VADER sentiment scores
-        vader_scores = self.vader.polarity_scores(cleaned_text)
+        return self._sentiment_from_row(self._score_clean(cleaned_text))
+    
+    def _sentiment_from_row(self, row: Tuple) -> Dict:
+        """
+        Build the sentiment response from a _score_clean row
+        """
+        positive, negative, neutral, compound = row[:4]
         
-        # Classify sentiment
-        compound = vader_scores['compound']
+        return {
+            'positive': positive,
+            'negative': negative,
+            'neutral': neutral,
+            'compound': compound,
+            'classification': self._classify(compound)
+        }
+    
+    def _classify(self, compound: float) -> str:
+        """
+        Classify a VADER compound score
+        """
         if compound >= 0.05:
-            classification = 'positive'
+            return 'positive'
         elif compound <= -0.05:
-            classification = 'negative'
+            return 'negative'
+        return 'neutral'
+    
+    def _score_clean(self, cleaned_text: str) -> Tuple:
+        """
+        Get (pos, neg, neu, compound, *emotion keyword counts) for
+        preprocessed text, served from the result cache when possible
+        """
+        key = self.cache.make_key(cleaned_text)
+        row = self.cache.get(key)
+        if row is not None:
+            return row
+        
+        # VADER sentiment scores, plus emotion keyword counts; the clock is
+        # only read while metrics are enabled
+        if metrics.enabled:
+            start = time.perf_counter()
+            vader_scores = self.vader.polarity_scores(cleaned_text)
+            scored = time.perf_counter()
+            emotion_counts = self._emotion_counts(cleaned_text)
+            VADER_SECONDS.inc(scored - start)
+            EMOTION_SECONDS.inc(time.perf_counter() - scored)
+            TEXTS_SCORED.inc()
         else:
-            classification = 'neutral'
+            vader_scores = self.vader.polarity_scores(cleaned_text)
+            emotion_counts = self._emotion_counts(cleaned_text)
         
-        return {
-            'positive': vader_scores['pos'],
-            'negative': vader_scores['neg'],
-            'neutral': vader_scores['neu'],
-            'compound': compound,
-            'classification': classification
-        }
+        row = (
+            vader_scores['pos'], vader_scores['neg'], vader_scores['neu'], vader_scores['compound'],
+            *emotion_counts
+        )
+        self.cache.put(key, row)
+        return row
     
-    def analyze_emotion(self, text: str) -> Dict:
+    def analyze_emotion(self, text: str, sentiment: Dict = None, cleaned_text: str = None) -> Dict:
         """
         Analyze emotions in text
         Returns percentages for joy, anger, fear, sadness
+        
+        Pass an already computed sentiment (and the preprocessed text) to
+        skip preprocessing and the VADER call used for the fallback
         """
-        cleaned_text = self.preprocess_text(text)
+        if cleaned_text is None:
+            cleaned_text = self.preprocess_text(text)
         
         if not cleaned_text:
             return {
@@ -104,121 +249,194 @@ class SentimentAnalyzer:
                 'sadness': 0
             }
         
-        # Emotion keywords
-        joy_keywords = ['happy', 'joy', 'excited', 'love', 'great', 'awesome', 'amazing', 'wonderful', 'excellent']
-        anger_keywords = ['angry', 'mad', 'furious', 'hate', 'terrible', 'awful', 'worst', 'disgusting']
-        fear_keywords = ['scared', 'afraid', 'fearful', 'worried', 'anxious', 'nervous', 'terrified']
-        sadness_keywords = ['sad', 'depressed', 'unhappy', 'disappointed', 'heartbroken', 'crying']
+        if sentiment is not None:
+            return self._emotions_from_counts(self._emotion_counts(cleaned_text), sentiment['classification'])
+        
+        row = self._score_clean(cleaned_text)
+        return self._emotions_from_counts(row[4:], self._classify(row[3]))
+    
+    def analyze_full(self, text: str) -> Dict:
+        """
+        Analyze sentiment and emotions together
+        Preprocesses and scores the text once and derives both results
+        """
+        cleaned_text = self.preprocess_text(text)
         
-        text_lower = cleaned_text.lower()
+        if not cleaned_text:
+            return {
+                'sentiment': self._sentiment_from_clean(cleaned_text),
+                'emotions': self.analyze_emotion(text, cleaned_text=cleaned_text)
+            }
         
-        # Count emotion keywords
-        joy_count = sum(1 for word in joy_keywords if word in text_lower)
-        anger_count = sum(1 for word in anger_keywords if word in text_lower)
-        fear_count = sum(1 for word in fear_keywords if word in text_lower)
-        sadness_count = sum(1 for word in sadness_keywords if word in text_lower)
+        row = self._score_clean(cleaned_text)
+        sentiment = self._sentiment_from_row(row)
         
-        total = joy_count + anger_count + fear_count + sadness_count
+        return {
+            'sentiment': sentiment,
+            'emotions': self._emotions_from_counts(row[4:], sentiment['classification'])
+        }
+    
+    def _emotions_from_counts(self, counts: List[int], classification: str) -> Dict:
+        """
+        Turn per-emotion keyword counts into percentages
+        """
+        total = sum(counts)
         
         if total == 0:
             # Use sentiment as fallback
-            sentiment = self.analyze_sentiment(text)
-            if sentiment['classification'] == 'positive':
-                return {'joy': 70, 'anger': 10, 'fear': 10, 'sadness': 10}
-            elif sentiment['classification'] == 'negative':
-                return {'joy': 10, 'anger': 40, 'fear': 25, 'sadness': 25}
-            else:
-                return {'joy': 25, 'anger': 25, 'fear': 25, 'sadness': 25}
+            return dict(FALLBACK_EMOTIONS[classification])
         
         return {
-            'joy': int((joy_count / total) * 100),
-            'anger': int((anger_count / total) * 100),
-            'fear': int((fear_count / total) * 100),
-            'sadness': int((sadness_count / total) * 100)
+            emotion: int((count / total) * 100)
+            for emotion, count in zip(EMOTIONS, counts)
         }
     
-    def extract_keywords(self, texts: List[str], top_n: int = 5) -> List[Dict]:
+    def _emotion_counts(self, cleaned_text: str) -> List[int]:
+        """
+        Count emotion keyword hits per emotion, ordered like EMOTIONS
+        """
+        return self.emotion_matcher.count(cleaned_text)
+    
+    def extract_keywords(self, texts: Iterable[str], top_n: int = 5) -> List[Dict]:
+        """
+        Extract top keywords from a list (or stream) of texts
+        Words are counted incrementally in a fixed-size KeywordSketch
+        """
+        sketch = KeywordSketch(self.keyword_capacity)
+        for text in texts:
+            sketch.add_text(self.preprocess_text(text))
+        
+        return sketch.top(top_n)
+    
+    def score_batch(self, texts: Iterable[str]) -> Dict:
         """
-        Extract top keywords from a list of texts
+        Score a batch of texts into columnar NumPy arrays
+        Returns positive/negative/neutral/compound float arrays, a label
+        array indexing SENTIMENT_LABELS, an (n, 4) emotion matrix ordered
+        like EMOTIONS and a KeywordSketch of the batch
         """
-        if not texts:
-            return []
+        if self.workers > 1:
+            texts = list(texts)
+            if len(texts) > self.chunk_size:
+                return self._score_sharded(texts)
+        
+        with PREPROCESS_SECONDS.time():
+            cleaned_texts = [self.preprocess_text(text) for text in texts]
+        
+        with KEYWORDS_SECONDS.time():
+            keywords = KeywordSketch(self.keyword_capacity)
+            keywords.add_texts(cleaned_texts)
         
-        # Combine all texts
-        combined_text = ' '.join([self.preprocess_text(text) for text in texts])
+        empty_row = (0.0, 0.0, 1.0, 0.0) + (0,) * len(EMOTIONS)
+        with SCORE_SECONDS.time():
+            rows = np.array(
+                [self._score_clean(text) if text else empty_row for text in cleaned_texts],
+                dtype=np.float64
+            ).reshape(-1, 4 + len(EMOTIONS))
         
-        # Remove stopwords and punctuation
-        stopwords = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
-                    'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'be',
-                    'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-                    'would', 'should', 'could', 'may', 'might', 'must', 'can', 'this',
-                    'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'}
+        scores = rows[:, :4]
+        compound = scores[:, 3]
         
-        words = combined_text.lower().split()
-        words = [word.strip(string.punctuation) for word in words]
-        words = [word for word in words if word and word not in stopwords and len(word) > 2]
+        # Classify sentiment
+        labels = np.full(len(cleaned_texts), SENTIMENT_LABELS.index('neutral'), dtype=np.int8)
+        labels[compound >= 0.05] = SENTIMENT_LABELS.index('positive')
+        labels[compound <= -0.05] = SENTIMENT_LABELS.index('negative')
+        
+        # Emotion percentages, falling back to the sentiment label when nothing matched
+        counts = rows[:, 4:].astype(np.int32)
+        totals = counts.sum(axis=1)
+        matched = totals > 0
+        emotions = np.zeros(counts.shape, dtype=np.int32)
+        emotions[matched] = (counts[matched] / totals[matched, None] * 100).astype(np.int32)
+        non_empty = np.fromiter((bool(text) for text in cleaned_texts), dtype=bool, count=len(cleaned_texts))
+        fallback = non_empty & ~matched
+        emotions[fallback] = _FALLBACK_MATRIX[labels[fallback]]
         
-        # Count word frequency
-        word_freq = {}
-        for word in words:
-            word_freq[word] = word_freq.get(word, 0) + 1
+        return {
+            'positive': scores[:, 0],
+            'negative': scores[:, 1],
+            'neutral': scores[:, 2],
+            'compound': compound,
+            'labels': labels,
+            'emotions': emotions,
+            'keywords': keywords
+        }
+    
+    def worker_initargs(self) -> tuple:
+        """
+        initargs for _init_worker, so pool workers match this analyzer's settings
+        """
+        return (self.cache.max_entries, self.keyword_capacity)
+    
+    def _score_sharded(self, texts: List[str]) -> Dict:
+        """
+        Split texts into chunks, score them in the process pool and
+        concatenate the columns back in input order
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=_init_worker, initargs=self.worker_initargs()
+                )
         
-        # Get top N keywords
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:top_n]
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        # map yields results in submission order, so the merge is deterministic
+        results = list(self._pool.map(_score_chunk, chunks))
         
-        return [{'word': word, 'count': count} for word, count in sorted_words]
+        merged = {
+            column: np.concatenate([result[column] for result in results])
+            for column in ('positive', 'negative', 'neutral', 'compound', 'labels', 'emotions')
+        }
+        merged['keywords'] = results[0]['keywords']
+        for result in results[1:]:
+            merged['keywords'].merge(result['keywords'])
+        return merged
+    
+    def close(self):
+        """
+        Shut down the worker pool if one was started
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
     
-    def analyze_batch(self, texts: List[str]) -> Dict:
+    def analyze_batch(self, texts: Iterable[str]) -> Dict:
         """
         Analyze sentiment for a batch of texts
         Returns aggregated results
         """
-        if not texts:
+        columns = self.score_batch(texts)
+        
+        with AGGREGATE_SECONDS.time():
+            return self._aggregate(columns)
+    
+    def _aggregate(self, columns: Dict) -> Dict:
+        """
+        Reduce score_batch columns to the analyze_batch response
+        """
+        total_texts = len(columns['labels'])
+        
+        if total_texts == 0:
             return {
                 'sentiment': {'positive': 0, 'negative': 0, 'neutral': 0, 'total': 0},
                 'emotions': {'joy': 0, 'anger': 0, 'fear': 0, 'sadness': 0},
                 'keywords': []
             }
         
-        positive_count = 0
-        negative_count = 0
-        neutral_count = 0
-        
-        total_joy = 0
-        total_anger = 0
-        total_fear = 0
-        total_sadness = 0
-        
-        for text in texts:
-            sentiment = self.analyze_sentiment(text)
-            if sentiment['classification'] == 'positive':
-                positive_count += 1
-            elif sentiment['classification'] == 'negative':
-                negative_count += 1
-            else:
-                neutral_count += 1
-            
-            emotions = self.analyze_emotion(text)
-            total_joy += emotions['joy']
-            total_anger += emotions['anger']
-            total_fear += emotions['fear']
-            total_sadness += emotions['sadness']
-        
-        total_texts = len(texts)
-        keywords = self.extract_keywords(texts)
+        label_counts = np.bincount(columns['labels'], minlength=len(SENTIMENT_LABELS))
+        emotion_means = columns['emotions'].sum(axis=0) / total_texts
+        keywords = columns['keywords'].top(5)
         
         return {
             'sentiment': {
-                'positive': positive_count,
-                'negative': negative_count,
-                'neutral': neutral_count,
+                'positive': int(label_counts[SENTIMENT_LABELS.index('positive')]),
+                'negative': int(label_counts[SENTIMENT_LABELS.index('negative')]),
+                'neutral': int(label_counts[SENTIMENT_LABELS.index('neutral')]),
                 'total': total_texts
             },
             'emotions': {
-                'joy': int(total_joy / total_texts),
-                'anger': int(total_anger / total_texts),
-                'fear': int(total_fear / total_texts),
-                'sadness': int(total_sadness / total_texts)
+                emotion: int(emotion_means[i])
+                for i, emotion in enumerate(EMOTIONS)
             },
             'keywords': keywords
         }
@@ -0,0 +1,86 @@
+"""
+Benchmark for streaming anomaly detection
+Compares the fixed 40% negative threshold (check_sentiment_spike) with
+AnomalyDetector on simulated per-keyword batch streams: false alerts
+before a crisis, batches until the crisis is flagged, and update cost
+across many keywords
+
+Run from the sentilytics directory:
+    python benchmarks/bench_anomaly.py [keywords]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.anomaly_detector import AnomalyDetector
+
+BATCH_SIZE = 50
+BATCHES = 200
+CRISIS_AT = 150
+THRESHOLD = 0.4
+
+
+def simulate(rng, streams, baseline, crisis):
+    """Negative counts per (stream, batch); the share jumps to `crisis` at CRISIS_AT"""
+    shares = np.full((streams, BATCHES), baseline)
+    shares[:, CRISIS_AT:] = crisis
+    return rng.binomial(BATCH_SIZE, shares)
+
+
+def evaluate(negatives):
+    """(false alerts per stream before the crisis, median batches to detect, share detected) for both methods"""
+    results = {}
+    threshold_hits = negatives / BATCH_SIZE >= THRESHOLD
+
+    detector = AnomalyDetector()
+    detector_hits = np.zeros(negatives.shape, dtype=bool)
+    for stream, row in enumerate(negatives):
+        keyword = f"k{stream}"
+        for batch, negative in enumerate(row.tolist()):
+            detector_hits[stream, batch] = detector.update(keyword, negative, BATCH_SIZE) is not None
+
+    for name, hits in (('threshold 40%', threshold_hits), ('AnomalyDetector', detector_hits)):
+        false_alerts = hits[:, :CRISIS_AT].sum(axis=1).mean()
+        after = hits[:, CRISIS_AT:]
+        detected = after.any(axis=1)
+        delays = after.argmax(axis=1)[detected]
+        results[name] = (false_alerts, float(np.median(delays)) if len(delays) else None, detected.mean())
+    return results
+
+
+def main():
+    keywords = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rng = np.random.default_rng(3)
+
+    scenarios = [
+        ('calm 20% -> crisis 50%', 0.20, 0.50),
+        ('calm 20% -> crisis 32%', 0.20, 0.32),
+        ('noisy 35% -> crisis 55%', 0.35, 0.55),
+    ]
+    print(f"{BATCH_SIZE} posts/batch, crisis at batch {CRISIS_AT} of {BATCHES}, 500 streams per scenario")
+    for label, baseline, crisis in scenarios:
+        results = evaluate(simulate(rng, 500, baseline, crisis))
+        print(label)
+        for name, (false_alerts, delay, detected) in results.items():
+            delay_text = f"{delay:.0f} batches" if delay is not None else "never"
+            print(f"  {name:<16} false alerts/stream {false_alerts:6.2f}   "
+                  f"detected {detected:6.1%}   median delay {delay_text}")
+
+    # Update cost with many monitored keywords
+    detector = AnomalyDetector()
+    negatives = rng.binomial(BATCH_SIZE, 0.2, size=keywords * 10).tolist()
+    names = [f"keyword_{i}" for i in range(keywords)]
+    start = time.perf_counter()
+    for i, negative in enumerate(negatives):
+        detector.update(names[i % keywords], negative, BATCH_SIZE)
+    elapsed = time.perf_counter() - start
+    print(f"\n{keywords} keywords x 10 batches: {len(negatives) / elapsed:,.0f} updates/s "
+          f"({elapsed / len(negatives) * 1e6:.2f} us/update)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark for WebSocket broadcast encoding
+Compares send_json per connection (one json.dumps per client) with a
+packet encoded once by encode_packet and sent as the same bytes to every client
+
+Connections are Starlette WebSocket objects over an in-memory ASGI send,
+so this measures encode + framework cost, not the network.
+
+Run from the sentilytics directory:
+    python benchmarks/bench_broadcast.py
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from starlette.websockets import WebSocket
+
+from backend.encoding import encode_packet, orjson
+
+PACKET = {
+    'type': 'sentiment_update',
+    'timestamp': '2024-01-01T12:00:00.000000',
+    'post': {
+        'text': "Tesla's autopilot is absolutely amazing! The future is here!",
+        'username': 'TechEnthusiast',
+        'platform': 'Twitter'
+    },
+    'analysis': {
+        'sentiment': 'positive',
+        'emotion': 'joy',
+        'scores': {'positive': 0.381, 'negative': 0.0, 'neutral': 0.619, 'compound': 0.6884},
+        'polarity': 0.35,
+        'subjectivity': 0.6125
+    },
+    'stats': {
+        'total_posts': 123456,
+        'sentiment_distribution': {
+            'positive': 61.0, 'negative': 19.0, 'neutral': 20.0,
+            'counts': {'positive': 61, 'negative': 19, 'neutral': 20, 'total': 100}
+        },
+        'emotion_distribution': {'joy': 50123, 'anger': 20456, 'fear': 9876, 'sadness': 8765, 'neutral': 34567}
+    }
+}
+
+
+def make_connections(count):
+    async def receive():
+        return {'type': 'websocket.connect'}
+
+    async def send(message):
+        pass
+
+    connections = []
+    for _ in range(count):
+        websocket = WebSocket({'type': 'websocket', 'path': '/ws', 'headers': []}, receive, send)
+        websocket.client_state = websocket.client_state.CONNECTED
+        websocket.application_state = websocket.application_state.CONNECTED
+        connections.append(websocket)
+    return connections
+
+
+async def per_connection_json(connections):
+    for websocket in connections:
+        await websocket.send_json(PACKET)
+
+
+async def encoded_once(connections):
+    message = encode_packet(PACKET)
+    for websocket in connections:
+        await websocket.send_bytes(message)
+
+
+def time_encode(func, repeat=100_000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(PACKET)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+async def time_broadcast(func, connections, ticks):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        await func(connections)
+    elapsed = time.perf_counter() - start
+    return len(connections) * ticks / elapsed, elapsed / ticks * 1000
+
+
+async def main():
+    print(f"encoder: {'orjson' if orjson else 'json (orjson not installed)'}")
+    print(f"json.dumps:     {time_encode(json.dumps):.2f} us/packet")
+    print(f"encode_packet:  {time_encode(encode_packet):.2f} us/packet")
+    print()
+    for count in (100, 1_000, 10_000):
+        connections = make_connections(count)
+        ticks = max(1, 100_000 // count)
+        before, before_ms = await time_broadcast(per_connection_json, connections, ticks)
+        after, after_ms = await time_broadcast(encoded_once, connections, ticks)
+        print(f"connections={count:<6} send_json {before:>9.0f} sends/s ({before_ms:>7.2f} ms/tick)"
+              f"   encoded once {after:>9.0f} sends/s ({after_ms:>7.2f} ms/tick)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
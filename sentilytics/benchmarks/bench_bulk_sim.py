@@ -0,0 +1,67 @@
+"""
+Benchmark for synthetic post generation
+Compares DataSimulator.generate_batch (one dict per post) with
+BulkSimulator's columnar chunks, with and without materializing texts
+
+Run from the sentilytics directory:
+    python benchmarks/bench_bulk_sim.py [num_posts]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bulk_simulator import SENTIMENTS, BulkSimulator
+from data_simulator import DataSimulator
+
+
+def timed(label, count, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {count / elapsed:>12,.0f} posts/s")
+    return result
+
+
+def consume(chunks, with_texts, simulator):
+    for columns in chunks:
+        if with_texts:
+            simulator.texts(columns)
+
+
+def main():
+    num_posts = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    baseline_posts = min(num_posts, 100_000)
+
+    timed("DataSimulator.generate_batch", baseline_posts,
+          lambda: DataSimulator().generate_batch(baseline_posts))
+
+    bulk = BulkSimulator(seed=7)
+    timed("BulkSimulator chunks (columns)", num_posts,
+          lambda: consume(bulk.chunks(num_posts), False, bulk))
+    timed("BulkSimulator chunks + texts", num_posts,
+          lambda: consume(bulk.chunks(num_posts), True, bulk))
+    timed("BulkSimulator bursty (x10 bursts)", num_posts,
+          lambda: consume(bulk.chunks(num_posts, burst_factor=10), False, bulk))
+    timed("BulkSimulator.to_posts (dicts)", baseline_posts,
+          lambda: bulk.to_posts(bulk.generate(baseline_posts)))
+
+    # Crisis injection: share of negative posts inside vs outside the window
+    columns = bulk.generate(200_000, rate=1000, crisis_start=50.0, crisis_duration=20.0)
+    in_crisis = (columns['timestamp'] >= 50.0) & (columns['timestamp'] < 70.0)
+    negative = columns['sentiment'] == SENTIMENTS.index('negative')
+    print(f"negative share: outside crisis {negative[~in_crisis].mean():.1%}, "
+          f"inside crisis {negative[in_crisis].mean():.1%}")
+
+    # Burstiness: coefficient of variation of posts per second
+    columns = bulk.generate(200_000, rate=1000, burst_factor=10)
+    per_second = np.bincount(columns['timestamp'].astype(np.int64))
+    print(f"posts/s coefficient of variation: poisson ~{1 / np.sqrt(1000):.2f}, "
+          f"bursty {per_second.std() / per_second.mean():.2f}")
+
+
+if __name__ == "__main__":
+    main()
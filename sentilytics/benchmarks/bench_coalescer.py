@@ -0,0 +1,65 @@
+"""
+Benchmark for alert coalescing
+Replays an alert storm (a crisis across many keywords, one alert per
+keyword every few seconds for an hour) through AlertCoalescer and reports
+how many alerts clients would receive, and the cost per offered alert
+
+Run from the sentilytics directory:
+    python benchmarks/bench_coalescer.py [keywords]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.alert_coalescer import AlertCoalescer
+
+DURATION = 3600.0
+INTERVAL = 2.0  # seconds between alerts for one keyword
+WINDOW = 300.0
+
+
+def build_storm(rng, keywords):
+    """(time, alert) pairs sorted by time; ~5% of alerts escalate to high"""
+    times = np.arange(0, DURATION, INTERVAL)
+    storm = []
+    for k in range(keywords):
+        offsets = times + rng.uniform(0, INTERVAL)
+        severities = np.where(rng.random(len(times)) < 0.05, 'high', 'medium')
+        for at, severity in zip(offsets, severities):
+            storm.append((float(at), {
+                'type': 'negative_spike',
+                'severity': str(severity),
+                'keyword': f'kw{k}',
+                'timestamp': str(at)
+            }))
+    storm.sort(key=lambda item: item[0])
+    return storm
+
+
+def main():
+    keywords = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    storm = build_storm(np.random.default_rng(7), keywords)
+
+    coalescer = AlertCoalescer(window=WINDOW)
+    published = 0
+    start = time.perf_counter()
+    for at, alert in storm:
+        published += len(coalescer.offer(alert, now=at))
+    published += len(coalescer.flush(now=DURATION + WINDOW))
+    elapsed = time.perf_counter() - start
+
+    stats = coalescer.get_stats()
+    print(f"{keywords} keywords, {len(storm):,} alerts over {DURATION / 60:.0f} min, {WINDOW:.0f}s window")
+    print(f"  delivered without coalescing: {len(storm):>9,}")
+    print(f"  delivered with coalescing:    {published:>9,}  "
+          f"({stats['published'] - stats['escalations']:,} first, {stats['escalations']:,} escalations, "
+          f"{stats['digests']:,} digests)")
+    print(f"  reduction: x{len(storm) / published:.1f}, {elapsed / len(storm) * 1e6:.2f} us per alert")
+
+
+if __name__ == "__main__":
+    main()
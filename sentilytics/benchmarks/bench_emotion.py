@@ -0,0 +1,71 @@
+"""
+Benchmark for emotion keyword matching
+Compares per-keyword substring scans against EmotionMatcher at several lexicon sizes
+
+Run from the sentilytics directory:
+    python benchmarks/bench_emotion.py [num_posts]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.emotion_matcher import EmotionMatcher
+from bench_preprocess import build_posts
+
+EMOTIONS = ('joy', 'anger', 'fear', 'sadness')
+BASE_LEXICON = {
+    'joy': ['happy', 'joy', 'excited', 'love', 'great', 'awesome', 'amazing', 'wonderful', 'excellent'],
+    'anger': ['angry', 'mad', 'furious', 'hate', 'terrible', 'awful', 'worst', 'disgusting'],
+    'fear': ['scared', 'afraid', 'fearful', 'worried', 'anxious', 'nervous', 'terrified'],
+    'sadness': ['sad', 'depressed', 'unhappy', 'disappointed', 'heartbroken', 'crying']
+}
+
+
+def build_lexicon(size, seed=7):
+    """Pad the real lexicon with synthetic words up to size entries"""
+    rng = random.Random(seed)
+    base = [(emotion, word) for emotion in EMOTIONS for word in BASE_LEXICON[emotion]]
+    entries = base[:size]
+    while len(entries) < size:
+        word = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 10)))
+        entries.append((rng.choice(EMOTIONS), word))
+    lexicon = {emotion: [] for emotion in EMOTIONS}
+    for emotion, word in entries:
+        lexicon[emotion].append(word)
+    return lexicon
+
+
+def substring_counts(lexicon, text):
+    """Old approach: one substring test per keyword"""
+    text_lower = text.lower()
+    return [sum(1 for word in lexicon[emotion] if word in text_lower) for emotion in EMOTIONS]
+
+
+def time_per_text(func, posts):
+    start = time.perf_counter()
+    for post in posts:
+        func(post)
+    return (time.perf_counter() - start) / len(posts) * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    posts = build_posts(count)
+
+    print(f"posts: {count}")
+    for size in (10, 1_000, 10_000):
+        lexicon = build_lexicon(size)
+        matcher = EmotionMatcher(lexicon)
+        # The substring scan is O(keywords) per post, so time it on a subset at large sizes
+        sample = posts[:max(200, count * 10 // size)]
+        before = time_per_text(lambda t: substring_counts(lexicon, t), sample)
+        after = time_per_text(matcher.count, posts)
+        print(f"keywords={size:<6} substring {before:>9.2f} us/text   matcher {after:>6.2f} us/text"
+              f"   {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
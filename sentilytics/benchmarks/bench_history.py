@@ -0,0 +1,89 @@
+"""
+Memory benchmark for the dashboard's sentiment history and activity log
+Compares trimmed lists of dicts against the ring buffers in history_buffer.py
+
+Run from the sentilytics directory:
+    python benchmarks/bench_history.py [num_posts]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from history_buffer import ActivityLog, SentimentHistory
+
+
+def make_analysis(rng):
+    """Fresh dict shaped like SentimentAnalyzer.analyze_sentiment output"""
+    positive, negative = rng.random(), rng.random()
+    return {
+        'sentiment': rng.choice(['positive', 'negative', 'neutral']),
+        'emotion': rng.choice(['joy', 'anger', 'fear', 'sadness', 'neutral']),
+        'scores': {
+            'positive': positive,
+            'negative': negative,
+            'neutral': 1 - positive,
+            'compound': positive - negative
+        },
+        'polarity': rng.uniform(-1, 1),
+        'subjectivity': rng.random()
+    }
+
+
+def run_lists(count, rng):
+    sentiment_history = []
+    activity_log = []
+    for i in range(count):
+        analysis = make_analysis(rng)
+        sentiment_history.append(analysis)
+        activity_log.append({
+            'timestamp': f'2024-01-01T00:00:{i % 60:02d}',
+            'message': f"Analyzed post from @user: {analysis['sentiment']} sentiment",
+            'sentiment': analysis['sentiment']
+        })
+        if len(sentiment_history) > 1000:
+            sentiment_history = sentiment_history[-1000:]
+        if len(activity_log) > 50:
+            activity_log = activity_log[-50:]
+    return sentiment_history, activity_log
+
+
+def run_ring_buffers(count, rng):
+    sentiment_history = SentimentHistory(capacity=1000)
+    activity_log = ActivityLog(capacity=50)
+    for i in range(count):
+        analysis = make_analysis(rng)
+        sentiment_history.append(analysis)
+        activity_log.append(
+            timestamp=f'2024-01-01T00:00:{i % 60:02d}',
+            message=f"Analyzed post from @user: {analysis['sentiment']} sentiment",
+            sentiment=analysis['sentiment']
+        )
+    return sentiment_history, activity_log
+
+
+def measure(func, count):
+    tracemalloc.start()
+    start = time.perf_counter()
+    state = func(count, random.Random(1))
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del state
+    return elapsed, retained, peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"posts: {count}")
+    for name, func in (('list + trim', run_lists), ('ring buffers', run_ring_buffers)):
+        elapsed, retained, peak = measure(func, count)
+        print(f"{name:<13} retained {retained / 1024:>8.1f} KiB   peak {peak / 1024:>8.1f} KiB"
+              f"   {count / elapsed:>9.0f} posts/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark for the persistent analysis history
+Writes simulated /api/analyze results for many keywords into HistoryStore
+and compares batched flushes with committing every entry on its own
+(what a naive write-through store would do), then reads 30 days at hourly
+resolution from the rollups versus loading every raw entry in the range
+
+Run from the sentilytics directory:
+    python benchmarks/bench_history_store.py [entries]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.history_store import HistoryStore
+
+KEYWORDS = 200
+
+
+def make_result(rng):
+    total = 100
+    negative = rng.randint(0, 60)
+    positive = rng.randint(0, total - negative)
+    return {
+        'sentiment': {'positive': positive, 'negative': negative,
+                      'neutral': total - negative - positive, 'total': total},
+        'emotions': {'joy': rng.randint(0, 3), 'anger': rng.randint(0, 3), 'fear': 0, 'sadness': 0},
+        'keywords': [{'word': 'battery', 'count': 12}, {'word': 'launch', 'count': 9}]
+    }
+
+
+def run(entries, batch_size):
+    rng = random.Random(3)
+    results = [make_result(rng) for _ in range(entries)]
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, 'history.db'))
+        start = time.perf_counter()
+        # One entry per minute per keyword, spread back over the retained window
+        now = time.time()
+        for i, result in enumerate(results):
+            store.record(f'kw{i % KEYWORDS}', result, now - (entries - i) * 60 / KEYWORDS)
+            if (i + 1) % batch_size == 0:
+                store.flush()
+        store.flush()
+        elapsed = time.perf_counter() - start
+        store.close()
+    return entries / elapsed
+
+
+def read_30_days():
+    """Seconds to page through 30 days of one-per-minute history: hourly rollups vs raw entries"""
+    rng = random.Random(5)
+    days = 30
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, 'history.db'), raw_retention=days * 86400 * 2)
+        now = time.time()
+        start = now - days * 86400
+        for minute in range(days * 1440):
+            store.record('Tesla', make_result(rng), start + minute * 60)
+            if minute % 500 == 0:
+                store.flush()
+        store.flush()
+
+        timings = {}
+        for resolution in ('hour', 'raw'):
+            began = time.perf_counter()
+            items, page_from, page_id = 0, start, None
+            while page_from is not None:
+                page, page_from, page_id = store.query('Tesla', resolution, page_from, now + 60,
+                                                       limit=500, start_id=page_id)
+                items += len(page)
+            timings[resolution] = (time.perf_counter() - began, items)
+        store.close()
+    return timings
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    single = run(min(entries, 2_000), 1)
+    batched = run(entries, 500)
+    print(f"{KEYWORDS} keywords, raw entries + minute/hour/day rollups, SQLite WAL")
+    print(f"  commit per entry:    {single:>10,.0f} entries/s")
+    print(f"  batches of 500:      {batched:>10,.0f} entries/s  (x{batched / single:.1f})")
+
+    timings = read_30_days()
+    hourly, raw = timings['hour'], timings['raw']
+    print("30 days of one analysis per minute, pages of 500")
+    print(f"  hourly rollups:      {hourly[0] * 1000:>10.1f} ms  ({hourly[1]:,} buckets)")
+    print(f"  raw entries:         {raw[0] * 1000:>10.1f} ms  ({raw[1]:,} entries, x{raw[0] / hourly[0]:.0f} slower)")
+
+
+if __name__ == "__main__":
+    main()
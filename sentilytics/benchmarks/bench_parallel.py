@@ -0,0 +1,51 @@
+"""
+Throughput benchmark for process-pool sharded batch scoring
+Scores the same batch with 1..N workers and reports posts/s
+
+Run from the sentilytics directory:
+    python benchmarks/bench_parallel.py [num_posts] [max_workers] [chunk_size]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+
+from backend.sentiment_analyzer import SentimentAnalyzer
+from bench_preprocess import build_posts
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    chunk_size = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+    posts = build_posts(count)
+
+    baseline = None
+    print(f"posts: {count}  chunk_size: {chunk_size}  cpu_count: {os.cpu_count()}")
+    for workers in range(1, max_workers + 1):
+        analyzer = SentimentAnalyzer(workers=workers, chunk_size=chunk_size)
+        # Warm the pool so process start-up is not counted
+        analyzer.score_batch(posts[:chunk_size + 1])
+
+        start = time.perf_counter()
+        columns = analyzer.score_batch(posts)
+        elapsed = time.perf_counter() - start
+        analyzer.close()
+
+        if baseline is None:
+            baseline = columns
+        else:
+            assert np.array_equal(baseline['compound'], columns['compound'])
+            assert np.array_equal(baseline['emotions'], columns['emotions'])
+
+        rate = count / elapsed
+        if workers == 1:
+            single_rate = rate
+        print(f"workers={workers:<3} {rate:>10.0f} posts/s  {rate / single_rate:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Microbenchmark for SentimentAnalyzer.preprocess_text
+Compares the old multi-pass cleaner against the single-pass normalizer
+
+Run from the sentilytics directory:
+    python benchmarks/bench_preprocess.py [num_posts]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.data_collector import DataCollector
+from backend.sentiment_analyzer import SentimentAnalyzer
+
+
+def legacy_preprocess(emoji_map, text):
+    """Original implementation: one replace per emoji and four regex passes"""
+    if not text:
+        return ""
+    for emoji, meaning in emoji_map.items():
+        text = text.replace(emoji, f' {meaning} ')
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'@\w+', '', text)
+    text = re.sub(r'#(\w+)', r'\1', text)
+    text = ' '.join(text.split())
+    return text.strip()
+
+
+def build_posts(count, seed=42):
+    """Build simulated posts with the kind of noise real feeds carry"""
+    rng = random.Random(seed)
+    templates = [t for group in DataCollector().sample_posts.values() for t in group]
+    extras = ['', ' https://t.co/abc123', ' @someone', ' #brand', ' www.example.com/x']
+    return [
+        f"{rng.choice(['Tesla', 'AI', 'iPhone'])}: {rng.choice(templates)}{rng.choice(extras)}"
+        for _ in range(count)
+    ]
+
+
+def time_per_text(func, posts):
+    start = time.perf_counter()
+    for post in posts:
+        func(post)
+    return (time.perf_counter() - start) / len(posts) * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    analyzer = SentimentAnalyzer()
+    posts = build_posts(count)
+
+    mismatches = sum(
+        1 for post in posts
+        if legacy_preprocess(analyzer.emoji_map, post) != analyzer.preprocess_text(post)
+    )
+
+    before = time_per_text(lambda t: legacy_preprocess(analyzer.emoji_map, t), posts)
+    after = time_per_text(analyzer.preprocess_text, posts)
+
+    print(f"posts:            {count}")
+    print(f"output mismatches: {mismatches}")
+    print(f"before:           {before:.2f} us/text")
+    print(f"after:            {after:.2f} us/text")
+    print(f"speedup:          {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
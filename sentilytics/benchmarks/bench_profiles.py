@@ -0,0 +1,84 @@
+"""
+Benchmark for the top-level SentimentAnalyzer scorer profiles
+Runs each profile in a fresh interpreter so import cost and whether
+TextBlob was loaded at all are measured per profile. Every result is also
+stored in SentimentHistory, as the dashboard's process_post does
+
+Run from the sentilytics directory:
+    python benchmarks/bench_profiles.py [num_posts]
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+# Share of lazy results whose subjectivity is read afterwards
+LAZY_ACCESS_SHARE = 0.1
+
+
+def run_profile(profile, num_posts):
+    """Child process: import, construct, analyze; print a JSON summary"""
+    start = time.perf_counter()
+    from sentiment_analyzer import SentimentAnalyzer
+    from history_buffer import SentimentHistory
+    from bench_preprocess import build_posts
+    analyzer = SentimentAnalyzer(profile)
+    history = SentimentHistory(capacity=1000)
+    startup = time.perf_counter() - start
+
+    posts = build_posts(num_posts)
+    for post in posts[:100]:
+        history.append(analyzer.analyze_sentiment(post))
+    loaded_after_warmup = 'textblob' in sys.modules
+
+    start = time.perf_counter()
+    analyses = []
+    for post in posts:
+        analysis = analyzer.analyze_sentiment(post)
+        history.append(analysis)
+        analyses.append(analysis)
+    elapsed = time.perf_counter() - start
+
+    accessed = 0
+    if profile == 'lazy':
+        step = int(1 / LAZY_ACCESS_SHARE)
+        start = time.perf_counter()
+        for analysis in analyses[::step]:
+            analysis['subjectivity']
+            accessed += 1
+        elapsed += time.perf_counter() - start
+
+    print(json.dumps({
+        'startup_s': startup,
+        'posts_per_s': num_posts / elapsed,
+        'textblob_loaded_before_access': loaded_after_warmup,
+        'textblob_loaded': 'textblob' in sys.modules,
+        'subjectivity_reads': accessed
+    }))
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--profile':
+        run_profile(sys.argv[2], int(sys.argv[3]))
+        return
+
+    num_posts = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    print(f"posts: {num_posts}  (lazy reads subjectivity on {LAZY_ACCESS_SHARE:.0%} of results)")
+    for profile in ('full', 'lazy', 'fast'):
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--profile', profile, str(num_posts)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+            env=dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+        )
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        print(f"{profile:<5} {result['posts_per_s']:>9,.0f} posts/s   startup {result['startup_s']:.2f}s   "
+              f"textblob imported: {'yes' if result['textblob_loaded'] else 'no'}"
+              f"{' (on first access)' if result['textblob_loaded'] and not result['textblob_loaded_before_access'] else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Throughput benchmark for ReplaySource
+Writes a recorded-traffic file per format and replays it as fast as possible,
+then checks that rate-limited replay holds the requested rate and that
+resuming from a cursor does not slow down as the cursor advances
+
+Run from the sentilytics directory:
+    python benchmarks/bench_replay.py [num_posts]
+"""
+import asyncio
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.collectors import ReplaySource, pq
+from bench_preprocess import build_posts
+
+
+def write_files(directory, texts):
+    rows = [
+        {'id': f'post_{i}', 'text': text, 'author': f'user_{i % 9000 + 1000}', 'platform': 'Twitter'}
+        for i, text in enumerate(texts)
+    ]
+    paths = {}
+
+    paths['jsonl'] = os.path.join(directory, 'posts.jsonl')
+    with open(paths['jsonl'], 'w', encoding='utf-8') as f:
+        for row in rows:
+            f.write(json.dumps(row) + '\n')
+
+    paths['csv'] = os.path.join(directory, 'posts.csv')
+    with open(paths['csv'], 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    if pq is not None:
+        import pyarrow as pa
+        paths['parquet'] = os.path.join(directory, 'posts.parquet')
+        pq.write_table(pa.Table.from_pylist(rows), paths['parquet'])
+
+    return paths
+
+
+async def replay(source, keyword=None, batch_size=1000):
+    count = 0
+    start = time.perf_counter()
+    async for batch in source.batches(keyword, batch_size=batch_size):
+        count += len(batch.posts)
+    return count, time.perf_counter() - start
+
+
+async def collect_in_steps(source, count=100):
+    """Resume from the cursor on every call, like DataCollector.collect_posts"""
+    total, cursor = 0, None
+    start = time.perf_counter()
+    while True:
+        batch = await source.collect(None, count, cursor=cursor)
+        if not batch.posts:
+            break
+        total += len(batch.posts)
+        cursor = batch.cursor
+    return total, time.perf_counter() - start
+
+
+async def main():
+    num_posts = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    texts = build_posts(num_posts)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_files(directory, texts)
+        if pq is None:
+            print("parquet: skipped (pyarrow not installed)")
+
+        for file_format, path in paths.items():
+            count, elapsed = await replay(ReplaySource(path))
+            print(f"{file_format:<8} all posts       {count:>8} posts  {count / elapsed:>10.0f} posts/s")
+            count, elapsed = await replay(ReplaySource(path), keyword='tesla')
+            print(f"{file_format:<8} keyword 'tesla' {count:>8} posts  {count / elapsed:>10.0f} posts/s")
+
+        for file_format, path in paths.items():
+            count, elapsed = await collect_in_steps(ReplaySource(path))
+            print(f"{file_format:<8} collect(100) x {count // 100:<6} {count:>8} posts  {count / elapsed:>10.0f} posts/s")
+
+        rate = 20_000
+        count, elapsed = await replay(ReplaySource(paths['jsonl'], rate=rate), batch_size=500)
+        print(f"jsonl at {rate} posts/s target: {count / elapsed:.0f} posts/s achieved")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+"""
+Latency test for /api/health while /api/analyze is saturated
+Starts backend.main:app with uvicorn in a subprocess once per ANALYSIS_EXECUTOR
+mode, probes /api/health at a fixed rate, first idle and then while many
+concurrent clients hammer /api/analyze, and reports health p50/p99.
+The /api/analyze load runs in its own process so the prober's event loop
+only measures the server.
+
+With analysis on the event loop ('inline') every health probe queues behind
+analyze_batch; with 'thread' or 'process' the loop stays free.
+
+Run from the sentilytics directory:
+    python benchmarks/latency_health.py [analyze_clients] [seconds] [modes...]
+"""
+import asyncio
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+PORT = 8766
+BASE_URL = f"http://127.0.0.1:{PORT}"
+PROBE_INTERVAL = 0.02
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def start_server(mode):
+    env = dict(os.environ, ANALYSIS_EXECUTOR=mode, RESULT_CACHE_SIZE="0", HISTORY_DB_PATH=":memory:")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app",
+         "--host", "127.0.0.1", "--port", str(PORT), "--log-level", "warning"],
+        cwd=ROOT, env=env
+    )
+
+
+async def wait_ready(client):
+    for _ in range(200):
+        try:
+            await client.get(f"{BASE_URL}/api/health")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def probe_health(client, seconds):
+    """Hit /api/health every PROBE_INTERVAL seconds; returns latencies in ms"""
+    latencies = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        await client.get(f"{BASE_URL}/api/health")
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(PROBE_INTERVAL)
+    return latencies
+
+
+async def analyze_loop(client, end, counter):
+    keywords = ("Tesla", "iPhone", "ChatGPT", "Netflix")
+    index = 0
+    while time.perf_counter() < end:
+        await client.get(f"{BASE_URL}/api/analyze", params={'keyword': keywords[index % len(keywords)]})
+        counter[0] += 1
+        index += 1
+
+
+async def generate_load(analyze_clients, seconds):
+    counter = [0]
+    end = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=analyze_clients)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        await asyncio.gather(*(analyze_loop(client, end, counter) for _ in range(analyze_clients)))
+    return counter[0]
+
+
+def load_process(analyze_clients, seconds, result):
+    result.value = asyncio.run(generate_load(analyze_clients, seconds))
+
+
+async def run_mode(mode, analyze_clients, seconds):
+    server = start_server(mode)
+    try:
+        async with httpx.AsyncClient(timeout=60) as client:
+            await wait_ready(client)
+            # Warm up the analyzer and let the executor spawn all of its workers
+            await asyncio.gather(*(
+                client.get(f"{BASE_URL}/api/analyze", params={'keyword': 'warmup'}) for _ in range(8)
+            ))
+
+            idle = await probe_health(client, seconds)
+
+            # Ramp up for a second, probe for `seconds`, then let the load drain
+            completed = multiprocessing.Value('i', 0)
+            loader = multiprocessing.Process(target=load_process, args=(analyze_clients, seconds + 2, completed))
+            loader.start()
+            await asyncio.sleep(1)
+            busy = await probe_health(client, seconds)
+            await asyncio.get_running_loop().run_in_executor(None, loader.join)
+            analyze_rate = completed.value / (seconds + 2)
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"{mode:<8} idle p50 {statistics.median(idle):6.2f} ms  p99 {percentile(idle, 99):7.2f} ms"
+          f"   saturated p50 {statistics.median(busy):7.2f} ms  p99 {percentile(busy, 99):7.2f} ms"
+          f"   analyze {analyze_rate:6.1f} req/s")
+
+
+async def main():
+    analyze_clients = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    modes = sys.argv[3:] or ["inline", "thread", "process"]
+    print(f"analyze clients={analyze_clients} window={seconds}s cpus={os.cpu_count()}")
+    for mode in modes:
+        await run_mode(mode, analyze_clients, seconds)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""
+WebSocket fan-out load test for the dashboard's /ws endpoint
+Starts main:app in-process with uvicorn and connects N real clients
+
+Run from the sentilytics directory:
+    python benchmarks/loadtest_ws.py [clients] [ticks] [interval_seconds] [slow_clients]
+"""
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import uvicorn
+import websockets
+
+import main
+
+PORT = 8765
+
+
+async def client(index, ready, results, ticks, slow):
+    """Connect, then record arrival times of sentiment updates"""
+    async with websockets.connect(f"ws://127.0.0.1:{PORT}/ws", max_queue=None) as ws:
+        await ws.recv()  # connection message
+        ready.release()
+        arrivals = []
+        try:
+            while len(arrivals) < ticks:
+                packet = json.loads(await ws.recv())
+                if packet['type'] == 'sentiment_update':
+                    arrivals.append((packet['seq'], time.perf_counter()))
+                if slow:
+                    await asyncio.sleep(slow)
+        except websockets.ConnectionClosed:
+            pass
+        results[index] = arrivals
+
+
+async def run(clients, ticks, interval, slow_clients):
+    main.STREAM_INTERVAL_SECONDS = interval
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=PORT, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    # Time how long each tick takes to reach every client
+    published = {}
+    original_publish = main.broadcaster.publish
+
+    def timed_publish(message):
+        published[main.stats_stream.seq] = time.perf_counter()
+        original_publish(message)
+    main.broadcaster.publish = timed_publish
+
+    ready = asyncio.Semaphore(0)
+    results = [[] for _ in range(clients)]
+    start = time.perf_counter()
+    tasks = [
+        asyncio.create_task(client(i, ready, results, ticks, interval * 1.5 if i < slow_clients else 0))
+        for i in range(clients)
+    ]
+    for _ in range(clients):
+        await ready.acquire()
+    connect_time = time.perf_counter() - start
+
+    await asyncio.gather(*tasks)
+    server.should_exit = True
+    await server_task
+
+    fast = results[slow_clients:]
+    delays = [
+        (arrived - published[seq]) * 1000
+        for arrivals in fast for seq, arrived in arrivals if seq in published
+    ]
+    delays.sort()
+    stats = main.broadcaster.get_stats()
+    print(f"clients: {clients} ({slow_clients} slow)  ticks: {ticks}  interval: {interval}s")
+    print(f"connect all:         {connect_time:.2f} s")
+    print(f"posts analyzed:      {main.total_posts_analyzed} (one per tick, not per client)")
+    print(f"packets delivered:   {sum(len(r) for r in results)}")
+    print(f"fan-out delay p50:   {statistics.median(delays):.1f} ms")
+    print(f"fan-out delay p99:   {delays[int(len(delays) * 0.99) - 1]:.1f} ms")
+    print(f"broadcaster:         {stats}")
+
+
+def main_cli():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    interval = float(sys.argv[3]) if len(sys.argv) > 3 else 0.5
+    slow_clients = int(sys.argv[4]) if len(sys.argv) > 4 else 10
+    asyncio.run(run(clients, ticks, interval, slow_clients))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,301 @@
+"""
+End-to-end benchmark suite for the Sentilytics pipeline
+Measures each stage in isolation and /api/analyze end-to-end, reporting
+posts/s, p50/p95/p99 latency and peak RSS, and saves the run as JSON so
+results can be compared between commits
+
+Stages run in their own subprocess by default so peak RSS is per stage.
+The result cache is disabled so every stage measures real work, and
+/api/analyze replays posts from a temporary file instead of the simulated
+collector (which sleeps 0.5s per request).
+
+Run from the sentilytics directory:
+    python benchmarks/suite.py [--posts N] [--stages a,b,...] [--output FILE] [--compare OLD.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from bench_preprocess import build_posts
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+BATCH_SIZE = 100
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def summarize(latencies, posts, elapsed):
+    """posts/s and latency percentiles (ms per call) for one stage"""
+    latencies = np.asarray(latencies) * 1000
+    return {
+        'calls': len(latencies),
+        'posts': posts,
+        'elapsed_s': round(elapsed, 4),
+        'posts_per_s': round(posts / elapsed, 1) if elapsed else None,
+        'p50_ms': round(float(np.percentile(latencies, 50)), 4),
+        'p95_ms': round(float(np.percentile(latencies, 95)), 4),
+        'p99_ms': round(float(np.percentile(latencies, 99)), 4),
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def time_calls(func, items, posts_per_call=1, warmup=20):
+    """Call func(item) for every item, timing each call"""
+    for item in items[:warmup]:
+        func(item)
+
+    latencies = []
+    clock = time.perf_counter
+    start = clock()
+    for item in items:
+        call_start = clock()
+        func(item)
+        latencies.append(clock() - call_start)
+    elapsed = clock() - start
+    return summarize(latencies, len(items) * posts_per_call, elapsed)
+
+
+def batches(items, size=BATCH_SIZE):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def make_analyzer():
+    from backend.sentiment_analyzer import SentimentAnalyzer
+    return SentimentAnalyzer(cache_size=0)
+
+
+def stage_preprocess(texts):
+    analyzer = make_analyzer()
+    return time_calls(analyzer.preprocess_text, texts)
+
+
+def stage_vader(texts):
+    analyzer = make_analyzer()
+    return time_calls(analyzer.vader.polarity_scores, texts)
+
+
+def stage_textblob(texts):
+    from textblob import TextBlob
+    return time_calls(lambda text: TextBlob(text).sentiment, texts)
+
+
+def stage_analyze_emotion(texts):
+    analyzer = make_analyzer()
+    return time_calls(analyzer.analyze_emotion, texts)
+
+
+def stage_extract_keywords(texts):
+    analyzer = make_analyzer()
+    return time_calls(analyzer.extract_keywords, batches(texts), BATCH_SIZE)
+
+
+def stage_filter_spam(texts):
+    from backend.data_collector import DataCollector
+    collector = DataCollector()
+    posts = [{'text': text} for text in texts]
+    return time_calls(collector.filter_spam, batches(posts), BATCH_SIZE)
+
+
+def stage_analyze_batch(texts):
+    analyzer = make_analyzer()
+    return time_calls(analyzer.analyze_batch, batches(texts), BATCH_SIZE)
+
+
+def stage_api_analyze(texts, concurrency=8):
+    """GET /api/analyze through httpx's ASGI transport, `concurrency` requests in flight"""
+    with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False, encoding='utf-8') as f:
+        for i, text in enumerate(texts):
+            f.write(json.dumps({'id': f'post_{i}', 'text': text}) + '\n')
+        replay_path = f.name
+
+    os.environ.update(REPLAY_PATH=replay_path, REPLAY_LOOP='true', RESULT_CACHE_SIZE='0',
+                      HISTORY_DB_PATH=':memory:')
+    try:
+        import httpx
+        from backend import main
+
+        requests = max(1, len(texts) // BATCH_SIZE)
+
+        async def run():
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+                async def call():
+                    call_start = time.perf_counter()
+                    response = await client.get('/api/analyze', params={'keyword': 'Tesla'})
+                    response.raise_for_status()
+                    return time.perf_counter() - call_start, response.json()['sentiment']['total']
+
+                await asyncio.gather(*(call() for _ in range(concurrency)))
+
+                semaphore = asyncio.Semaphore(concurrency)
+
+                async def limited():
+                    async with semaphore:
+                        return await call()
+
+                start = time.perf_counter()
+                results = await asyncio.gather(*(limited() for _ in range(requests)))
+                elapsed = time.perf_counter() - start
+            main.analysis_service.close()
+            return results, elapsed
+
+        results, elapsed = asyncio.run(run())
+        result = summarize([latency for latency, _ in results], sum(posts for _, posts in results), elapsed)
+        result['concurrency'] = concurrency
+        return result
+    finally:
+        os.unlink(replay_path)
+
+
+def stage_ws_fanout(texts, connections=1000, ticks=200):
+    """Encode one update per tick and send it to `connections` in-memory WebSockets"""
+    from bench_broadcast import PACKET, make_connections
+    from backend.encoding import encode_packet
+
+    async def run():
+        sockets = make_connections(connections)
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(ticks):
+            tick_start = time.perf_counter()
+            message = encode_packet(PACKET)
+            for websocket in sockets:
+                await websocket.send_bytes(message)
+            latencies.append(time.perf_counter() - tick_start)
+        return latencies, time.perf_counter() - start
+
+    latencies, elapsed = asyncio.run(run())
+    # "posts" here are deliveries: one update reaching one client
+    result = summarize(latencies, connections * ticks, elapsed)
+    result['connections'] = connections
+    return result
+
+
+STAGES = {
+    'preprocess_text': stage_preprocess,
+    'vader': stage_vader,
+    'textblob': stage_textblob,
+    'analyze_emotion': stage_analyze_emotion,
+    'extract_keywords': stage_extract_keywords,
+    'filter_spam': stage_filter_spam,
+    'analyze_batch': stage_analyze_batch,
+    'api_analyze': stage_api_analyze,
+    'ws_fanout': stage_ws_fanout
+}
+
+
+def run_stage(name, posts):
+    texts = build_posts(posts)
+    return STAGES[name](texts)
+
+
+def run_isolated(name, posts):
+    """Run one stage in a fresh interpreter and read its JSON result"""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--stage', name, '--posts', str(posts)],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        return {'error': completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'failed'}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def print_results(results, baseline=None):
+    print(f"{'stage':<18} {'posts/s':>12} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rss MB':>8}"
+          + ("   vs baseline" if baseline else ""))
+    for name, result in results.items():
+        if 'error' in result:
+            print(f"{name:<18} error: {result['error']}")
+            continue
+        line = (f"{name:<18} {result['posts_per_s']:>12,.0f} {result['p50_ms']:>9.3f} "
+                f"{result['p95_ms']:>9.3f} {result['p99_ms']:>9.3f} {result['peak_rss_mb'] or 0:>8.1f}")
+        previous = (baseline or {}).get(name)
+        if previous and previous.get('posts_per_s'):
+            line += f"   x{result['posts_per_s'] / previous['posts_per_s']:.2f} posts/s"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--posts', type=int, default=20_000, help='posts per stage')
+    parser.add_argument('--stages', default=','.join(STAGES), help='comma-separated stage names')
+    parser.add_argument('--output', help='JSON results file (default: benchmarks/results/<time>_<commit>.json)')
+    parser.add_argument('--compare', help='earlier JSON results to compare against')
+    parser.add_argument('--no-isolate', action='store_true', help='run all stages in this process')
+    parser.add_argument('--stage', help=argparse.SUPPRESS)  # internal: run one stage, print JSON
+    args = parser.parse_args()
+
+    if args.stage:
+        print(json.dumps(run_stage(args.stage, args.posts)))
+        return
+
+    names = [name.strip() for name in args.stages.split(',') if name.strip()]
+    unknown = [name for name in names if name not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+
+    results = {}
+    for name in names:
+        results[name] = run_stage(name, args.posts) if args.no_isolate else run_isolated(name, args.posts)
+
+    commit = git_commit()
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'posts': args.posts,
+        'isolated': not args.no_isolate,
+        'stages': results
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['stages']
+    print_results(results, baseline)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}_{commit or 'nogit'}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nsaved {output}")
+
+
+if __name__ == "__main__":
+    main()
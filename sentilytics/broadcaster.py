@@ -0,0 +1,105 @@
+"""
+Broadcaster Module
+Fans each serialized packet out to per-client bounded queues
+"""
+
+import asyncio
+from typing import Set
+
+# Returned by next_message when a client asked for a fresh snapshot; also
+# queued as a wake-up marker, but the Subscriber.resync flag is what counts
+RESYNC = object()
+
+
+class Subscriber:
+    """One connected client's outgoing queue"""
+
+    def __init__(self, max_queue: int):
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.lagging = 0
+        self.closed = False
+        # Set until the relay picks up the resync, so dropping queued
+        # packets can never lose it
+        self.resync = False
+
+    async def next_message(self):
+        """
+        Wait for the next packet; None means the client was dropped and
+        RESYNC that a snapshot is due (packets queued before it are skipped)
+        """
+        while not self.resync:
+            message = await self.queue.get()
+            if message is None:
+                return None
+            if message is not RESYNC and not self.resync:
+                return message
+        self.resync = False
+        return RESYNC
+
+    def request_resync(self):
+        """Discard pending packets and flag a snapshot for the next message"""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.resync = True
+        self.queue.put_nowait(RESYNC)  # wakes a relay waiting on the empty queue
+
+
+class Broadcaster:
+    """
+    Single-producer fan-out. Packets are serialized once by the caller and
+    the same object is queued for every subscriber. A full queue drops its
+    oldest packet (the newest stats supersede it); a client that stays
+    behind for `max_lag` packets in a row is disconnected.
+    """
+
+    def __init__(self, max_queue: int = 8, max_lag: int = 32):
+        self.max_queue = max_queue
+        self.max_lag = max_lag
+        self.subscribers: Set[Subscriber] = set()
+        self.published = 0
+        self.dropped = 0
+        self.disconnected = 0
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(self.max_queue)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+
+    def publish(self, message):
+        """Queue an already-serialized packet for every subscriber"""
+        self.published += 1
+        for subscriber in list(self.subscribers):
+            queue = subscriber.queue
+            if queue.full():
+                # Coalesce: drop the oldest packet in favour of the newest
+                queue.get_nowait()
+                subscriber.dropped += 1
+                subscriber.lagging += 1
+                self.dropped += 1
+                if subscriber.lagging >= self.max_lag:
+                    self._disconnect(subscriber)
+                    continue
+            else:
+                subscriber.lagging = 0
+            queue.put_nowait(message)
+
+    def _disconnect(self, subscriber: Subscriber):
+        """Drop a client that cannot keep up"""
+        self.unsubscribe(subscriber)
+        subscriber.closed = True
+        self.disconnected += 1
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    def get_stats(self) -> dict:
+        return {
+            'subscribers': len(self.subscribers),
+            'published': self.published,
+            'dropped': self.dropped,
+            'disconnected': self.disconnected
+        }
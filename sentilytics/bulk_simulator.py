@@ -0,0 +1,205 @@
+"""
+Bulk Simulator Module
+Vectorized synthetic post generation for load tests and benchmarks
+
+DataSimulator.generate_post builds one dict per post; BulkSimulator draws
+whole batches with the NumPy RNG and returns columnar arrays (template and
+username indices, timestamps, counters), so millions of posts cost a few
+array operations. Texts and post dicts are only materialized on request.
+"""
+
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+from data_simulator import DataSimulator
+
+SENTIMENTS = ('negative', 'neutral', 'positive')
+PLATFORMS = ('Twitter', 'Reddit', 'Facebook')
+
+# Same mixes as DataSimulator.generate_post and generate_crisis_scenario
+DEFAULT_MIX = {'positive': 0.6, 'negative': 0.2, 'neutral': 0.2}
+CRISIS_MIX = {'positive': 0.1, 'negative': 0.8, 'neutral': 0.1}
+
+
+def _mix_thresholds(mix: Dict[str, float]) -> np.ndarray:
+    """Cumulative probabilities in SENTIMENTS order"""
+    weights = np.array([mix.get(sentiment, 0.0) for sentiment in SENTIMENTS], dtype=np.float64)
+    if weights.sum() <= 0:
+        raise ValueError("Sentiment mix needs at least one positive weight")
+    return np.cumsum(weights / weights.sum())
+
+
+class BulkSimulator:
+    """Columnar synthetic post generator backed by numpy.random.Generator"""
+
+    def __init__(self, seed: Optional[int] = None, simulator: Optional[DataSimulator] = None):
+        simulator = simulator or DataSimulator()
+        self.rng = np.random.default_rng(seed)
+        self.usernames = np.array(simulator.usernames, dtype=object)
+        self.platforms = np.array(PLATFORMS, dtype=object)
+
+        # Per keyword: one flat template array, grouped by sentiment, with the
+        # start offset and size of each sentiment's group
+        self._pools = {}
+        for keyword, pool in simulator.keywords.items():
+            texts = []
+            offsets = []
+            sizes = []
+            for sentiment in SENTIMENTS:
+                offsets.append(len(texts))
+                sizes.append(len(pool[sentiment]))
+                texts.extend(pool[sentiment])
+            self._pools[keyword] = (
+                np.array(texts, dtype=object),
+                np.array(offsets, dtype=np.int32),
+                np.array(sizes, dtype=np.int32)
+            )
+
+        self._next_id = 0
+
+    def _pool(self, keyword: str):
+        return self._pools.get(keyword, self._pools['default'])
+
+    def arrivals(
+        self,
+        count: int,
+        rate: float = 100.0,
+        burst_factor: float = 1.0,
+        burst_fraction: float = 0.1,
+        mean_run: int = 500,
+        start_time: float = 0.0
+    ) -> np.ndarray:
+        """
+        Arrival timestamps (seconds) for `count` posts
+
+        Posts arrive as a Poisson process at `rate` posts/s. With
+        burst_factor > 1 the process switches between a calm and a burst
+        regime (burst rate = rate * burst_factor) in runs of about `mean_run`
+        posts, spending roughly `burst_fraction` of posts in bursts.
+        """
+        if count <= 0:
+            return np.empty(0, dtype=np.float64)
+
+        rates = np.full(count, rate, dtype=np.float64)
+        if burst_factor > 1 and 0 < burst_fraction < 1:
+            # Alternating calm/burst runs with geometric lengths
+            calm_mean = mean_run * (1 - burst_fraction) / burst_fraction
+            runs = max(2, int(2 * count / (mean_run + calm_mean)) + 4)
+            calm = self.rng.geometric(1 / max(calm_mean, 1), size=runs)
+            burst = self.rng.geometric(1 / max(mean_run, 1), size=runs)
+            bounds = np.cumsum(np.column_stack((calm, burst)).ravel())
+            while bounds[-1] < count:
+                bounds = np.concatenate((bounds, bounds[-1] + bounds[:2 * runs]))
+            in_burst = (np.searchsorted(bounds, np.arange(count), side='right') % 2).astype(bool)
+            rates[in_burst] *= burst_factor
+
+        gaps = self.rng.standard_exponential(count) / rates
+        return start_time + np.cumsum(gaps)
+
+    def generate(
+        self,
+        count: int,
+        keyword: str = 'Tesla',
+        mix: Optional[Dict[str, float]] = None,
+        timestamps: Optional[np.ndarray] = None,
+        crisis_start: Optional[float] = None,
+        crisis_duration: float = 60.0,
+        crisis_mix: Optional[Dict[str, float]] = None,
+        **arrival_options
+    ) -> Dict[str, np.ndarray]:
+        """
+        Generate `count` posts as columns
+
+        mix: sentiment weights (default DEFAULT_MIX)
+        timestamps: arrival times; generated with `arrivals(count, **arrival_options)` if omitted
+        crisis_start/crisis_duration: posts arriving in this window use
+            `crisis_mix` (default CRISIS_MIX) instead of `mix`
+
+        Columns: id, timestamp, sentiment (index into SENTIMENTS), template
+        (index into template_texts(keyword)), username, platform, likes, retweets
+        """
+        rng = self.rng
+        if timestamps is None:
+            timestamps = self.arrivals(count, **arrival_options)
+
+        draws = rng.random(count)
+        sentiment = np.searchsorted(_mix_thresholds(mix or DEFAULT_MIX), draws, side='right')
+        if crisis_start is not None:
+            in_crisis = (timestamps >= crisis_start) & (timestamps < crisis_start + crisis_duration)
+            crisis_sentiment = np.searchsorted(_mix_thresholds(crisis_mix or CRISIS_MIX), draws, side='right')
+            sentiment = np.where(in_crisis, crisis_sentiment, sentiment)
+        sentiment = np.minimum(sentiment, len(SENTIMENTS) - 1).astype(np.int8)
+
+        _, offsets, sizes = self._pool(keyword)
+        template = offsets[sentiment] + (rng.random(count) * sizes[sentiment]).astype(np.int32)
+
+        ids = np.arange(self._next_id, self._next_id + count, dtype=np.int64)
+        self._next_id += count
+
+        return {
+            'id': ids,
+            'timestamp': timestamps,
+            'sentiment': sentiment,
+            'template': template,
+            'username': rng.integers(0, len(self.usernames), count, dtype=np.int16),
+            'platform': rng.integers(0, len(PLATFORMS), count, dtype=np.int8),
+            'likes': rng.integers(0, 1001, count, dtype=np.int32),
+            'retweets': rng.integers(0, 501, count, dtype=np.int32)
+        }
+
+    def chunks(
+        self,
+        total: int,
+        chunk_size: int = 100_000,
+        rate: float = 100.0,
+        start_time: float = 0.0,
+        **options
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Generate `total` posts as a stream of column chunks
+        Timestamps and ids continue across chunks; crisis windows apply to the whole stream
+        """
+        arrival_keys = ('burst_factor', 'burst_fraction', 'mean_run')
+        arrival_options = {key: options.pop(key) for key in arrival_keys if key in options}
+        now = start_time
+        remaining = total
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            timestamps = self.arrivals(size, rate=rate, start_time=now, **arrival_options)
+            now = float(timestamps[-1])
+            remaining -= size
+            yield self.generate(size, timestamps=timestamps, **options)
+
+    def template_texts(self, keyword: str = 'Tesla') -> np.ndarray:
+        """Template texts that a 'template' column indexes into"""
+        return self._pool(keyword)[0]
+
+    def texts(self, columns: Dict[str, np.ndarray], keyword: str = 'Tesla') -> np.ndarray:
+        """Object array of post texts for a chunk"""
+        return self.template_texts(keyword)[columns['template']]
+
+    def to_posts(self, columns: Dict[str, np.ndarray], keyword: str = 'Tesla') -> list:
+        """
+        Materialize a chunk as DataSimulator.generate_post-shaped dicts (slow path)
+        'timestamp' stays in seconds on the simulated clock rather than an ISO string
+        """
+        texts = self.texts(columns, keyword).tolist()
+        usernames = self.usernames[columns['username']].tolist()
+        platforms = self.platforms[columns['platform']].tolist()
+        return [
+            {
+                'id': f"post_{post_id}",
+                'text': text,
+                'username': username,
+                'timestamp': timestamp,
+                'likes': likes,
+                'retweets': retweets,
+                'keyword': keyword,
+                'platform': platform
+            }
+            for post_id, text, username, timestamp, likes, retweets, platform in zip(
+                columns['id'].tolist(), texts, usernames, columns['timestamp'].tolist(),
+                columns['likes'].tolist(), columns['retweets'].tolist(), platforms
+            )
+        ]
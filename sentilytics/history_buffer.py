@@ -0,0 +1,112 @@
+"""
+History Buffer Module
+Fixed-capacity ring buffers for sentiment history and the activity log
+"""
+
+import math
+from array import array
+from collections import deque
+from itertools import islice
+from typing import Dict, Iterator, List
+
+SENTIMENT_CODES = ('positive', 'negative', 'neutral')
+EMOTION_CODES = ('joy', 'anger', 'fear', 'sadness', 'neutral')
+
+
+def _optional(value: float):
+    return None if math.isnan(value) else value
+
+
+class SentimentHistory:
+    """
+    Last `capacity` analyses stored as parallel typed arrays
+    (8-byte floats for scores, 1-byte codes for sentiment and emotion)
+    Appending overwrites the oldest slot, so nothing is ever copied
+
+    Polarity/subjectivity are stored as NaN when the analysis has none yet
+    (fast and lazy profiles) and read back as None
+    """
+
+    SCORE_FIELDS = ('positive', 'negative', 'neutral', 'compound')
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._scores = {field: array('d', bytes(8 * capacity)) for field in self.SCORE_FIELDS}
+        self._polarity = array('d', bytes(8 * capacity))
+        self._subjectivity = array('d', bytes(8 * capacity))
+        self._sentiment = array('b', bytes(capacity))
+        self._emotion = array('b', bytes(capacity))
+        self._next = 0
+        self._size = 0
+
+    def append(self, analysis: Dict):
+        """Store one analysis from SentimentAnalyzer.analyze_sentiment"""
+        slot = self._next
+        for field in self.SCORE_FIELDS:
+            self._scores[field][slot] = analysis['scores'][field]
+        # dict.get so a LazyAnalysis is not forced to run TextBlob
+        self._polarity[slot] = dict.get(analysis, 'polarity', math.nan)
+        self._subjectivity[slot] = dict.get(analysis, 'subjectivity', math.nan)
+        self._sentiment[slot] = SENTIMENT_CODES.index(analysis['sentiment'])
+        self._emotion[slot] = EMOTION_CODES.index(analysis['emotion'])
+
+        self._next = (slot + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _slots(self, count: int) -> range:
+        """Slot indexes of the last `count` entries, oldest first"""
+        count = min(count, self._size)
+        start = self._next - count
+        return range(start, start + count)
+
+    def _record(self, slot: int) -> Dict:
+        return {
+            'sentiment': SENTIMENT_CODES[self._sentiment[slot]],
+            'emotion': EMOTION_CODES[self._emotion[slot]],
+            'scores': {field: self._scores[field][slot] for field in self.SCORE_FIELDS},
+            'polarity': _optional(self._polarity[slot]),
+            'subjectivity': _optional(self._subjectivity[slot])
+        }
+
+    def recent(self, count: int) -> List[Dict]:
+        """Last `count` analyses as dicts, oldest first"""
+        # Negative slots wrap around to the end of the arrays
+        return [self._record(slot) for slot in self._slots(count)]
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.recent(self._size))
+
+
+class ActivityEntry:
+    """One activity log line"""
+
+    __slots__ = ('timestamp', 'message', 'sentiment')
+
+    def __init__(self, timestamp: str, message: str, sentiment: str):
+        self.timestamp = timestamp
+        self.message = message
+        self.sentiment = sentiment
+
+    def to_dict(self) -> Dict:
+        return {'timestamp': self.timestamp, 'message': self.message, 'sentiment': self.sentiment}
+
+
+class ActivityLog:
+    """Last `capacity` activity entries; old entries fall off without copying"""
+
+    def __init__(self, capacity: int = 50):
+        self._entries = deque(maxlen=capacity)
+
+    def append(self, timestamp: str, message: str, sentiment: str):
+        self._entries.append(ActivityEntry(timestamp, message, sentiment))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def recent(self, count: int) -> List[Dict]:
+        """Last `count` entries as dicts, oldest first"""
+        newest_first = islice(reversed(self._entries), count)
+        return [entry.to_dict() for entry in newest_first][::-1]
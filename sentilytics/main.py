@@ -9,12 +9,19 @@ from fastapi.responses import HTMLResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 import asyncio
 import json
+import os
 from datetime import datetime
 from pathlib import Path
 import uvicorn
 
 from sentiment_analyzer import SentimentAnalyzer
 from data_simulator import DataSimulator
+from sentiment_window import SentimentWindows, CountWindow, TimeWindow
+from history_buffer import SentimentHistory, ActivityLog
+from broadcaster import Broadcaster, RESYNC
+from stats_protocol import StatsStream, PROTOCOL_VERSION
+from backend.encoding import encode_packet
+from backend.alert_coalescer import AlertCoalescer
 
 # Initialize FastAPI app
 app = FastAPI(title="Sentilytics", description="Real-Time Sentiment Analysis Dashboard")
@@ -29,17 +36,44 @@ app.add_middleware(
 )
 
 # Initialize analyzers
-sentiment_analyzer = SentimentAnalyzer()
+# SENTIMENT_PROFILE: 'full' (VADER + TextBlob), 'fast' (VADER only) or 'lazy' (TextBlob on access)
+# ANALYSIS_WORKERS/ANALYSIS_CHUNK_SIZE: batch_analyze shards large batches across a process pool
+sentiment_analyzer = SentimentAnalyzer(
+    os.getenv("SENTIMENT_PROFILE", "full"),
+    workers=int(os.getenv("ANALYSIS_WORKERS", "1")),
+    chunk_size=int(os.getenv("ANALYSIS_CHUNK_SIZE", "500"))
+)
 data_simulator = DataSimulator()
 
-# Store active WebSocket connections
-active_connections: list[WebSocket] = []
+# Connected WebSocket clients, each with a bounded outgoing queue
+broadcaster = Broadcaster(max_queue=8, max_lag=32)
+
+# Shared stream producer (one per process, runs while clients are connected)
+producer_task: asyncio.Task = None
+STREAM_INTERVAL_SECONDS = 2  # New post every 2 seconds
 
-# Global state for sentiment tracking
-sentiment_history = []
+# Global state for sentiment tracking (ring buffers keep memory flat)
+sentiment_history = SentimentHistory(capacity=1000)
 emotion_counts = {'joy': 0, 'anger': 0, 'fear': 0, 'sadness': 0, 'neutral': 0}
 total_posts_analyzed = 0
-activity_log = []
+activity_log = ActivityLog(capacity=50)
+
+# Repeated crisis alerts within the window reach clients once, plus a digest
+crisis_alerts = AlertCoalescer(window=float(os.getenv("CRISIS_ALERT_WINDOW", "300")))
+
+# Running sentiment counts over recent posts, updated on every analysis
+sentiment_windows = SentimentWindows(
+    last_100=CountWindow(100),
+    last_1m=TimeWindow(60),
+    last_10m=TimeWindow(600)
+)
+
+# Last published stats and sequence number for the delta protocol
+stats_stream = StatsStream({
+    'total_posts': 0,
+    'sentiment_distribution': {'positive': 0, 'negative': 0, 'neutral': 0},
+    'emotion_distribution': emotion_counts
+})
 
 # Mount static files
 static_path = Path(__file__).parent / "static"
@@ -56,8 +90,6 @@ async def read_root():
 @app.get("/api/stats")
 async def get_stats():
     """Get current sentiment statistics"""
-    global sentiment_history, total_posts_analyzed
-    
     if not sentiment_history:
         return {
             'total_posts': 0,
@@ -66,15 +98,15 @@ async def get_stats():
             'activity_log': []
         }
     
-    # Calculate sentiment distribution
-    recent_analyses = sentiment_history[-100:]  # Last 100 posts
-    distribution = sentiment_analyzer.get_sentiment_distribution(recent_analyses)
+    # Sentiment distribution over the last 100 posts plus the time windows
+    windows = sentiment_windows.distributions()
     
     return {
         'total_posts': total_posts_analyzed,
-        'sentiment_distribution': distribution,
+        'sentiment_distribution': windows['last_100'],
+        'sentiment_windows': windows,
         'emotion_distribution': emotion_counts,
-        'activity_log': activity_log[-10:]  # Last 10 activities
+        'activity_log': activity_log.recent(10)  # Last 10 activities
     }
 
 
@@ -85,11 +117,106 @@ async def get_trending():
     return {'keywords': keywords}
 
 
+def process_post(post: dict) -> dict:
+    """Analyze one post, update global state and build its delta packet"""
+    global total_posts_analyzed
+    
+    # Analyze sentiment
+    analysis = sentiment_analyzer.analyze_sentiment(post['text'])
+    
+    # Update global state
+    sentiment_history.append(analysis)
+    sentiment_windows.push(analysis['sentiment'])
+    total_posts_analyzed += 1
+    
+    # Update emotion counts
+    emotion = analysis['emotion']
+    if emotion in emotion_counts:
+        emotion_counts[emotion] += 1
+    
+    # Add to activity log
+    activity_log.append(
+        timestamp=datetime.now().isoformat(),
+        message=f"Analyzed post from @{post['username']}: {analysis['sentiment']} sentiment",
+        sentiment=analysis['sentiment']
+    )
+    
+    # Only the stats fields that changed since the last packet are sent
+    seq, delta = stats_stream.update({
+        'total_posts': total_posts_analyzed,
+        'sentiment_distribution': sentiment_windows.distribution('last_100'),
+        'emotion_distribution': emotion_counts
+    })
+    
+    return {
+        'type': 'sentiment_update',
+        'v': PROTOCOL_VERSION,
+        'seq': seq,
+        'timestamp': datetime.now().isoformat(),
+        'post': {
+            'text': post['text'],
+            'username': post['username'],
+            'platform': post['platform']
+        },
+        'analysis': analysis,
+        'delta': delta
+    }
+
+
+async def stream_producer():
+    """Simulate, analyze and broadcast one post per tick while anyone is listening"""
+    while broadcaster.subscribers:
+        try:
+            post = data_simulator.generate_post(keyword="Tesla")
+            data_packet = process_post(post)
+            
+            # Encode once and fan the same bytes out to every client
+            broadcaster.publish(encode_packet(data_packet))
+            
+            # Summarize crisis alerts suppressed in windows that have closed
+            publish_alerts(crisis_alerts.flush())
+        except Exception as e:
+            print(f"Stream producer error: {e}")
+        
+        # Wait before next update (simulate real-time stream)
+        await asyncio.sleep(STREAM_INTERVAL_SECONDS)
+
+
+def ensure_producer():
+    """Start the shared producer if it is not already running"""
+    global producer_task
+    if producer_task is None or producer_task.done():
+        producer_task = asyncio.create_task(stream_producer())
+
+
+async def relay_packets(websocket: WebSocket, subscriber):
+    """Send packets from the shared producer to one client"""
+    while True:
+        message = await subscriber.next_message()
+        if message is None:
+            # Too slow to keep up with the stream
+            await websocket.close(code=1013)
+            return
+        if message is RESYNC:
+            message = encode_packet(stats_stream.snapshot())
+        await websocket.send_bytes(message)
+
+
+async def receive_requests(websocket: WebSocket, subscriber):
+    """Handle client requests (resync after a sequence gap)"""
+    while True:
+        request = await websocket.receive_json()
+        if request.get('type') == 'resync':
+            subscriber.request_resync()
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time data streaming"""
     await websocket.accept()
-    active_connections.append(websocket)
+    subscriber = broadcaster.subscribe()
+    # Taken right after subscribing, so the first queued delta follows it
+    snapshot = encode_packet(stats_stream.snapshot())
     
     try:
         # Send initial data
@@ -98,73 +225,28 @@ async def websocket_endpoint(websocket: WebSocket):
             'message': 'Connected to Sentilytics real-time stream',
             'timestamp': datetime.now().isoformat()
         })
+        await websocket.send_bytes(snapshot)
         
-        # Start streaming data
-        while True:
-            # Generate new post
-            post = data_simulator.generate_post(keyword="Tesla")
-            
-            # Analyze sentiment
-            analysis = sentiment_analyzer.analyze_sentiment(post['text'])
-            
-            # Update global state
-            global sentiment_history, total_posts_analyzed, emotion_counts, activity_log
-            sentiment_history.append(analysis)
-            total_posts_analyzed += 1
-            
-            # Update emotion counts
-            emotion = analysis['emotion']
-            if emotion in emotion_counts:
-                emotion_counts[emotion] += 1
-            
-            # Add to activity log
-            activity_log.append({
-                'timestamp': datetime.now().isoformat(),
-                'message': f"Analyzed post from @{post['username']}: {analysis['sentiment']} sentiment",
-                'sentiment': analysis['sentiment']
-            })
-            
-            # Keep only last 1000 entries
-            if len(sentiment_history) > 1000:
-                sentiment_history = sentiment_history[-1000:]
-            if len(activity_log) > 50:
-                activity_log = activity_log[-50:]
-            
-            # Prepare data packet
-            data_packet = {
-                'type': 'sentiment_update',
-                'timestamp': datetime.now().isoformat(),
-                'post': {
-                    'text': post['text'],
-                    'username': post['username'],
-                    'platform': post['platform']
-                },
-                'analysis': analysis,
-                'stats': {
-                    'total_posts': total_posts_analyzed,
-                    'sentiment_distribution': sentiment_analyzer.get_sentiment_distribution(
-                        sentiment_history[-100:]
-                    ),
-                    'emotion_distribution': emotion_counts
-                }
-            }
-            
-            # Send to all connected clients
-            for connection in active_connections:
-                try:
-                    await connection.send_json(data_packet)
-                except:
-                    active_connections.remove(connection)
-            
-            # Wait before next update (simulate real-time stream)
-            await asyncio.sleep(2)  # New post every 2 seconds
+        ensure_producer()
+        
+        # Relay packets until the client disconnects or falls too far behind
+        tasks = {
+            asyncio.create_task(relay_packets(websocket, subscriber)),
+            asyncio.create_task(receive_requests(websocket, subscriber))
+        }
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            if not task.cancelled() and task.exception():
+                raise task.exception()
             
     except WebSocketDisconnect:
-        active_connections.remove(websocket)
+        pass
     except Exception as e:
         print(f"WebSocket error: {e}")
-        if websocket in active_connections:
-            active_connections.remove(websocket)
+    finally:
+        broadcaster.unsubscribe(subscriber)
 
 
 @app.post("/api/analyze")
@@ -185,8 +267,6 @@ async def analyze_text(data: dict):
 @app.get("/api/crisis-simulation")
 async def simulate_crisis():
     """Simulate a crisis scenario with negative sentiment spike"""
-    global sentiment_history, activity_log
-    
     # Generate crisis posts
     crisis_posts = data_simulator.generate_crisis_scenario()
     
@@ -194,29 +274,54 @@ async def simulate_crisis():
     for post in crisis_posts:
         analysis = sentiment_analyzer.analyze_sentiment(post['text'])
         sentiment_history.append(analysis)
+        sentiment_windows.push(analysis['sentiment'])
     
-    # Add crisis alert to activity log
-    activity_log.append({
-        'timestamp': datetime.now().isoformat(),
-        'message': '🚨 CRISIS ALERT: Negative sentiment spike detected!',
-        'sentiment': 'negative'
-    })
-    
-    # Broadcast crisis alert to all connected clients
-    alert_packet = {
+    # Broadcast the crisis alert unless one for this keyword went out recently
+    alert = {
         'type': 'crisis_alert',
+        'keyword': 'Tesla',
         'timestamp': datetime.now().isoformat(),
         'message': 'Negative sentiment spike detected (-27%) in the last 10 minutes',
         'severity': 'high'
     }
+    published = crisis_alerts.offer(alert)
+    publish_alerts(published)
     
-    for connection in active_connections:
-        try:
-            await connection.send_json(alert_packet)
-        except:
-            pass
-    
-    return {'status': 'Crisis simulation triggered', 'posts_generated': len(crisis_posts)}
+    return {
+        'status': 'Crisis simulation triggered',
+        'posts_generated': len(crisis_posts),
+        'alert': 'broadcast' if alert in published else 'suppressed'
+    }
+
+
+def publish_alerts(alerts):
+    """Log and broadcast crisis alerts (and digests) released by the coalescer"""
+    for alert in alerts:
+        if alert['type'] == 'alert_digest':
+            log_message = f"🚨 {alert['message']}"
+            packet = {
+                'type': 'crisis_alert',
+                'timestamp': alert['timestamp'],
+                'message': alert['message'],
+                'severity': alert['severity'],
+                'digest': alert['data']
+            }
+        else:
+            log_message = '🚨 CRISIS ALERT: Negative sentiment spike detected!'
+            packet = {key: value for key, value in alert.items() if key != 'keyword'}
+        
+        activity_log.append(
+            timestamp=datetime.now().isoformat(),
+            message=log_message,
+            sentiment='negative'
+        )
+        broadcaster.publish(encode_packet(packet))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the analysis worker pool, if batch_analyze started one"""
+    sentiment_analyzer.close()
 
 
 if __name__ == "__main__":
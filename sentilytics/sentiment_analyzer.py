@@ -1,17 +1,96 @@
 """
 Sentiment Analyzer Module
-Uses VADER and TextBlob for real-time sentiment analysis
+Uses VADER and (optionally) TextBlob for real-time sentiment analysis
+
+Scorer profiles:
+    fast  VADER only; results carry no polarity/subjectivity
+    full  VADER + TextBlob polarity/subjectivity for every post
+    lazy  VADER now; polarity/subjectivity computed on first access
+TextBlob is imported the first time a profile actually needs it.
 """
 
 import nltk
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from textblob import TextBlob
 import re
-from typing import Dict, List
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from backend.emotion_matcher import EmotionMatcher
+
+PROFILES = ('fast', 'full', 'lazy')
+
+# TextBlob class, imported on first use
+_TextBlob = None
+
+# Per-process analyzer used by pool workers, built once by _init_worker
+_worker_analyzer = None
+
+
+def _textblob_scores(text: str) -> Tuple[float, float]:
+    """(polarity, subjectivity) from TextBlob, importing it on first call"""
+    global _TextBlob
+    if _TextBlob is None:
+        from textblob import TextBlob
+        _TextBlob = TextBlob
+    sentiment = _TextBlob(text).sentiment
+    return sentiment.polarity, sentiment.subjectivity
+
+
+class LazyAnalysis(dict):
+    """
+    Analysis dict whose 'polarity' and 'subjectivity' are filled in by
+    TextBlob the first time either is read with [] or get()
+    Until then they are absent, so serializing it never pays for TextBlob
+    """
+
+    def __init__(self, analysis: Dict, text: str):
+        super().__init__(analysis)
+        self.text = text
+
+    def _load_textblob(self):
+        self['polarity'], self['subjectivity'] = _textblob_scores(self.text)
+
+    def __missing__(self, key):
+        if key in ('polarity', 'subjectivity'):
+            self._load_textblob()
+            return self[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in ('polarity', 'subjectivity') and not dict.__contains__(self, key):
+            self._load_textblob()
+        return dict.get(self, key, default)
+
+
+def _init_worker(profile: str = 'full'):
+    """Load the VADER lexicon once per worker process"""
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer(profile)
+
+
+def _analyze_chunk(texts: List[str]) -> List[Dict]:
+    """Analyze one shard of a batch inside a worker process"""
+    return [_worker_analyzer.analyze_sentiment(text) for text in texts]
+
 
 class SentimentAnalyzer:
-    def __init__(self):
-        """Initialize sentiment analysis tools"""
+    def __init__(self, profile: str = 'full', workers: int = 1, chunk_size: int = 500):
+        """
+        Initialize sentiment analysis tools for a scorer profile (see PROFILES)
+        workers/chunk_size: batch_analyze shards batches larger than chunk_size
+        across a pool of `workers` processes, started on first use
+        """
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown scorer profile: {profile}")
+        self.profile = profile
+        self.workers = workers
+        self.chunk_size = chunk_size
+        
+        # Long-lived worker pool, created lazily by batch_analyze
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        
         # Download required NLTK data
         try:
             nltk.data.find('vader_lexicon')
@@ -19,6 +98,14 @@ class SentimentAnalyzer:
             nltk.download('vader_lexicon', quiet=True)
         
         self.vader = SentimentIntensityAnalyzer()
+        
+        # Simple keyword-based emotion detection, checked in this order
+        self.emotion_matcher = EmotionMatcher({
+            'joy': ['happy', 'excited', 'love', 'great', 'amazing', 'wonderful', 'fantastic'],
+            'anger': ['angry', 'hate', 'furious', 'terrible', 'worst', 'awful'],
+            'fear': ['scared', 'afraid', 'worried', 'concerned', 'anxious'],
+            'sadness': ['sad', 'disappointed', 'depressed', 'unhappy']
+        })
     
     def clean_text(self, text: str) -> str:
         """Clean and preprocess text"""
@@ -42,9 +129,6 @@ class SentimentAnalyzer:
         # VADER sentiment analysis
         vader_scores = self.vader.polarity_scores(cleaned_text)
         
-        # TextBlob for additional analysis
-        blob = TextBlob(cleaned_text)
-        
         # Determine primary sentiment
         compound = vader_scores['compound']
         if compound >= 0.05:
@@ -57,7 +141,7 @@ class SentimentAnalyzer:
         # Determine emotion (simplified)
         emotion = self._detect_emotion(cleaned_text, vader_scores)
         
-        return {
+        analysis = {
             'sentiment': sentiment,
             'emotion': emotion,
             'scores': {
@@ -65,29 +149,22 @@ class SentimentAnalyzer:
                 'negative': vader_scores['neg'],
                 'neutral': vader_scores['neu'],
                 'compound': vader_scores['compound']
-            },
-            'polarity': blob.sentiment.polarity,
-            'subjectivity': blob.sentiment.subjectivity
+            }
         }
+        
+        # TextBlob for additional analysis
+        if self.profile == 'full':
+            analysis['polarity'], analysis['subjectivity'] = _textblob_scores(cleaned_text)
+        elif self.profile == 'lazy':
+            analysis = LazyAnalysis(analysis, cleaned_text)
+        
+        return analysis
     
     def _detect_emotion(self, text: str, vader_scores: Dict) -> str:
         """Detect primary emotion from text"""
-        text_lower = text.lower()
-        
-        # Simple keyword-based emotion detection
-        joy_words = ['happy', 'excited', 'love', 'great', 'amazing', 'wonderful', 'fantastic']
-        anger_words = ['angry', 'hate', 'furious', 'terrible', 'worst', 'awful']
-        fear_words = ['scared', 'afraid', 'worried', 'concerned', 'anxious']
-        sadness_words = ['sad', 'disappointed', 'depressed', 'unhappy']
-        
-        if any(word in text_lower for word in joy_words):
-            return 'joy'
-        elif any(word in text_lower for word in anger_words):
-            return 'anger'
-        elif any(word in text_lower for word in fear_words):
-            return 'fear'
-        elif any(word in text_lower for word in sadness_words):
-            return 'sadness'
+        emotion = self.emotion_matcher.first_match(text)
+        if emotion:
+            return emotion
         elif vader_scores['compound'] >= 0.5:
             return 'joy'
         elif vader_scores['compound'] <= -0.5:
@@ -96,8 +173,29 @@ class SentimentAnalyzer:
             return 'neutral'
     
     def batch_analyze(self, texts: List[str]) -> List[Dict]:
-        """Analyze multiple texts"""
-        return [self.analyze_sentiment(text) for text in texts]
+        """
+        Analyze multiple texts
+        With workers > 1, large batches are sharded across the process pool
+        and results are returned in input order
+        """
+        if self.workers <= 1 or len(texts) <= self.chunk_size:
+            return [self.analyze_sentiment(text) for text in texts]
+        
+        # Workers load the lexicon once and are reused for every batch
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=_init_worker, initargs=(self.profile,)
+                )
+        
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        return [analysis for chunk in self._pool.map(_analyze_chunk, chunks) for analysis in chunk]
+    
+    def close(self):
+        """Shut down the worker pool if one was started"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
     
     def get_sentiment_distribution(self, analyses: List[Dict]) -> Dict:
         """Calculate sentiment distribution from multiple analyses"""
@@ -0,0 +1,104 @@
+"""
+Sentiment Window Module
+Incremental sliding-window sentiment counts for the live dashboard
+"""
+
+import time
+from collections import deque
+from typing import Dict
+
+SENTIMENTS = ('positive', 'negative', 'neutral')
+
+
+class _Window:
+    """Running sentiment counts over a deque of (timestamp, sentiment)"""
+
+    def __init__(self):
+        self.entries = deque()
+        self.counts = {sentiment: 0 for sentiment in SENTIMENTS}
+
+    def _add(self, sentiment: str, timestamp: float):
+        self.entries.append((timestamp, sentiment))
+        self.counts[sentiment] += 1
+
+    def _evict_oldest(self):
+        _, sentiment = self.entries.popleft()
+        self.counts[sentiment] -= 1
+
+    def distribution(self, now: float = None) -> Dict:
+        """Same shape as SentimentAnalyzer.get_sentiment_distribution"""
+        total = len(self.entries)
+        if not total:
+            return {'positive': 0, 'negative': 0, 'neutral': 0}
+
+        return {
+            'positive': round((self.counts['positive'] / total) * 100, 1),
+            'negative': round((self.counts['negative'] / total) * 100, 1),
+            'neutral': round((self.counts['neutral'] / total) * 100, 1),
+            'counts': {
+                'positive': self.counts['positive'],
+                'negative': self.counts['negative'],
+                'neutral': self.counts['neutral'],
+                'total': total
+            }
+        }
+
+
+class CountWindow(_Window):
+    """Last N posts"""
+
+    def __init__(self, size: int):
+        super().__init__()
+        self.size = size
+
+    def push(self, sentiment: str, timestamp: float):
+        self._add(sentiment, timestamp)
+        if len(self.entries) > self.size:
+            self._evict_oldest()
+
+
+class TimeWindow(_Window):
+    """Posts from the last T seconds"""
+
+    def __init__(self, seconds: float):
+        super().__init__()
+        self.seconds = seconds
+
+    def _expire(self, now: float):
+        cutoff = now - self.seconds
+        while self.entries and self.entries[0][0] < cutoff:
+            self._evict_oldest()
+
+    def push(self, sentiment: str, timestamp: float):
+        self._add(sentiment, timestamp)
+        self._expire(timestamp)
+
+    def distribution(self, now: float = None) -> Dict:
+        self._expire(time.monotonic() if now is None else now)
+        return super().distribution()
+
+
+class SentimentWindows:
+    """
+    Several named windows updated together in O(1) amortized per post
+    e.g. SentimentWindows(last_100=CountWindow(100), last_10m=TimeWindow(600))
+    """
+
+    def __init__(self, **windows: _Window):
+        self.windows = windows
+
+    def push(self, sentiment: str, timestamp: float = None):
+        """Record one analyzed post in every window"""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        for window in self.windows.values():
+            window.push(sentiment, timestamp)
+
+    def distribution(self, name: str) -> Dict:
+        """Distribution for one window"""
+        return self.windows[name].distribution()
+
+    def distributions(self) -> Dict:
+        """Distribution for every window, keyed by name"""
+        now = time.monotonic()
+        return {name: window.distribution(now) for name, window in self.windows.items()}
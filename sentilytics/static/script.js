@@ -177,6 +177,16 @@ function initCompetitorChart() {
 // --- 3. Real-Time WebSocket Connection ---
 let websocket = null;
 let totalPosts = 0;
+const packetDecoder = new TextDecoder();
+
+// Delta protocol state: full stats from the last snapshot plus applied deltas
+const STATS_PROTOCOL_VERSION = 1;
+let statsState = null;
+let lastSeq = null;
+let awaitingSnapshot = true;
+// Ask again if a requested snapshot has not arrived in this time
+const RESYNC_TIMEOUT_MS = 5000;
+let resyncTimer = null;
 
 function startLiveSimulation() {
     connectWebSocket();
@@ -187,18 +197,25 @@ function connectWebSocket() {
     const wsUrl = `${protocol}//${window.location.host}/ws`;
 
     websocket = new WebSocket(wsUrl);
+    // Stream packets arrive as pre-encoded binary JSON frames
+    websocket.binaryType = 'arraybuffer';
 
     websocket.onopen = () => {
         console.log('✅ Connected to Sentilytics real-time stream');
+        awaitingSnapshot = true;
+        scheduleResyncRetry();
     };
 
     websocket.onmessage = (event) => {
-        const data = JSON.parse(event.data);
+        const raw = typeof event.data === 'string' ? event.data : packetDecoder.decode(event.data);
+        const data = JSON.parse(raw);
 
         if (data.type === 'connection') {
             console.log('📡', data.message);
+        } else if (data.type === 'snapshot') {
+            handleSnapshot(data);
         } else if (data.type === 'sentiment_update') {
-            handleSentimentUpdate(data);
+            handleDeltaUpdate(data);
         } else if (data.type === 'crisis_alert') {
             triggerCrisis(data.message);
         }
@@ -209,11 +226,69 @@ function connectWebSocket() {
     };
 
     websocket.onclose = () => {
+        clearTimeout(resyncTimer);
         console.log('❌ Disconnected from stream. Reconnecting in 3s...');
         setTimeout(connectWebSocket, 3000);
     };
 }
 
+function requestResync() {
+    awaitingSnapshot = true;
+    if (websocket && websocket.readyState === WebSocket.OPEN) {
+        websocket.send(JSON.stringify({ type: 'resync' }));
+        scheduleResyncRetry();
+    }
+}
+
+function scheduleResyncRetry() {
+    clearTimeout(resyncTimer);
+    resyncTimer = setTimeout(() => {
+        if (awaitingSnapshot) requestResync();
+    }, RESYNC_TIMEOUT_MS);
+}
+
+function handleSnapshot(data) {
+    if (data.v !== STATS_PROTOCOL_VERSION) {
+        console.warn('Unsupported stats protocol version', data.v);
+        return;
+    }
+    statsState = data.stats;
+    lastSeq = data.seq;
+    awaitingSnapshot = false;
+    clearTimeout(resyncTimer);
+}
+
+function applyDelta(target, delta) {
+    for (const [key, value] of Object.entries(delta)) {
+        if (value === null) {
+            delete target[key];
+        } else if (typeof value === 'object' && !Array.isArray(value)
+                   && typeof target[key] === 'object' && target[key] !== null) {
+            applyDelta(target[key], value);
+        } else {
+            target[key] = value;
+        }
+    }
+}
+
+function handleDeltaUpdate(data) {
+    // Ignore updates until the snapshot arrives
+    if (awaitingSnapshot) return;
+
+    // Already covered by the snapshot
+    if (data.seq <= lastSeq) return;
+
+    // A missing sequence number means a delta was dropped: ask for a snapshot
+    if (data.v !== STATS_PROTOCOL_VERSION || data.seq !== lastSeq + 1) {
+        requestResync();
+        return;
+    }
+
+    applyDelta(statsState, data.delta);
+    lastSeq = data.seq;
+    handleSentimentUpdate({ post: data.post, analysis: data.analysis, stats: statsState });
+}
+
 function handleSentimentUpdate(data) {
     const { post, analysis, stats } = data;
 
@@ -0,0 +1,58 @@
+"""
+Stats Protocol Module
+Versioned snapshot + delta encoding for the dashboard's stats block
+
+Clients get a full 'snapshot' on connect, then each 'sentiment_update'
+carries only the stats fields that changed plus a sequence number. A
+client that sees a gap in sequence numbers sends {'type': 'resync'} and
+receives a fresh snapshot.
+"""
+
+import copy
+from typing import Dict, Tuple
+
+PROTOCOL_VERSION = 1
+
+
+def diff_stats(old: Dict, new: Dict) -> Dict:
+    """
+    Nested dict of the fields in `new` that differ from `old`
+    Removed keys are sent as None
+    """
+    delta = {}
+    for key, value in new.items():
+        previous = old.get(key)
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = diff_stats(previous, value)
+            if nested:
+                delta[key] = nested
+        elif key not in old or previous != value:
+            delta[key] = value
+    for key in old:
+        if key not in new:
+            delta[key] = None
+    return delta
+
+
+class StatsStream:
+    """Tracks the last published stats and the sequence number"""
+
+    def __init__(self, initial_stats: Dict):
+        self.seq = 0
+        self.stats = copy.deepcopy(initial_stats)
+
+    def update(self, stats: Dict) -> Tuple[int, Dict]:
+        """Advance to new stats; returns (seq, delta against the previous stats)"""
+        delta = diff_stats(self.stats, stats)
+        self.stats = copy.deepcopy(stats)
+        self.seq += 1
+        return self.seq, delta
+
+    def snapshot(self) -> Dict:
+        """Full stats packet for a newly connected or resyncing client"""
+        return {
+            'type': 'snapshot',
+            'v': PROTOCOL_VERSION,
+            'seq': self.seq,
+            'stats': self.stats
+        }
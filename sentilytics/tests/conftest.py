@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Tests import the dashboard modules and the backend package the way the
+# apps do: from the sentilytics directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
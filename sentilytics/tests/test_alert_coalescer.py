@@ -0,0 +1,102 @@
+import types
+
+import pytest
+
+from backend import alert_coalescer
+from backend.alert_coalescer import AlertCoalescer
+
+
+def alert(severity='medium', keyword='tesla', alert_type='negative_spike', timestamp='t'):
+    return {'type': alert_type, 'severity': severity, 'keyword': keyword, 'timestamp': timestamp}
+
+
+def test_repeats_in_window_are_suppressed_then_digested():
+    coalescer = AlertCoalescer(window=10)
+    first = alert()
+    assert coalescer.offer(first, now=0) == [first]
+    assert coalescer.offer(alert(timestamp='a'), now=1) == []
+    assert coalescer.offer(alert(timestamp='b'), now=2) == []
+    assert coalescer.pending('tesla', 'negative_spike') == 2
+
+    assert coalescer.flush(now=9.9) == []
+    [digest] = coalescer.flush(now=10)
+    assert digest['type'] == 'alert_digest'
+    assert digest['keyword'] == 'tesla'
+    assert digest['severity'] == 'medium'
+    assert digest['data']['alert_type'] == 'negative_spike'
+    assert digest['data']['suppressed'] == 2
+    assert (digest['data']['first'], digest['data']['last']) == ('a', 'b')
+
+
+def test_window_without_repeats_closes_silently():
+    coalescer = AlertCoalescer(window=10)
+    coalescer.offer(alert(), now=0)
+    assert coalescer.flush(now=20) == []
+    assert coalescer.get_stats()['open_windows'] == 0
+
+
+def test_keys_are_independent_per_keyword_and_type():
+    coalescer = AlertCoalescer(window=10)
+    assert len(coalescer.offer(alert(keyword='tesla'), now=0)) == 1
+    assert len(coalescer.offer(alert(keyword='apple'), now=0)) == 1
+    assert len(coalescer.offer(alert(alert_type='negative_anomaly'), now=0)) == 1
+    assert coalescer.offer(alert(keyword='apple'), now=1) == []
+
+
+def test_escalation_is_published_and_restarts_window():
+    coalescer = AlertCoalescer(window=10)
+    coalescer.offer(alert('medium'), now=0)
+    coalescer.offer(alert('medium'), now=1)
+    escalated = alert('high')
+    assert coalescer.offer(escalated, now=5) == [escalated]
+    assert escalated['escalated_from'] == 'medium'
+    assert escalated['suppressed'] == 1
+
+    # Same severity again is a repeat; the restarted window runs to 15
+    assert coalescer.offer(alert('high'), now=6) == []
+    assert coalescer.flush(now=14) == []
+    [digest] = coalescer.flush(now=15)
+    assert digest['severity'] == 'high'
+    assert coalescer.get_stats()['escalations'] == 1
+
+
+def test_offer_after_expiry_emits_digest_before_new_alert():
+    coalescer = AlertCoalescer(window=10)
+    coalescer.offer(alert(), now=0)
+    coalescer.offer(alert(), now=1)
+    fresh = alert()
+    published = coalescer.offer(fresh, now=11)
+    assert [item['type'] for item in published] == ['alert_digest', 'negative_spike']
+    assert published[-1] is fresh
+
+
+def test_zero_window_publishes_everything():
+    coalescer = AlertCoalescer(window=0)
+    assert all(len(coalescer.offer(alert(), now=0)) == 1 for _ in range(3))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(alert_coalescer, 'time', types.SimpleNamespace(time=lambda: fake.now))
+    return fake
+
+
+def test_alert_system_keeps_digests_for_each_keyword_until_taken(clock):
+    from backend.alert_system import AlertSystem
+    system = AlertSystem()
+    system.coalescer = AlertCoalescer(window=10)
+    spike = {'positive': 1, 'negative': 8, 'neutral': 1, 'total': 10}
+
+    for keyword in ('tesla', 'apple'):
+        assert system.check_sentiment_spike(spike, keyword) is not None
+        assert system.check_sentiment_spike(spike, keyword) is None
+
+    # Closing the windows through an unrelated call must not lose the digests
+    clock.now += 11
+    system.get_alert_history(limit=100)
+
+    [tesla_digest] = system.take_digests('tesla')
+    assert tesla_digest['keyword'] == 'tesla'
+    assert system.take_digests('tesla') == []
+    assert [digest['keyword'] for digest in system.take_digests('apple')] == ['apple']
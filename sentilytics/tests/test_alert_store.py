@@ -0,0 +1,106 @@
+import random
+import time
+
+from backend.alert_store import AlertStore
+
+
+def make_alert(alert_type='volume_spike', severity='medium', keyword='AI'):
+    return {'type': alert_type, 'severity': severity, 'keyword': keyword}
+
+
+def test_filters_match_a_linear_scan():
+    rng = random.Random(3)
+    store = AlertStore(max_alerts=300, max_age=3600)
+    base = time.time()
+    added = []
+    # Enough alerts to evict by count and compact the indexes several times
+    for i in range(1000):
+        alert = store.add(make_alert(
+            rng.choice(['volume_spike', 'sentiment_drop']),
+            rng.choice(['low', 'high']),
+            rng.choice(['AI', 'Tesla', None])
+        ), now=base + i)
+        added.append((base + i, alert))
+    live = added[-300:]
+    
+    for _ in range(200):
+        filters = {
+            'alert_type': rng.choice([None, 'volume_spike', 'sentiment_drop']),
+            'severity': rng.choice([None, 'low', 'high']),
+            'keyword': rng.choice([None, 'AI', 'Tesla'])
+        }
+        since = rng.choice([None, base + rng.randint(600, 1000)])
+        until = rng.choice([None, base + rng.randint(600, 1000)])
+        limit = rng.choice([1, 5, 50, 1000])
+        expected = [
+            alert for ts, alert in live
+            if (filters['alert_type'] is None or alert['type'] == filters['alert_type'])
+            and (filters['severity'] is None or alert['severity'] == filters['severity'])
+            and (filters['keyword'] is None or alert['keyword'] == filters['keyword'])
+            and (since is None or ts >= since)
+            and (until is None or ts <= until)
+        ][-limit:]
+        assert store.query(since=since, until=until, limit=limit, **filters) == expected
+
+
+def test_query_returns_most_recent_oldest_first():
+    store = AlertStore()
+    base = time.time()
+    for i in range(5):
+        store.add(make_alert(), now=base + i)
+    
+    assert [alert['id'] for alert in store.query(limit=3)] == [2, 3, 4]
+    assert store.query(limit=0) == []
+    assert store.query(keyword='missing') == []
+
+
+def test_time_range_is_inclusive():
+    store = AlertStore()
+    base = time.time()
+    for i in range(5):
+        store.add(make_alert(), now=base + i)
+    
+    assert [alert['id'] for alert in store.query(since=base + 1, until=base + 3)] == [1, 2, 3]
+
+
+def test_evicts_by_count():
+    store = AlertStore(max_alerts=3)
+    base = time.time()
+    for i in range(5):
+        store.add(make_alert(), now=base + i)
+    
+    assert len(store) == 3
+    assert [alert['id'] for alert in store.query()] == [2, 3, 4]
+    assert store.get_stats()['evicted_by_count'] == 2
+
+
+def test_evicts_by_age():
+    store = AlertStore(max_age=60)
+    base = time.time()
+    store.add(make_alert(keyword='old'), now=base - 120)
+    store.add(make_alert(keyword='new'), now=base)
+    
+    assert [alert['keyword'] for alert in store.query()] == ['new']
+    assert store.query(keyword='old') == []
+    assert store.get_stats()['evicted_by_age'] == 1
+
+
+def test_clock_stepping_back_keeps_time_order():
+    store = AlertStore()
+    base = time.time()
+    store.add(make_alert(), now=base)
+    store.add(make_alert(), now=base - 10)
+    
+    assert [alert['id'] for alert in store.query(since=base)] == [0, 1]
+
+
+def test_clear_keeps_ids_increasing():
+    store = AlertStore()
+    base = time.time()
+    store.add(make_alert(), now=base)
+    store.clear()
+    
+    assert len(store) == 0
+    assert store.query() == []
+    assert store.add(make_alert(), now=base)['id'] == 1
+    assert [alert['id'] for alert in store.query()] == [1]
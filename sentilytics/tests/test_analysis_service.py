@@ -0,0 +1,35 @@
+import asyncio
+
+from backend import sentiment_analyzer as analyzer_module
+from backend.analysis_service import AnalysisService
+from backend.sentiment_analyzer import SentimentAnalyzer
+
+
+def worker_settings():
+    worker = analyzer_module._worker_analyzer
+    return worker.cache.max_entries, worker.keyword_capacity
+
+
+def test_process_workers_use_the_parent_analyzer_settings():
+    analyzer = SentimentAnalyzer(cache_size=0)
+    analyzer.keyword_capacity = 20
+    service = AnalysisService(analyzer, mode='process', workers=1)
+    try:
+        settings = service._get_executor().submit(worker_settings).result(timeout=60)
+        result = asyncio.run(service.analyze_batch(['great launch', 'great launch']))
+    finally:
+        service.close()
+    
+    assert settings == (0, 20)
+    assert set(result) == {'sentiment', 'emotions', 'keywords'}
+
+
+def test_shard_workers_use_the_parent_analyzer_settings():
+    analyzer = SentimentAnalyzer(workers=2, chunk_size=1, cache_size=0)
+    try:
+        analyzer.score_batch(['great launch', 'awful recall'])
+        settings = analyzer._pool.submit(worker_settings).result(timeout=60)
+    finally:
+        analyzer.close()
+    
+    assert settings == (0, 1000)
@@ -0,0 +1,76 @@
+from backend.anomaly_detector import AnomalyDetector
+
+
+def feed(detector, keyword, negatives, total=50):
+    return [detector.update(keyword, negative, total) for negative in negatives]
+
+
+def test_no_alerts_during_warmup():
+    early = AnomalyDetector(warmup_batches=5)
+    assert feed(early, 'AI', [10] * 4 + [45]) == [None] * 5
+    
+    warmed = AnomalyDetector(warmup_batches=5)
+    alerts = feed(warmed, 'AI', [10] * 5 + [45])
+    assert alerts[:5] == [None] * 5
+    assert alerts[5]['type'] == 'negative_anomaly'
+
+
+def test_spike_alert_severity_follows_z_score():
+    detector = AnomalyDetector(z_threshold=4.5, warmup_batches=5)
+    feed(detector, 'AI', [10] * 10)
+    
+    # Steady 20% baseline: the spread is the binomial floor, sqrt(0.16 / 50)
+    medium = detector.update('AI', 30, 50)
+    assert medium['type'] == 'negative_anomaly'
+    assert medium['severity'] == 'medium'
+    assert medium['keyword'] == 'AI'
+    assert medium['data']['baseline'] == 0.2
+    assert 4.5 <= medium['data']['z_score'] < 9
+    
+    other = AnomalyDetector(z_threshold=4.5, warmup_batches=5)
+    feed(other, 'AI', [10] * 10)
+    assert other.update('AI', 40, 50)['severity'] == 'high'
+
+
+def test_cusum_flags_a_sustained_shift_and_resets():
+    detector = AnomalyDetector(alpha=0.05, z_threshold=4.5, cusum_slack=0.5, cusum_threshold=8.0, warmup_batches=5)
+    assert feed(detector, 'AI', [10] * 30) == [None] * 30
+    
+    # 20% -> 30%: under 2 standard deviations per batch, so only CUSUM sees it
+    alerts = feed(detector, 'AI', [15] * 10)
+    flagged = [alert for alert in alerts if alert is not None]
+    assert flagged and {alert['type'] for alert in flagged} == {'negative_drift'}
+    assert flagged[0]['data']['cusum'] >= 8.0
+    assert alerts.index(flagged[0]) > 0
+    
+    # The sum restarts after an alert
+    detector = AnomalyDetector(alpha=0.05, cusum_threshold=8.0, warmup_batches=5)
+    feed(detector, 'AI', [10] * 30)
+    for _ in range(10):
+        if detector.update('AI', 15, 50) is not None:
+            break
+    assert detector.get_baseline('AI')['cusum'] == 0.0
+
+
+def test_small_batches_need_a_bigger_jump():
+    large = AnomalyDetector(warmup_batches=5)
+    feed(large, 'AI', [2000] * 10, total=10000)
+    assert large.update('AI', 2500, 10000)['type'] == 'negative_anomaly'
+    
+    small = AnomalyDetector(warmup_batches=5)
+    feed(small, 'AI', [2] * 10, total=10)
+    assert small.update('AI', 3, 10) is None
+    assert small.update('AI', 0, 0) is None
+
+
+def test_least_recently_updated_keyword_is_evicted():
+    detector = AnomalyDetector(max_keywords=2)
+    detector.update('a', 10, 50)
+    detector.update('b', 10, 50)
+    detector.update('a', 10, 50)
+    detector.update('c', 10, 50)
+    
+    assert detector.get_baseline('b') is None
+    assert detector.get_baseline('a')['batches'] == 2
+    assert detector.get_baseline('c')['batches'] == 1
+    assert detector.get_stats()['evicted_keywords'] == 1
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from backend.collectors import CollectorSource, ReplaySource
+
+
+@pytest.fixture
+def replay_file(tmp_path):
+    path = tmp_path / "posts.jsonl"
+    texts = ["Tesla launch", "rain today", "tesla recall", "", "coffee time"]
+    path.write_text("\n".join(json.dumps({"text": text}) if text else "" for text in texts) + "\n")
+    return str(path)
+
+
+def collect_all(source, keyword, batch_size=2, limit=20):
+    async def run():
+        posts = []
+        async for batch in source.batches(keyword, batch_size=batch_size):
+            posts.extend(post["text"] for post in batch.posts)
+            if len(posts) >= limit:
+                break
+        return posts
+    return asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+
+def test_replay_matches_keyword_case_insensitively(replay_file):
+    assert collect_all(ReplaySource(replay_file), "TESLA") == ["Tesla launch", "tesla recall"]
+
+
+def test_replay_cursor_resumes_after_batch(replay_file):
+    source = ReplaySource(replay_file, match_keyword=False)
+    first = asyncio.run(source.collect(None, 2))
+    second = asyncio.run(source.collect(None, 2, cursor=first.cursor))
+    assert [post["text"] for post in first.posts] == ["Tesla launch", "rain today"]
+    assert [post["text"] for post in second.posts] == ["tesla recall", "coffee time"]
+
+
+def test_replay_cursor_is_a_byte_offset(replay_file):
+    source = ReplaySource(replay_file, match_keyword=False)
+    cursor = None
+    texts = []
+    for _ in range(4):
+        batch = asyncio.run(source.collect(None, 1, cursor=cursor))
+        texts.extend(post["text"] for post in batch.posts)
+        cursor = batch.cursor
+    assert texts == ["Tesla launch", "rain today", "tesla recall", "coffee time"]
+    # The cursor is a byte offset, so each call seeks instead of re-reading earlier rows
+    assert cursor == os.path.getsize(replay_file)
+    assert source.rows_read == 5
+
+
+def test_replay_csv_cursor_resumes_across_quoted_newlines(tmp_path):
+    path = tmp_path / "posts.csv"
+    path.write_bytes(
+        b'id,body\r\n'
+        b'1,"Tesla\r\nlaunch"\r\n'
+        b'2,rain today\r\n'
+        b'3,"tesla, recall"\r\n'
+    )
+    source = ReplaySource(str(path), text_field="body", match_keyword=False)
+    first = asyncio.run(source.collect(None, 1))
+    rest = asyncio.run(source.collect(None, 5, cursor=first.cursor))
+    assert [post["text"] for post in first.posts] == ["Tesla\r\nlaunch"]
+    assert [(post["id"], post["text"]) for post in rest.posts] == [("2", "rain today"), ("3", "tesla, recall")]
+    assert first.cursor == len(b'id,body\r\n1,"Tesla\r\nlaunch"\r\n')
+
+
+def test_replay_parquet_cursor_skips_row_groups(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+    
+    path = str(tmp_path / "posts.parquet")
+    texts = [f"post {i}" for i in range(10)]
+    pq.write_table(pa.table({"text": texts}), path, row_group_size=3)
+    source = ReplaySource(path, match_keyword=False)
+    cursor, replayed = None, []
+    for _ in range(4):
+        batch = asyncio.run(source.collect(None, 4, cursor=cursor))
+        replayed.extend(post["text"] for post in batch.posts)
+        cursor = batch.cursor
+    assert replayed == texts
+    assert cursor == 10
+
+
+def test_collector_source_requires_batches():
+    with pytest.raises(TypeError):
+        CollectorSource()
+
+
+def test_replay_loop_restarts_from_top(replay_file):
+    posts = collect_all(ReplaySource(replay_file, loop=True), "tesla", limit=5)
+    assert posts[:4] == ["Tesla launch", "tesla recall"] * 2
+
+
+def test_replay_loop_stops_when_keyword_never_matches(replay_file):
+    source = ReplaySource(replay_file, loop=True)
+    assert collect_all(source, "nomatch") == []
+    assert asyncio.run(source.collect("nomatch", 5)).posts == []
+
+
+def test_replay_loop_without_match_from_mid_file_cursor(replay_file):
+    source = ReplaySource(replay_file, loop=True)
+    cursor = asyncio.run(ReplaySource(replay_file, match_keyword=False).collect(None, 3)).cursor
+    batch = asyncio.run(asyncio.wait_for(source.collect("nomatch", 5, cursor=cursor), timeout=5))
+    assert batch.posts == []
+
+
+def test_replay_loop_yields_to_other_tasks(replay_file):
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        source = ReplaySource(replay_file, loop=True)
+        async for _ in source.batches("tesla", batch_size=1):
+            if ticks > 3:
+                break
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(asyncio.wait_for(run(), timeout=5)) > 3
@@ -0,0 +1,16 @@
+from backend.emotion_matcher import EmotionMatcher
+
+LEXICON = {
+    'joy': ['happy', 'love', 'over the moon'],
+    'anger': ['hate', 'furious'],
+    'sadness': ['sad']
+}
+
+
+def test_matches_whole_words_and_phrases():
+    matcher = EmotionMatcher(LEXICON)
+    assert matcher.find('A crusade, not sad') == {'sad'}
+    assert matcher.find('Over the MOON and happy') == {'over the moon', 'happy'}
+    assert matcher.count('I love it but hate the wait, so sad') == [1, 1, 1]
+    assert matcher.first_match('furious and sad') == 'anger'
+    assert matcher.first_match('nothing here') is None
@@ -0,0 +1,18 @@
+import json
+
+from backend import encoding
+
+PACKET = {'type': 'sentiment_update', 'seq': 3, 'post': {'text': 'Café ☕ is great'}, 'score': 0.5}
+
+
+def test_encode_packet_is_compact_utf8_json():
+    data = encoding.encode_packet(PACKET)
+    assert isinstance(data, bytes)
+    assert json.loads(data.decode('utf-8')) == PACKET
+    assert b' ' not in data.replace('Café ☕ is great'.encode('utf-8'), b'')
+
+
+def test_stdlib_fallback_matches(monkeypatch):
+    expected = encoding.encode_packet(PACKET)
+    monkeypatch.setattr(encoding, 'orjson', None)
+    assert json.loads(encoding.encode_packet(PACKET)) == json.loads(expected)
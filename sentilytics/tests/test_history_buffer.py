@@ -0,0 +1,43 @@
+import sentiment_analyzer
+from history_buffer import SentimentHistory
+from sentiment_analyzer import LazyAnalysis
+
+
+def make_analysis(**extra):
+    return dict({
+        'sentiment': 'negative',
+        'emotion': 'anger',
+        'scores': {'positive': 0.0, 'negative': 0.6, 'neutral': 0.4, 'compound': -0.7}
+    }, **extra)
+
+
+def test_append_does_not_load_textblob_for_lazy_analysis(monkeypatch):
+    calls = []
+    monkeypatch.setattr(sentiment_analyzer, '_textblob_scores', lambda text: calls.append(text) or (0.1, 0.2))
+    history = SentimentHistory(capacity=4)
+    analysis = LazyAnalysis(make_analysis(), 'awful service')
+
+    history.append(analysis)
+
+    assert calls == []
+    assert history.recent(1)[0]['polarity'] is None
+    assert analysis['polarity'] == 0.1  # still loads on an explicit read
+    assert calls == ['awful service']
+
+
+def test_missing_scores_read_back_as_none_and_present_ones_kept():
+    history = SentimentHistory(capacity=2)
+    history.append(make_analysis())
+    history.append(make_analysis(polarity=-0.5, subjectivity=0.0))
+
+    older, newer = history.recent(2)
+    assert older['polarity'] is None and older['subjectivity'] is None
+    assert newer['polarity'] == -0.5 and newer['subjectivity'] == 0.0
+
+
+def test_ring_buffer_keeps_last_capacity_entries():
+    history = SentimentHistory(capacity=3)
+    for compound in (0.1, 0.2, 0.3, 0.4):
+        history.append(make_analysis(scores={'positive': 0, 'negative': 0, 'neutral': 1, 'compound': compound}))
+    assert len(history) == 3
+    assert [record['scores']['compound'] for record in history] == [0.2, 0.3, 0.4]
@@ -0,0 +1,173 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.history_store import HistoryStore
+
+HOUR = 3600
+
+
+def result(negative=5, total=10, joy=1):
+    return {
+        'sentiment': {'positive': total - negative, 'negative': negative, 'neutral': 0, 'total': total},
+        'emotions': {'joy': joy, 'anger': 0, 'fear': 0, 'sadness': 0},
+        'keywords': [{'word': 'battery', 'count': 3}]
+    }
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'history.db')
+
+
+def test_entries_persist_across_reopen(db_path):
+    store = HistoryStore(db_path)
+    now = time.time()
+    for i in range(3):
+        store.record('tesla', result(negative=i), now - 30 + i)
+    store.close()
+
+    reopened = HistoryStore(db_path)
+    entries = reopened.recent('tesla')
+    assert [entry['result']['sentiment']['negative'] for entry in entries] == [0, 1, 2]
+    assert reopened.recent('apple') == []
+    reopened.close()
+
+
+def test_rollups_add_up_across_flushes(db_path):
+    store = HistoryStore(db_path)
+    base = (time.time() // HOUR - 2) * HOUR  # start of an hour two hours ago
+    store.record('tesla', result(negative=2), base + 10)
+    store.flush()
+    store.record('tesla', result(negative=3), base + 70)
+    store.flush()
+
+    [bucket], _, _ = store.query('tesla', 'hour', base, base + HOUR)
+    assert bucket['batches'] == 2
+    assert bucket['sentiment'] == {'positive': 15, 'negative': 5, 'neutral': 0, 'total': 20}
+    assert bucket['negative_share'] == 0.25
+    assert bucket['emotions']['joy'] == 1.0
+
+    minutes, _, _ = store.query('tesla', 'minute', base, base + HOUR)
+    assert [minute['batches'] for minute in minutes] == [1, 1]
+    store.close()
+
+
+def test_flush_after_close_is_a_no_op(db_path):
+    store = HistoryStore(db_path)
+    store.record('tesla', result())
+    store.close()
+    store.record('tesla', result())
+    assert store.flush() == 0
+    store.close()  # closing twice is harmless
+
+
+def test_close_waits_for_a_flush_in_progress(db_path):
+    store = HistoryStore(db_path)
+    store.record('tesla', result())
+    store._write_lock.acquire()  # a flush thread holding the lock mid-write
+    closer = threading.Thread(target=store.close)
+    closer.start()
+    closer.join(timeout=0.2)
+    assert closer.is_alive()
+    store._write_lock.release()
+    closer.join(timeout=5)
+    assert not closer.is_alive()
+
+    reopened = HistoryStore(db_path)
+    assert len(reopened.recent('tesla')) == 1
+    reopened.close()
+
+
+def test_background_loop_flushes_and_stop_writes_the_rest(db_path):
+    async def run():
+        store = HistoryStore(db_path, batch_size=2, flush_interval=60)
+        store.start()
+        store.record('tesla', result())
+        store.record('tesla', result())  # batch full: wakes the loop
+        for _ in range(100):
+            if store.flushed:
+                break
+            await asyncio.sleep(0.01)
+        flushed_by_loop = store.flushed
+        store.record('tesla', result())
+        await store.stop()
+        store.close()
+        return flushed_by_loop, store.flushed
+
+    assert asyncio.run(run()) == (2, 3)
+
+
+def page_through(store, resolution, start, end, limit):
+    pages, start_id = [], None
+    while start is not None:
+        page, start, start_id = store.query('tesla', resolution, start, end, limit, start_id)
+        pages.append(page)
+        assert len(pages) < 100, 'paging does not terminate'
+    return pages
+
+
+def test_raw_paging_with_shared_timestamps_returns_each_entry_once(db_path):
+    store = HistoryStore(db_path)
+    now = time.time()
+    # Seven entries on one timestamp, more than a page, then one later
+    for negative in range(7):
+        store.record('tesla', result(negative=negative), now - 100)
+    store.record('tesla', result(negative=9), now - 50)
+    store.flush()
+
+    pages = page_through(store, 'raw', now - 200, now, limit=3)
+    negatives = [entry['sentiment']['negative'] for page in pages for entry in page]
+    assert negatives == [0, 1, 2, 3, 4, 5, 6, 9]
+    assert [len(page) for page in pages] == [3, 3, 2]
+    assert 'keywords' not in pages[0][0]
+    store.close()
+
+
+def test_rollup_paging_covers_range_in_bucket_order(db_path):
+    store = HistoryStore(db_path)
+    base = (time.time() // HOUR - 10) * HOUR
+    for hour in range(7):
+        store.record('tesla', result(), base + hour * HOUR + 5)
+    store.flush()
+
+    pages = page_through(store, 'hour', base + 1, base + 10 * HOUR, limit=3)
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert sum(bucket['batches'] for page in pages for bucket in page) == 7
+    store.close()
+
+
+def test_pick_resolution_is_finest_that_fits():
+    store = HistoryStore(':memory:')
+    assert store.pick_resolution(0, 500 * 60, 500) == 'minute'
+    assert store.pick_resolution(0, 30 * 86400, 1000) == 'hour'
+    assert store.pick_resolution(0, 30 * 86400, 500) == 'day'
+    store.close()
+
+
+def test_recent_sees_entries_while_a_flush_is_writing(db_path):
+    store = HistoryStore(db_path)
+    store.record('tesla', result(negative=1))
+    store.flush()
+    store.record('tesla', result(negative=2))
+
+    seen = []
+    original_prune = store._prune
+
+    def prune_then_read():
+        # Runs inside the flush transaction, before the commit
+        original_prune()
+        reader = threading.Thread(target=lambda: seen.append(store.recent('tesla')))
+        reader.start()
+        reader.join(timeout=0.5)
+        seen.append(reader)
+
+    store._prune = prune_then_read
+    store.flush()
+    reader = seen.pop()
+    reader.join(timeout=5)
+    assert [entry['result']['sentiment']['negative'] for entry in seen[0]] == [1, 2]
+    assert [entry['result']['sentiment']['negative'] for entry in store.recent('tesla')] == [1, 2]
+    store.close()
@@ -0,0 +1,71 @@
+import asyncio
+
+from backend.ingestion import IngestionQueue
+
+
+def posts(count, start=0):
+    return [{'id': i} for i in range(start, start + count)]
+
+
+def test_full_batches_flush_on_size():
+    async def scenario():
+        batches = []
+        
+        async def process_batch(route, batch):
+            batches.append((route, [post['id'] for post in batch]))
+        
+        queue = IngestionQueue(process_batch, max_batch_size=10, max_latency=60)
+        await queue.put('AI', posts(30))
+        await queue.stop()
+        return queue, batches
+    
+    queue, batches = asyncio.run(scenario())
+    assert batches == [('AI', list(range(i, i + 10))) for i in (0, 10, 20)]
+    assert queue.get_metrics()['size_flushes'] == 3
+    assert queue.get_metrics()['latency_flushes'] == 0
+
+
+def test_partial_batch_flushes_after_max_latency():
+    async def scenario():
+        batches = []
+        
+        async def process_batch(route, batch):
+            batches.append((route, len(batch)))
+        
+        queue = IngestionQueue(process_batch, max_batch_size=100, max_latency=0.05)
+        await queue.put('AI', posts(3))
+        await queue.put('Tesla', posts(2))
+        await asyncio.sleep(0.2)
+        metrics = queue.get_metrics()
+        await queue.stop()
+        return metrics, batches
+    
+    metrics, batches = asyncio.run(scenario())
+    # One flush, split per route in arrival order
+    assert batches == [('AI', 3), ('Tesla', 2)]
+    assert metrics['latency_flushes'] == 1
+    assert metrics['flushed_posts'] == 5
+    assert metrics['last_flush_latency_ms'] >= 50
+
+
+def test_backpressure_keeps_batches_full_when_analysis_lags():
+    async def scenario():
+        sizes = []
+        
+        async def process_batch(route, batch):
+            sizes.append(len(batch))
+            await asyncio.sleep(0.02)
+        
+        queue = IngestionQueue(process_batch, max_batch_size=200, max_latency=0.01, max_pending=1000)
+        await queue.put('AI', posts(3000))
+        await queue.stop()
+        return queue.get_metrics(), sizes
+    
+    metrics, sizes = asyncio.run(scenario())
+    assert metrics['backpressure_waits'] > 0
+    assert sum(sizes) == 3000
+    # Posts that queued up while a batch was processing are drained together,
+    # instead of one post per flush once the oldest deadline has passed
+    assert sizes == [200] * 15
+    # Time spent waiting for queue space is not flush latency
+    assert metrics['max_flush_latency_ms'] < 500
@@ -0,0 +1,54 @@
+import random
+from collections import Counter
+
+from backend.keyword_sketch import KeywordSketch
+
+
+def pareto_words(count, seed):
+    rng = random.Random(seed)
+    return [f'w{int(rng.paretovariate(1.0))}' for _ in range(count)]
+
+
+def assert_within_bounds(sketch, true_counts):
+    for word, count in sketch.counts.items():
+        assert count - sketch.errors[word] <= true_counts[word] <= count, word
+
+
+def test_counts_are_exact_below_capacity():
+    sketch = KeywordSketch(capacity=10)
+    sketch.add_texts(['tesla launch today', 'tesla recall', 'the launch'])
+    assert sketch.top(2) == [{'word': 'tesla', 'count': 2}, {'word': 'launch', 'count': 2}]
+    assert set(sketch.errors.values()) == {0}
+
+
+def test_streamed_counts_stay_within_error_bound():
+    words = pareto_words(25000, seed=1)
+    sketch = KeywordSketch(capacity=50)
+    for word in words:
+        sketch.update(word)
+    assert_within_bounds(sketch, Counter(words))
+
+
+def test_merged_counts_stay_within_error_bound():
+    for seed in range(5):
+        left_words = pareto_words(25000, seed=2 * seed)
+        right_words = pareto_words(25000, seed=2 * seed + 1)
+        left, right = KeywordSketch(capacity=50), KeywordSketch(capacity=50)
+        for word in left_words:
+            left.update(word)
+        for word in right_words:
+            right.update(word)
+        
+        merged = left.merge(right)
+        assert len(merged.counts) == 50
+        assert merged.total == 50000
+        assert_within_bounds(merged, Counter(left_words) + Counter(right_words))
+
+
+def test_merge_of_partial_sketches_is_exact():
+    left, right = KeywordSketch(capacity=10), KeywordSketch(capacity=10)
+    left.add_text('tesla launch')
+    right.add_text('tesla recall')
+    merged = left.merge(right)
+    assert merged.counts == {'tesla': 2, 'launch': 1, 'recall': 1}
+    assert set(merged.errors.values()) == {0}
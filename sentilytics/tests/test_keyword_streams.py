@@ -0,0 +1,113 @@
+import asyncio
+
+from backend.keyword_streams import ClientQueue, KeywordStreams
+
+
+class FakeCollector:
+    """stream_posts stand-in that records starts and cancellations"""
+    
+    def __init__(self, fail_first=False):
+        self.started = []
+        self.cancelled = []
+        self.fail_first = fail_first
+    
+    async def stream_posts(self, keyword, callback):
+        self.started.append(keyword)
+        if self.fail_first and len(self.started) == 1:
+            raise RuntimeError("source went away")
+        try:
+            while True:
+                await callback([{'text': keyword}])
+                await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            self.cancelled.append(keyword)
+            raise
+
+
+async def ignore_posts(keyword, posts):
+    pass
+
+
+def test_producer_starts_on_first_subscriber_and_stops_on_last():
+    async def scenario():
+        collector = FakeCollector()
+        streams = KeywordStreams(collector.stream_posts, ignore_posts)
+        streams.subscribe('AI', 'a')
+        streams.subscribe('AI', 'b')
+        await asyncio.sleep(0.03)
+        started = list(collector.started)
+        
+        streams.unsubscribe('AI', 'a')
+        await asyncio.sleep(0)
+        still_running = not collector.cancelled
+        
+        streams.unsubscribe('AI', 'b')
+        await asyncio.sleep(0)
+        return collector, streams, started, still_running
+    
+    collector, streams, started, still_running = asyncio.run(scenario())
+    assert started == ['AI']
+    assert still_running
+    assert collector.cancelled == ['AI']
+    stats = streams.get_stats()
+    assert (stats['producers_started'], stats['producers_stopped'], stats['active_keywords']) == (1, 1, 0)
+    assert stats['batches_received'] >= 1
+
+
+def test_producer_restarts_after_an_error():
+    async def scenario():
+        collector = FakeCollector(fail_first=True)
+        streams = KeywordStreams(collector.stream_posts, ignore_posts)
+        streams.subscribe('AI', 'a')
+        await asyncio.sleep(0.01)
+        active_after_error = streams.get_stats()['active_keywords']
+        
+        streams.subscribe('AI', 'b')
+        await asyncio.sleep(0.01)
+        active_after_restart = streams.get_stats()['active_keywords']
+        await streams.stop()
+        return collector, active_after_error, active_after_restart
+    
+    collector, active_after_error, active_after_restart = asyncio.run(scenario())
+    assert collector.started == ['AI', 'AI']
+    assert active_after_error == 0
+    assert active_after_restart == 1
+
+
+def test_publish_never_waits_on_a_slow_client():
+    async def scenario():
+        streams = KeywordStreams(FakeCollector().stream_posts, ignore_posts)
+        fast = ClientQueue(max_queue=2, max_lag=3)
+        slow = ClientQueue(max_queue=2, max_lag=3)
+        streams.subscribe('AI', fast)
+        streams.subscribe('AI', slow)
+        
+        received = []
+        for i in range(5):
+            streams.publish('AI', b'%d' % i)
+            received.append(await fast.next_message())
+        
+        slow_messages = [await slow.next_message()]
+        await streams.stop()
+        return streams, fast, slow, received, slow_messages
+    
+    streams, fast, slow, received, slow_messages = asyncio.run(scenario())
+    assert received == [b'0', b'1', b'2', b'3', b'4']
+    # The slow client dropped its oldest updates, then was closed and unsubscribed
+    assert slow.closed and slow_messages == [None]
+    assert streams.subscribers('AI') == [fast]
+    assert streams.last_message('AI') == b'4'
+    stats = streams.get_stats()
+    assert (stats['updates_dropped'], stats['clients_closed']) == (3, 1)
+
+
+def test_client_queue_keeps_newest_updates():
+    async def scenario():
+        client = ClientQueue(max_queue=2, max_lag=10)
+        for i in range(4):
+            assert client.offer(b'%d' % i)
+        return [await client.next_message(), await client.next_message()], client.dropped
+    
+    messages, dropped = asyncio.run(scenario())
+    assert messages == [b'2', b'3']
+    assert dropped == 2
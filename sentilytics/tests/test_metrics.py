@@ -0,0 +1,41 @@
+import types
+
+import pytest
+
+from backend import sentiment_analyzer
+from backend.metrics import MetricsRegistry, metrics
+
+
+@pytest.fixture
+def clock_reads(monkeypatch):
+    reads = []
+    real = sentiment_analyzer.time.perf_counter
+    monkeypatch.setattr(sentiment_analyzer, 'time', types.SimpleNamespace(
+        perf_counter=lambda: reads.append(1) or real()
+    ))
+    return reads
+
+
+@pytest.mark.parametrize('enabled, expect_reads', [(True, True), (False, False)])
+def test_scorer_timing_reads_clock_only_when_enabled(monkeypatch, clock_reads, enabled, expect_reads):
+    monkeypatch.setattr(metrics, 'enabled', enabled)
+    analyzer = sentiment_analyzer.SentimentAnalyzer(cache_size=0)
+    analyzer._score_clean('what a great launch')
+    assert bool(clock_reads) is expect_reads
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    counter = registry.counter('things_total', 'Things', ('kind',))
+    histogram = registry.histogram('wait_seconds', 'Wait', buckets=(0.1, 1.0))
+    counter.labels(kind='a').inc()
+    with histogram.time():
+        pass
+    histogram.observe(0.5)
+    registry.enabled = True
+    histogram.observe(0.5)
+
+    text = registry.render()
+    assert 'things_total{kind="a"} 0' in text
+    assert 'wait_seconds_bucket{le="1.0"} 1' in text
+    assert 'wait_seconds_count 1' in text
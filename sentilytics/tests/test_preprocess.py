@@ -0,0 +1,49 @@
+import random
+import re
+
+import pytest
+
+from backend.sentiment_analyzer import SentimentAnalyzer
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return SentimentAnalyzer(cache_size=0)
+
+
+def sequential_preprocess(emoji_map, text):
+    """The old cleaner: emojis, then URLs, then mentions, then hashtags"""
+    if not text:
+        return ""
+    for emoji, meaning in emoji_map.items():
+        text = text.replace(emoji, f' {meaning} ')
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'@\w+', '', text)
+    text = re.sub(r'#(\w+)', r'\1', text)
+    return ' '.join(text.split())
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('#httpfoo', '#'),
+    ('@barhttp://x', ''),
+    ('#foohttp://x rocks', 'foo rocks'),
+    ('@foohttp still here', 'still here'),
+    ('see www.example.com/x now', 'see now'),
+    ('foowww.x bar', 'foo bar'),
+    ('link http://t.co/a😊b', 'link happy b'),
+    ('http😊 ok', 'http happy ok'),
+    ('#@foo bar', '# bar'),
+    ('@foo#bar', 'bar'),
+    ('I ❤️ #AI @someone', 'I love AI'),
+])
+def test_matches_sequential_order(analyzer, text, expected):
+    assert sequential_preprocess(analyzer.emoji_map, text) == expected
+    assert analyzer.preprocess_text(text) == expected
+
+
+def test_matches_sequential_order_on_random_text(analyzer):
+    rng = random.Random(7)
+    pieces = ['http', 'https://', 'www', '.', '/', '@', '#', 'ab', '_1', ' ', '\n', '😊', '❤️', '❤', '👍']
+    for _ in range(5000):
+        text = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+        assert analyzer.preprocess_text(text) == sequential_preprocess(analyzer.emoji_map, text), repr(text)
@@ -0,0 +1,26 @@
+import sentiment_analyzer
+from sentiment_analyzer import SentimentAnalyzer
+
+TEXTS = ['I love this phone', 'Worst service ever', 'It is a phone', 'So happy today'] * 3
+
+
+def test_batch_analyze_reuses_one_pool_and_keeps_order(monkeypatch):
+    analyzer = SentimentAnalyzer('fast', workers=2, chunk_size=4)
+    created = []
+    real_pool = sentiment_analyzer.ProcessPoolExecutor
+    monkeypatch.setattr(sentiment_analyzer, 'ProcessPoolExecutor',
+                        lambda *args, **kwargs: created.append(1) or real_pool(*args, **kwargs))
+    try:
+        expected = [analyzer.analyze_sentiment(text)['sentiment'] for text in TEXTS]
+        for _ in range(2):
+            assert [result['sentiment'] for result in analyzer.batch_analyze(TEXTS)] == expected
+        assert created == [1]
+    finally:
+        analyzer.close()
+    assert analyzer._pool is None
+
+
+def test_small_batches_stay_in_process():
+    analyzer = SentimentAnalyzer('fast', workers=2, chunk_size=100)
+    assert len(analyzer.batch_analyze(TEXTS)) == len(TEXTS)
+    assert analyzer._pool is None
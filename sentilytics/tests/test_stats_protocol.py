@@ -0,0 +1,78 @@
+import asyncio
+
+from broadcaster import Broadcaster, RESYNC
+from stats_protocol import PROTOCOL_VERSION, StatsStream, diff_stats
+
+
+def test_diff_stats_reports_changed_added_and_removed_fields():
+    old = {'total': 1, 'dist': {'positive': 1, 'negative': 0}, 'gone': 5}
+    new = {'total': 2, 'dist': {'positive': 1, 'negative': 1}, 'extra': [1]}
+    assert diff_stats(old, new) == {'total': 2, 'dist': {'negative': 1}, 'extra': [1], 'gone': None}
+
+
+def test_diff_stats_of_equal_stats_is_empty():
+    stats = {'total': 3, 'dist': {'positive': 3}}
+    assert diff_stats(stats, {'total': 3, 'dist': {'positive': 3}}) == {}
+
+
+def test_stats_stream_sequences_deltas_and_snapshots_current_state():
+    stream = StatsStream({'total': 0})
+    assert stream.update({'total': 1}) == (1, {'total': 1})
+    assert stream.update({'total': 1}) == (2, {})
+    assert stream.snapshot() == {'type': 'snapshot', 'v': PROTOCOL_VERSION, 'seq': 2, 'stats': {'total': 1}}
+
+
+def test_stats_stream_keeps_its_own_copy():
+    stats = {'dist': {'positive': 1}}
+    stream = StatsStream(stats)
+    stats['dist']['positive'] = 99
+    assert stream.snapshot()['stats'] == {'dist': {'positive': 1}}
+
+
+def test_resync_survives_a_full_queue():
+    async def run():
+        broadcaster = Broadcaster(max_queue=2, max_lag=100)
+        subscriber = broadcaster.subscribe()
+        broadcaster.publish(b'old')
+        subscriber.request_resync()
+        for i in range(5):
+            broadcaster.publish(b'new%d' % i)  # drops the oldest queued items
+        return [await subscriber.next_message() for _ in range(3)]
+
+    assert asyncio.run(run()) == [RESYNC, b'new3', b'new4']
+
+
+def test_resync_wakes_a_waiting_relay_once():
+    async def run():
+        broadcaster = Broadcaster(max_queue=4)
+        subscriber = broadcaster.subscribe()
+        waiting = asyncio.create_task(subscriber.next_message())
+        await asyncio.sleep(0)
+        subscriber.request_resync()
+        first = await asyncio.wait_for(waiting, timeout=1)
+        broadcaster.publish(b'delta')
+        return first, await asyncio.wait_for(subscriber.next_message(), timeout=1)
+
+    assert asyncio.run(run()) == (RESYNC, b'delta')
+
+
+def test_resync_requested_before_reading_skips_stale_wake_marker():
+    async def run():
+        subscriber = Broadcaster(max_queue=4).subscribe()
+        subscriber.request_resync()
+        first = await subscriber.next_message()
+        subscriber.queue.put_nowait(b'delta')
+        return first, await asyncio.wait_for(subscriber.next_message(), timeout=1)
+
+    assert asyncio.run(run()) == (RESYNC, b'delta')
+
+
+def test_lagging_subscriber_is_disconnected():
+    async def run():
+        broadcaster = Broadcaster(max_queue=1, max_lag=3)
+        subscriber = broadcaster.subscribe()
+        for i in range(5):
+            broadcaster.publish(b'%d' % i)
+        return subscriber.closed, await subscriber.next_message()
+
+    assert asyncio.run(run()) == (True, None)